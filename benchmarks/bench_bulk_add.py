@@ -0,0 +1,63 @@
+# benchmarks/bench_bulk_add.py
+"""Compare one-at-a-time and bulk ingestion of recommendations.
+
+Outside an identifier batch every ``add_recommendation`` call persists the
+identifier registry, so the one-at-a-time path grows quadratically; keep
+``n_recommendations`` modest.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_bulk_add.py [n_recommendations]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.registry.identifiers import MLRIdentifierRegistry
+from scripts.registry.recommendations import RecommendationRegistry
+
+TOPICS = ["optimization", "attention", "normalization", "tokenization", "scaling"]
+AUTHORS = [f"Author{i}" for i in range(500)]
+
+
+def make_records(n: int) -> list[dict]:
+    records = []
+    for i in range(n):
+        author = AUTHORS[i % len(AUTHORS)]
+        year = 2015 + (i * 7) % 10
+        records.append(dict(
+            topic=TOPICS[i % len(TOPICS)],
+            recommendation=f"Use technique number {i} when training large models",
+            first_author=author,
+            source_paper=f"{author} et al. ({year})",
+            year=year,
+            arxiv_id=f"{year % 100}01.{i:05d}",
+            implementations=["llama2"],
+        ))
+    return records
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    records = make_records(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        sequential = RecommendationRegistry(MLRIdentifierRegistry(Path(tmp) / "sequential.json"))
+        start = time.perf_counter()
+        for record in records:
+            sequential.add_recommendation(**record)
+        one_at_a_time = time.perf_counter() - start
+
+        bulk = RecommendationRegistry(MLRIdentifierRegistry(Path(tmp) / "bulk.json"))
+        start = time.perf_counter()
+        bulk.add_recommendations(records)
+        bulk_time = time.perf_counter() - start
+
+    assert list(bulk.recommendations) == list(sequential.recommendations)
+    print(f"{n} recommendations")
+    print(f"  add_recommendation:  {one_at_a_time:.2f}s")
+    print(f"  add_recommendations: {bulk_time:.2f}s ({one_at_a_time / bulk_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
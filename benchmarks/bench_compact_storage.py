@@ -0,0 +1,52 @@
+# benchmarks/bench_compact_storage.py
+"""Compare resident memory of dict-backed and compact recommendation storage.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_compact_storage.py [n_recommendations]
+"""
+
+import sys
+import tracemalloc
+
+from scripts.registry.compact import CompactRecommendationStore
+from scripts.registry.types import MLRStatus, Recommendation, Source
+
+TOPICS = ["optimization", "attention", "normalization", "tokenization", "scaling"]
+AUTHORS = [f"Author{i}" for i in range(500)]
+
+
+def fill(store, n: int) -> None:
+    for i in range(n):
+        author = AUTHORS[i % len(AUTHORS)]
+        year = 2015 + i % 10
+        # Build strings per record, as a YAML loader would
+        store[f"MLR-{year}-{author}001-{i:06d}"] = Recommendation(
+            id=f"MLR-{year}-{author}001-{i:06d}",
+            recommendation=f"Recommendation text number {i}",
+            topic="".join(TOPICS[i % len(TOPICS)]),
+            topic_id=f"{TOPICS[i % len(TOPICS)]}/recommendation-text-number-{i}",
+            source=Source(paper=f"{author} et al. ({year})", paper_id=f"{author}001",
+                          year=year, first_author="".join(author), arxiv_id=f"{year % 100}01.{i % 997:05d}"),
+            status=MLRStatus.STANDARD,
+            implementations=["llama2"] if i % 3 == 0 else [],
+        )
+
+
+def measure(factory, n: int) -> int:
+    tracemalloc.start()
+    store = factory()
+    fill(store, n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main(n: int = 200_000) -> None:
+    plain = measure(dict, n)
+    compact = measure(CompactRecommendationStore, n)
+    print(f"dict     {plain / 2**20:8.1f} MiB")
+    print(f"compact  {compact / 2**20:8.1f} MiB  ({plain / compact:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
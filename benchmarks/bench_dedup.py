@@ -0,0 +1,61 @@
+# benchmarks/bench_dedup.py
+"""Time MinHash/LSH near-duplicate detection and check it against brute force.
+
+Generates synthetic recommendations in which every tenth text restates an
+earlier one with small edits. The LSH clustering runs on the full set; the
+all-pairs comparison it replaces runs on a sample to measure recall.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_dedup.py [n_recommendations]
+"""
+
+import random
+import sys
+import time
+from itertools import combinations
+
+from scripts.registry.dedup import THRESHOLD, find_near_duplicates, minhash, shingles, similarity
+
+def make_texts(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9)))
+                  for _ in range(5_000)]
+    texts = []
+    for i in range(n):
+        if i % 10 == 9:
+            # Restate an earlier recommendation with a small edit
+            words = rng.choice(texts).split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            texts.append(" ".join(words))
+        else:
+            texts.append(" ".join(rng.choices(vocabulary, k=rng.randint(6, 14))))
+    return texts
+
+
+def brute_force_pairs(texts: list[str]) -> set[tuple[int, int]]:
+    signatures = [minhash(shingles(text)) for text in texts]
+    return {(i, j) for i, j in combinations(range(len(texts)), 2)
+            if similarity(signatures[i], signatures[j]) >= THRESHOLD}
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    texts = make_texts(n)
+
+    start = time.perf_counter()
+    clusters = find_near_duplicates(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{n} recommendations: {len(clusters)} clusters in {elapsed:.1f}s")
+
+    sample = texts[:2_000]
+    start = time.perf_counter()
+    expected = brute_force_pairs(sample)
+    brute = time.perf_counter() - start
+    cluster_of = {i: k for k, cluster in enumerate(find_near_duplicates(sample)) for i in cluster}
+    found = sum(1 for i, j in expected if i in cluster_of and cluster_of.get(j) == cluster_of[i])
+    print(f"{len(sample)}-text sample: all-pairs comparison took {brute:.1f}s, "
+          f"LSH recovered {found}/{len(expected)} similar pairs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_serialization.py
+"""Compare the plain serialization path in registry.types with the OmegaConf one.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_serialization.py [n_recommendations]
+"""
+
+import sys
+import timeit
+
+from omegaconf import OmegaConf
+
+from scripts.registry.types import MLRStatus, Recommendation, Source, Evidence
+
+
+def legacy_to_dict(rec: Recommendation) -> dict:
+    """Serialization as implemented before the plain path (OmegaConf round trips)."""
+    def strip(obj):
+        return {k: v for k, v in OmegaConf.to_container(OmegaConf.create(obj)).items() if v is not None}
+    conf = OmegaConf.create({
+        'id': rec.id,
+        'recommendation': rec.recommendation,
+        'topic': rec.topic,
+        'topic_id': rec.topic_id,
+        'source': strip(rec.source),
+        'status': rec.status.value,
+        'supporting_evidence': [strip(e) for e in rec.supporting_evidence],
+        'implementations': rec.implementations,
+        'superseded_by': rec.superseded_by,
+        'deprecated_date': rec.deprecated_date
+    })
+    return {k: v for k, v in OmegaConf.to_container(conf).items() if v is not None}
+
+
+def make_recommendations(n: int) -> list[Recommendation]:
+    return [
+        Recommendation.create(
+            id=f"MLR-2020-Smith{i:03d}-0001",
+            recommendation=f"Recommendation number {i}",
+            topic="optimization",
+            topic_id=f"optimization/recommendation-number-{i}",
+            source=Source(paper="Smith et al. (2020)", paper_id=f"Smith{i:03d}",
+                          year=2020, first_author="Smith", arxiv_id="2020.12345"),
+            status=MLRStatus.STANDARD,
+            supporting_evidence=[Evidence(paper="Jones et al. (2021)", paper_id="Jones001", year=2021)],
+            implementations=["llama2"]
+        )
+        for i in range(n)
+    ]
+
+
+def main(n: int = 2000) -> None:
+    recs = make_recommendations(n)
+    assert all(legacy_to_dict(r) == r.to_dict() for r in recs[:10])
+    cases = {
+        'legacy (OmegaConf)': lambda: [legacy_to_dict(r) for r in recs],
+        'plain': lambda: [r.to_dict() for r in recs],
+        'plain + validate': lambda: [r.to_dict(validate=True) for r in recs],
+    }
+    baseline = None
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=3))
+        baseline = baseline or best
+        print(f"{name:<20} {best * 1e3:9.1f} ms  ({baseline / best:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
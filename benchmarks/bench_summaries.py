@@ -0,0 +1,92 @@
+# benchmarks/bench_summaries.py
+"""Time the summary generators with and without concurrent read-ahead.
+
+Builds a synthetic tree of 10,000 small Python and Markdown files, then runs
+``SummaryGenerator`` (full rebuild) and the special summaries with one I/O
+worker and with several, checking the outputs are identical. A latency can
+be added to every file read to stand in for a network filesystem or a cold
+cache, where reading ahead matters most.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_summaries.py [n_files] [latency_ms]
+"""
+
+import builtins
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from scripts.generate_summaries import generator
+from scripts.generate_summaries.generator import SummaryGenerator
+from scripts.generate_summaries.special_summaries import generate_special_summaries
+
+
+def make_tree(root: Path, n_files: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    for i in range(n_files):
+        directory = root / f"pkg{i % 100}" / f"mod{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        if i % 10 == 0:
+            name = "README.md" if not (directory / "README.md").exists() else f"notes{i}.md"
+            (directory / name).write_text(f"# Module {i}\n" + "Notes.\n" * rng.randint(5, 50))
+        else:
+            body = "".join(f"def f{j}(x: int) -> int:\n    \"\"\"Doc.\"\"\"\n    return x + {j}\n\n"
+                           for j in range(rng.randint(1, 20)))
+            (directory / f"m{i}.py").write_text(body)
+
+
+def add_latency(seconds: float) -> None:
+    """Make every file read by the generators wait first."""
+    if not seconds:
+        return
+    real_open, real_read_text = builtins.open, Path.read_text
+
+    def slow_open(file, *args, **kwargs):
+        time.sleep(seconds)
+        return real_open(file, *args, **kwargs)
+
+    def slow_read_text(self, *args, **kwargs):
+        time.sleep(seconds)
+        return real_read_text(self, *args, **kwargs)
+
+    generator.open = slow_open
+    Path.read_text = slow_read_text
+
+
+def outputs(root: Path) -> dict[Path, bytes]:
+    return {p: p.read_bytes() for p in [*root.rglob("SUMMARY"), *(root / "SUMMARIES").iterdir()]}
+
+
+def main() -> None:
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        make_tree(root, n_files)
+        add_latency(latency)
+        print(f"{n_files} files, {latency * 1000:g}ms added per read")
+
+        results = {}
+        for workers in (1, 8):
+            start = time.perf_counter()
+            SummaryGenerator(root, io_workers=workers).generate_all_summaries(full=True)
+            summaries = time.perf_counter() - start
+            start = time.perf_counter()
+            generate_special_summaries(root, workers)
+            special = time.perf_counter() - start
+            print(f"io_workers={workers}: directory summaries {summaries:.2f}s, "
+                  f"special summaries {special:.2f}s")
+            results[workers] = outputs(root)
+            for path in results[workers]:
+                path.unlink()
+        print("outputs identical:", results[1] == results[8])
+
+
+if __name__ == "__main__":
+    main()
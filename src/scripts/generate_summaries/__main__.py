@@ -70,14 +70,19 @@ from pathlib import Path
 from . import generator
 #from readme_generator.utils import commit_and_push
 from . import special_summaries
+from .prefetch import DEFAULT_IO_WORKERS
 
 
-def generate(root_dir: str = ".", push: bool = True) -> list[Path]:
+def generate(root_dir: str = ".", push: bool = True, full: bool = False,
+             io_workers: int = DEFAULT_IO_WORKERS) -> list[Path]:
     """Generate directory summaries and special summaries.
     
     Args:
         root_dir: Root directory to generate summaries for
         push: Whether to commit and push changes
+        full: Rebuild every directory summary instead of only those whose
+            files changed since the last run
+        io_workers: Threads reading files ahead; 1 reads serially
         
     Returns:
         List of paths to generated summary files
@@ -85,11 +90,11 @@ def generate(root_dir: str = ".", push: bool = True) -> list[Path]:
     logger.info(f"Generating summaries for {root_dir}")
     
     # Generate regular directory summaries
-    gen = generator.SummaryGenerator(root_dir)
-    summary_files = gen.generate_all_summaries()
+    gen = generator.SummaryGenerator(root_dir, io_workers=io_workers)
+    summary_files = gen.generate_all_summaries(full=full)
     
     # Generate special summaries
-    special_files = special_summaries.generate_special_summaries(root_dir)
+    special_files = special_summaries.generate_special_summaries(root_dir, io_workers)
     all_files = summary_files + special_files
     
     if push:
@@ -0,0 +1,294 @@
+"""Include/exclude rules for summary generation.
+
+Rules are compiled once and applied while walking the tree, so excluded
+directories are never entered. Exclusions use ``.gitignore`` pattern
+syntax: a pattern without a slash matches a name at any depth, one with
+a slash matches a path relative to the root, ``*``, ``?``, ``[...]`` and
+``**`` are wildcards, a trailing ``/`` matches directories only and a
+leading ``!`` re-includes what an earlier pattern excluded. Ignore files
+such as ``.gitignore`` are honored too, each applying to its own
+directory and everything below it.
+
+The defaults can be overridden in the ``[tool.summary]`` table of the
+root's ``pyproject.toml``::
+
+    [tool.summary]
+    exclude_patterns = ['.git', 'SUMMARY', 'package-lock.json']
+    exclude_directories = ['.venv', 'node_modules', 'data']
+    include_extensions = ['.py', '.md']
+    ignore_files = ['.gitignore', '.summaryignore']
+    max_file_size_kb = 500
+"""
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import Container, Dict, Iterable, Iterator, Optional, Tuple
+import tomli
+from loguru import logger
+
+DEFAULT_EXCLUDE_PATTERNS = (
+    '.git', '.gitignore', '.pytest_cache', '__pycache__',
+    'SUMMARY', '.coverage', '.env', '.venv', '.idea', '.vscode'
+)
+DEFAULT_EXCLUDE_DIRECTORIES = (
+    '.git', '__pycache__', '.pytest_cache',
+    '.venv', '.idea', '.vscode', '**/.github/workflows'
+)
+DEFAULT_INCLUDE_EXTENSIONS = (
+    '.py', '.md', '.txt', '.yml', '.yaml', '.toml',
+    '.json', '.html', '.css', '.js', '.j2'
+)
+DEFAULT_IGNORE_FILES = ('.gitignore',)
+
+_CONFIG_KEYS = ('exclude_patterns', 'exclude_directories', 'include_extensions',
+                'ignore_files', 'max_file_size_kb')
+
+# Ignore rules in effect in a directory, outermost first
+Ignores = Tuple['_Rules', ...]
+
+
+def _translate(pattern: str) -> Optional[Tuple[str, bool, bool]]:
+    """Translate one gitignore pattern to a regex.
+
+    Returns:
+        ``(regex, negated, directories_only)``, or None for blank lines
+        and comments
+    """
+    if not pattern.endswith('\\ '):
+        pattern = pattern.rstrip()
+    if not pattern or pattern.startswith('#'):
+        return None
+    negated = pattern.startswith('!')
+    if negated or pattern.startswith('\\!') or pattern.startswith('\\#'):
+        pattern = pattern[1:]
+    directories_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    # Patterns with a slash are relative to their directory, others match
+    # a name at any depth
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    regex = [] if anchored else ['(?:.*/)?']
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            regex.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            regex.append('[^/]*')
+        elif c == '?':
+            regex.append('[^/]')
+        elif c == '[' and (end := pattern.find(']', i + 2)) != -1:
+            members = pattern[i + 1:end]
+            if members.startswith('!'):
+                members = '^' + members[1:]
+            regex.append('[' + members.replace('\\', '\\\\') + ']')
+            i = end
+        elif c == '\\' and i + 1 < len(pattern):
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(c))
+        i += 1
+    return ''.join(regex), negated, directories_only
+
+
+class _Rules:
+    """Compiled gitignore-style patterns, relative to one directory."""
+
+    def __init__(self, patterns: Iterable[str], base: str = ''):
+        """Compile patterns.
+
+        Args:
+            patterns: Patterns, one per line as in an ignore file
+            base: Key prefix of the directory the patterns are relative to,
+                ``''`` for the root or ``'a/b/'``
+        """
+        self.base = base
+        translated = [t for t in map(_translate, patterns) if t]
+        self._rules = [(re.compile(regex), negated, directories_only)
+                       for regex, negated, directories_only in translated]
+        # Without negations, a single combined regex decides
+        self._negations = any(negated for _, negated, _ in translated)
+        self._dirs = self._combine(regex for regex, _, _ in translated)
+        self._files = self._combine(regex for regex, _, dirs in translated if not dirs)
+
+    @staticmethod
+    def _combine(regexes: Iterable[str]) -> Optional[re.Pattern]:
+        regexes = list(regexes)
+        return re.compile('|'.join(f'(?:{r})' for r in regexes)) if regexes else None
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """Match a path relative to the root.
+
+        Returns:
+            True if the path is excluded, False if a negated pattern
+            re-includes it, None if no pattern applies
+        """
+        if not rel.startswith(self.base):
+            return None
+        rel = rel[len(self.base):]
+        if not self._negations:
+            combined = self._dirs if is_dir else self._files
+            return True if combined is not None and combined.fullmatch(rel) else None
+        for regex, negated, directories_only in reversed(self._rules):
+            if (is_dir or not directories_only) and regex.fullmatch(rel):
+                return not negated
+        return None
+
+
+class SummaryFilter:
+    """Decide which files and directories summaries cover.
+
+    Paths are given as POSIX paths relative to the root, like ``'a/b.py'``,
+    with the ignore rules of their directory from ``ignores``.
+    """
+
+    def __init__(self,
+                 root_dir: str | Path,
+                 exclude_patterns: Iterable[str] = DEFAULT_EXCLUDE_PATTERNS,
+                 exclude_directories: Iterable[str] = DEFAULT_EXCLUDE_DIRECTORIES,
+                 include_extensions: Iterable[str] = DEFAULT_INCLUDE_EXTENSIONS,
+                 ignore_files: Iterable[str] = DEFAULT_IGNORE_FILES,
+                 max_file_size_kb: Optional[float] = None):
+        """Compile the rules.
+
+        Args:
+            root_dir: Root directory paths are relative to
+            exclude_patterns: Files to leave out; also prunes matching
+                directories, as nothing in them would be included
+            exclude_directories: Directories not to enter
+            include_extensions: Suffixes of files to include
+            ignore_files: Names of ignore files to honor in every directory
+            max_file_size_kb: Leave out files larger than this
+        """
+        self.root_dir = Path(root_dir)
+        self._exclude_files = _Rules(exclude_patterns)
+        self._exclude_dirs = _Rules([*exclude_directories, *exclude_patterns])
+        self._extensions = frozenset(include_extensions)
+        self.ignore_files = tuple(ignore_files)
+        self.max_file_size = None if max_file_size_kb is None else max_file_size_kb * 1024
+        self._ignores_cache: Dict[str, Ignores] = {}
+
+    @classmethod
+    def from_pyproject(cls, root_dir: str | Path) -> 'SummaryFilter':
+        """Load rules from ``[tool.summary]`` in the root's pyproject.toml, if there is one."""
+        path = Path(root_dir) / 'pyproject.toml'
+        try:
+            with open(path, 'rb') as f:
+                config = tomli.load(f).get('tool', {}).get('summary', {})
+        except FileNotFoundError:
+            config = {}
+        unknown = config.keys() - set(_CONFIG_KEYS)
+        if unknown:
+            logger.warning(f"Ignoring unknown [tool.summary] settings in {path}: {sorted(unknown)}")
+        return cls(root_dir, **{key: config[key] for key in _CONFIG_KEYS if key in config})
+
+    def ignores(self, directory: Path, rel_dir: str, inherited: Ignores,
+                names: Optional[Container[str]] = None) -> Ignores:
+        """Add a directory's ignore files to the rules of its parents.
+
+        Args:
+            directory: Directory being entered
+            rel_dir: Its key prefix, ``''`` for the root or ``'a/b/'``
+            inherited: Rules in effect in its parent
+            names: Names of the directory's entries, if already listed, to
+                skip looking for ignore files that don't exist
+        """
+        rules = []
+        for name in self.ignore_files:
+            if names is not None and name not in names:
+                continue
+            try:
+                lines = (directory / name).read_text(encoding='utf-8').splitlines()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if compiled := _Rules(lines, rel_dir):
+                rules.append(compiled)
+        return inherited + tuple(rules) if rules else inherited
+
+    def ignores_above(self, rel_dir: str) -> Ignores:
+        """Rules in effect in a directory's parent, for walks starting below the root."""
+        if not rel_dir:
+            return ()
+        return self._ignores_of(rel_dir[:rel_dir.rstrip('/').rfind('/') + 1])
+
+    def _ignores_of(self, rel_dir: str) -> Ignores:
+        """Rules in effect in a directory, reading ignore files on the way down."""
+        if rel_dir in self._ignores_cache:
+            return self._ignores_cache[rel_dir]
+        ignores = self.ignores(self.root_dir / rel_dir, rel_dir, self.ignores_above(rel_dir))
+        self._ignores_cache[rel_dir] = ignores
+        return ignores
+
+    @staticmethod
+    def ignored(rel: str, is_dir: bool, ignores: Ignores) -> bool:
+        """Check a path against ignore files, the innermost deciding first."""
+        for rules in reversed(ignores):
+            decision = rules.match(rel, is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    def includes_directory(self, rel: str, ignores: Ignores = ()) -> bool:
+        """Check whether to enter a directory."""
+        return self._exclude_dirs.match(rel, True) is not True and not self.ignored(rel, True, ignores)
+
+    def includes_file(self, rel: str, ignores: Ignores = ()) -> bool:
+        """Check whether to summarize a file, apart from its size."""
+        return (os.path.splitext(rel)[1] in self._extensions
+                and self._exclude_files.match(rel, False) is not True
+                and not self.ignored(rel, False, ignores))
+
+    def too_large(self, size: int) -> bool:
+        """Check a file's size against ``max_file_size_kb``."""
+        return self.max_file_size is not None and size > self.max_file_size
+
+    def includes(self, rel: str, is_dir: bool = False) -> bool:
+        """Check a single path as a walk would, including its parent directories."""
+        *parents, _ = rel.split('/')
+        rel_dir = ''
+        for parent in parents:
+            if not self.includes_directory(rel_dir + parent, self._ignores_of(rel_dir)):
+                return False
+            rel_dir += parent + '/'
+        ignores = self._ignores_of(rel_dir)
+        return self.includes_directory(rel, ignores) if is_dir else self.includes_file(rel, ignores)
+
+    def walk(self, pattern: str = '*') -> Iterator[Path]:
+        """Yield files under the root whose name matches a glob.
+
+        Excluded and ignored directories are never entered, and ignored
+        files are skipped; the other file rules don't apply. Files come in
+        depth-first name order, the order ``sorted(rglob())`` gives.
+        """
+        name_regex = re.compile(fnmatch.translate(pattern))
+        yield from self._walk(self.root_dir, '', (), name_regex)
+
+    def _walk(self, directory: Path, rel_dir: str, inherited: Ignores,
+              name_regex: re.Pattern) -> Iterator[Path]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.error(f"Error reading directory {directory}: {e}")
+            return
+        ignores = self.ignores(directory, rel_dir, inherited, {entry.name for entry in entries})
+        for entry in entries:
+            rel = rel_dir + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if self.includes_directory(rel, ignores):
+                    yield from self._walk(directory / entry.name, rel + '/', ignores, name_regex)
+            elif (name_regex.fullmatch(entry.name) and entry.is_file()
+                  and not self.ignored(rel, False, ignores)):
+                yield directory / entry.name
@@ -1,18 +1,198 @@
 """Core summary generation functionality."""
+import codecs
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Set
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
 from loguru import logger
+from ..utils import WriteReport, replace_if_changed, write_if_changed
+from .filters import Ignores, SummaryFilter
+from .prefetch import DEFAULT_IO_WORKERS, Prefetcher
+
+MANIFEST_NAME = '.summary-manifest.json'
+
+# Files the generator writes, which are never summarized
+_GENERATED = frozenset({'SUMMARY', MANIFEST_NAME})
+
+# Bump whenever the summary format changes, so old summaries aren't reused
+MANIFEST_VERSION = 1
+
+# A file modified this close to the previous run could have been modified
+# again within the same mtime tick, so its mtime can't vouch for its content
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Files are copied into summaries this many bytes at a time
+_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class SummaryManifest:
+    """Record of what the previous run summarized.
+
+    ``files`` holds the included source files and ``summaries`` the SUMMARY
+    files, both keyed by POSIX path relative to the root, as
+    ``[size, mtime_ns, sha256]``.
+    """
+    files: Dict[str, list] = field(default_factory=dict)
+    summaries: Dict[str, list] = field(default_factory=dict)
+    # When the run that wrote the manifest started scanning
+    scanned_ns: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> 'SummaryManifest':
+        """Load a manifest, or return an empty one if it is missing or outdated."""
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+            return cls()
+        if data.get('version') != MANIFEST_VERSION:
+            logger.info(f"Manifest {path} is from another version, rebuilding everything")
+            return cls()
+        return cls(data['files'], data['summaries'], data['scanned_ns'])
+
+    def save(self, path: Path) -> None:
+        write_if_changed(path, json.dumps({
+            'version': MANIFEST_VERSION,
+            'scanned_ns': self.scanned_ns,
+            'files': self.files,
+            'summaries': self.summaries,
+        }, sort_keys=True, separators=(',', ':')))
+
+    def file_unchanged(self, key: str, st: os.stat_result) -> bool:
+        """Check a file's stat against its entry, without reading it."""
+        entry = self.files.get(key)
+        return (entry is not None and _same_stat(entry, st)
+                and entry[1] < self.scanned_ns - _RACY_WINDOW_NS)
+
+
+def _same_stat(entry: list, st: os.stat_result) -> bool:
+    return entry[0] == st.st_size and entry[1] == st.st_mtime_ns
+
+
+def _read_bytes(path: Path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _sha256(path: Path) -> Optional[str]:
+    """Hash a file, or return None if it can't be read."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    except OSError:
+        return None
+
+
+@dataclass
+class _Plan:
+    """State of one generation run."""
+    manifest: SummaryManifest = field(default_factory=SummaryManifest)
+    # Included entries of each directory, in summary order, as (path, is_dir)
+    entries: Dict[Path, List[Tuple[Path, bool]]] = field(default_factory=dict)
+    # Manifest key and stat of each included file
+    files: Dict[Path, Tuple[str, os.stat_result]] = field(default_factory=dict)
+    # Stat of each directory's existing SUMMARY
+    summary_stats: Dict[Path, os.stat_result] = field(default_factory=dict)
+    # Directories directly containing an included file; these get a SUMMARY
+    summarized: Set[Path] = field(default_factory=set)
+    # Directories whose summary has to be rebuilt
+    dirty: Set[Path] = field(default_factory=set)
+    # Manifest entries of new or changed files still waiting for a hash
+    unhashed: Dict[Path, list] = field(default_factory=dict)
+    # Rebuilt summaries, as (temporary file, sha256)
+    built: Dict[Path, Tuple[Path, str]] = field(default_factory=dict)
+    # Reads files up to one chunk long ahead of their sections
+    reader: Optional[Prefetcher[bytes]] = None
+
+
+class _SummaryStream:
+    """Write a summary piece by piece, as ``'\\n'.join(pieces)`` would.
+
+    Pieces are copied in chunks, so memory use doesn't depend on how big
+    the summarized files are. A piece that fails part-way is rolled back,
+    leaving only complete pieces.
+    """
+
+    def __init__(self, out: BinaryIO):
+        self.out = out
+        self.digest = hashlib.sha256()
+
+    def begin(self) -> tuple:
+        """Start a piece, returning a mark to roll back to."""
+        mark = (self.out.tell(), self.digest.copy())
+        if mark[0]:
+            self.write(b'\n')
+        return mark
+
+    def write(self, data: bytes) -> None:
+        self.out.write(data)
+        self.digest.update(data)
+
+    def rollback(self, mark: tuple) -> None:
+        """Discard everything written since ``begin`` returned ``mark``."""
+        position, self.digest = mark
+        self.out.seek(position)
+        self.out.truncate()
+
+    def splice(self, path: Path, expected: Optional[str] = None) -> bool:
+        """Append a finished summary as a single piece.
+
+        Args:
+            path: Summary file to copy
+            expected: sha256 the summary must have; it is rolled back if not
+
+        Returns:
+            False if the summary couldn't be read or didn't match
+        """
+        mark = self.begin()
+        source = hashlib.sha256()
+        copied = 0
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                    source.update(chunk)
+                    self.write(chunk)
+                    copied += len(chunk)
+        except OSError:
+            self.rollback(mark)
+            return False
+        matches = expected is None or source.hexdigest() == expected
+        # Empty summaries add no piece, as they add no sections
+        if not matches or not copied:
+            self.rollback(mark)
+        return matches
+
 
 class SummaryGenerator:
     """Generate summary files for each directory in the project."""
     
-    def __init__(self, root_dir: str | Path):
+    def __init__(self,
+                 root_dir: str | Path,
+                 manifest_path: Optional[str | Path] = None,
+                 io_workers: int = DEFAULT_IO_WORKERS,
+                 filters: Optional[SummaryFilter] = None):
         """Initialize generator with root directory.
         
         Args:
             root_dir: Root directory to generate summaries for
+            manifest_path: Where to keep the manifest that makes runs
+                incremental, by default ``.summary-manifest.json`` in the root
+            io_workers: Threads reading files ahead; 1 reads serially
+            filters: Which files to summarize, by default the rules in the
+                root's pyproject.toml, see ``filters``
         """
         self.root_dir = Path(root_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.root_dir / MANIFEST_NAME
+        self.io_workers = io_workers
+        self.filters = filters or SummaryFilter.from_pyproject(self.root_dir)
         
     def should_include_file(self, file_path: Path) -> bool:
         """Determine if a file should be included in the summary.
@@ -23,24 +203,10 @@ class SummaryGenerator:
         Returns:
             True if file should be included in summary
         """
-        # Skip common files we don't want to summarize
-        excluded_files = {
-            '.git', '.gitignore', '.pytest_cache', '__pycache__',
-            'SUMMARY', '.coverage', '.env', '.venv', '.idea', '.vscode'
-        }
-        
-        # Skip excluded directories and files
-        if any(part in excluded_files for part in file_path.parts):
-            return False
-            
-        # Skip .github/workflows directory
-        if '.github/workflows' in str(file_path):
+        # Never summarize our own outputs
+        if file_path.name in _GENERATED:
             return False
-            
-        # Only include text files
-        text_extensions = {'.py', '.md', '.txt', '.yml', '.yaml', '.toml', 
-                         '.json', '.html', '.css', '.js', '.j2'}
-        return file_path.suffix in text_extensions
+        return self.filters.includes(self._relative(file_path))
     
     def should_include_directory(self, directory: Path) -> bool:
         """Determine if a directory should have a summary generated.
@@ -51,95 +217,310 @@ class SummaryGenerator:
         Returns:
             True if directory should have a summary
         """
-        # Skip .github/workflows directory
-        if '.github/workflows' in str(directory):
-            return False
-            
-        # Skip other excluded directories
-        excluded_dirs = {
-            '.git', '__pycache__', '.pytest_cache',
-            '.venv', '.idea', '.vscode'
-        }
-        
-        return not any(part in excluded_dirs for part in directory.parts)
+        rel = self._relative(directory)
+        return not rel or self.filters.includes(rel, is_dir=True)
     
-    def _collect_directories(self) -> Set[Path]:
-        """Collect all directories containing files to summarize.
-        
+    def _relative(self, path: Path) -> str:
+        """POSIX path relative to the root, taking relative paths as already so."""
+        path = Path(path)
+        if path.is_absolute() == self.root_dir.is_absolute() and path.is_relative_to(self.root_dir):
+            path = path.relative_to(self.root_dir)
+        rel = path.as_posix()
+        return '' if rel == '.' else rel
+
+    def _key(self, path: Path) -> str:
+        """Manifest key of a path under the root."""
+        return path.relative_to(self.root_dir).as_posix()
+
+    def _ancestors(self, directory: Path) -> Iterator[Path]:
+        """Yield a directory and its parents, up to the root."""
+        while True:
+            yield directory
+            if directory == self.root_dir or directory == directory.parent:
+                return
+            directory = directory.parent
+
+    def _write_file(self, file_path: Path, out: _SummaryStream, plan: _Plan) -> None:
+        """Append one file's section to a summary, skipping files that can't be read.
+
+        The file is copied a chunk at a time, decoded and with newlines
+        translated as ``read_text`` would. Its hash is recorded if the
+        manifest still needs it.
+        """
+        mark = out.begin()
+        digest = hashlib.sha256()
+        try:
+            # Get relative path from root for the header
+            rel_path = file_path.relative_to(self.root_dir)
+            out.write(f"{'=' * 80}\nFile: {rel_path}\n{'=' * 80}\n".encode('utf-8'))
+
+            decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(),
+                                                   translate=True)
+            for chunk in self._chunks(file_path, plan):
+                digest.update(chunk)
+                out.write(decoder.decode(chunk).encode('utf-8'))
+
+            # Extra newline for separation
+            out.write((decoder.decode(b'', final=True) + '\n\n').encode('utf-8'))
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            out.rollback(mark)
+            return
+        entry = plan.unhashed.pop(file_path, None)
+        if entry is not None:
+            entry[2] = digest.hexdigest()
+
+    def _chunks(self, file_path: Path, plan: _Plan) -> Iterator[bytes]:
+        """Yield a file's content, whole from the read-ahead if it is small."""
+        if plan.reader is not None and plan.files[file_path][1].st_size <= _CHUNK_SIZE:
+            yield plan.reader.get(file_path)
+            return
+        with open(file_path, 'rb') as f:
+            yield from iter(lambda: f.read(_CHUNK_SIZE), b'')
+
+    def _prefetch(self, plan: _Plan, paths: List[Path]) -> Prefetcher[bytes]:
+        """Start reading the small files among ``paths`` ahead, in that order."""
+        small = [path for path in paths if plan.files[path][1].st_size <= _CHUNK_SIZE]
+        return Prefetcher(_read_bytes, small, self.io_workers)
+
+    def _scan(self, directory: Path, plan: _Plan, prefix: Optional[str] = None,
+              ignores: Optional[Ignores] = None) -> None:
+        """Record the included entries under a directory, without reading files.
+
+        Walks the tree once, depth first, listing each directory's entries
+        in name order, which is the order ``sorted(rglob())`` gives.
+        Excluded and ignored directories are not entered.
+
+        Args:
+            directory: Directory to scan
+            plan: State of the run
+            prefix: Manifest key prefix of the directory's entries
+            ignores: Ignore rules in effect in the parent directory
+        """
+        if prefix is None:
+            prefix = '' if directory == self.root_dir else self._key(directory) + '/'
+            ignores = self.filters.ignores_above(prefix)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.error(f"Error reading directory {directory}: {e}")
+            entries = []
+        ignores = self.filters.ignores(directory, prefix, ignores,
+                                       {entry.name for entry in entries})
+
+        included = plan.entries[directory] = []
+        for entry in entries:
+            path = directory / entry.name
+            rel = prefix + entry.name
+            # Like rglob, don't follow symlinks to directories
+            if entry.is_dir(follow_symlinks=False):
+                if self.filters.includes_directory(rel, ignores):
+                    included.append((path, True))
+                    self._scan(path, plan, rel + '/', ignores)
+            elif not entry.is_file():
+                continue
+            elif entry.name in _GENERATED:
+                if entry.name == 'SUMMARY':
+                    plan.summary_stats[directory] = entry.stat()
+            elif self.filters.includes_file(rel, ignores):
+                st = entry.stat()
+                if self.filters.too_large(st.st_size):
+                    logger.debug(f"Skipping {path}: larger than {self.filters.max_file_size} bytes")
+                    continue
+                included.append((path, False))
+                plan.files[path] = (rel, st)
+                plan.summarized.add(directory)
+
+    def _find_changes(self, plan: _Plan) -> Dict[str, list]:
+        """Mark directories whose summaries are out of date.
+
+        A file whose size and mtime match the manifest is taken as unchanged.
+        Any other file the manifest knows is hashed, on the I/O workers, so
+        touched but unmodified files (as after a fresh checkout) don't count
+        as changes.
+        Every directory above a changed, added or removed file is dirty, as
+        is any directory whose SUMMARY is missing or was modified since it
+        was written.
+
         Returns:
-            Set of directory paths
+            Manifest entries for the included files; new files get their
+            hash when their section is written
         """
-        directories = set()
-        for file_path in self.root_dir.rglob('*'):
-            if (file_path.is_file() and 
-                self.should_include_file(file_path) and
-                self.should_include_directory(file_path.parent)):
-                directories.add(file_path.parent)
-        return directories
-        
+        manifest = plan.manifest
+        files: Dict[str, list] = {}
+        stale = []
+        for path, (key, st) in plan.files.items():
+            if manifest.file_unchanged(key, st):
+                files[key] = manifest.files[key]
+                continue
+            files[key] = [st.st_size, st.st_mtime_ns, None]
+            if key in manifest.files:
+                stale.append(path)
+            else:
+                plan.unhashed[path] = files[key]
+                plan.dirty.update(self._ancestors(path.parent))
+
+        with Prefetcher(_sha256, stale, self.io_workers) as hashes:
+            for path in stale:
+                key = plan.files[path][0]
+                entry = files[key]
+                # A file that can't be read is reported when its section is written
+                entry[2] = hashes.get(path)
+                if entry[2] == manifest.files[key][2]:
+                    continue
+                if entry[2] is None:
+                    plan.unhashed[path] = entry
+                plan.dirty.update(self._ancestors(path.parent))
+
+        for key in manifest.files.keys() - files.keys():
+            plan.dirty.update(self._ancestors((self.root_dir / key).parent))
+
+        for directory in plan.summarized:
+            entry = manifest.summaries.get(self._key(directory / 'SUMMARY'))
+            st = plan.summary_stats.get(directory)
+            if entry is None or st is None or not _same_stat(entry, st):
+                plan.dirty.add(directory)
+        return files
+
+    def _write_subtree(self, directory: Path, out: _SummaryStream, plan: _Plan) -> None:
+        """Append the sections of every included file under a directory.
+
+        A subdirectory with a summary of its own contributes that summary as
+        a single piece, since a summary is exactly its subtree's sections
+        joined: one rebuilt in this run is copied from its temporary file,
+        and a clean one from its SUMMARY if that still matches the manifest.
+        Any other is rebuilt first, so each file is read at most once.
+        """
+        if directory not in plan.summarized:
+            self._write_entries(directory, out, plan)
+            return
+
+        if directory not in plan.built:
+            summary_path = directory / 'SUMMARY'
+            entry = plan.manifest.summaries.get(self._key(summary_path))
+            if (directory not in plan.dirty and entry is not None
+                    and out.splice(summary_path, expected=entry[2])):
+                return
+            logger.debug(f"Rebuilding {summary_path}")
+            self._build(directory, plan)
+        out.splice(plan.built[directory][0])
+
+    def _write_entries(self, directory: Path, out: _SummaryStream, plan: _Plan) -> None:
+        """Append a directory's entries in name order, recursing into subdirectories."""
+        for path, is_dir in plan.entries.get(directory, []):
+            if is_dir:
+                self._write_subtree(path, out, plan)
+            else:
+                self._write_file(path, out, plan)
+
+    def _build(self, directory: Path, plan: _Plan) -> None:
+        """Write a directory's summary to a temporary file next to its SUMMARY."""
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.SUMMARY.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                out = _SummaryStream(f)
+                self._write_entries(directory, out, plan)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        plan.built[directory] = (Path(tmp_path), out.digest.hexdigest())
+
     def generate_directory_summary(self, directory: Path) -> str:
         """Generate a summary for a single directory.
-        
+
         Args:
             directory: Directory to generate summary for
-            
+
         Returns:
             Generated summary text
         """
         logger.debug(f"Generating summary for {directory}")
-        summary = []
+        directory = Path(directory)
+        plan = _Plan()
+        self._scan(directory, plan)
+        # Nothing counts as summarized, so every file is written inline, in
+        # the order they were scanned
+        plan.summarized.clear()
+        buffer = io.BytesIO()
+        with self._prefetch(plan, list(plan.files)) as plan.reader:
+            self._write_entries(directory, _SummaryStream(buffer), plan)
+        return buffer.getvalue().decode('utf-8')
         
-        # Process all files in the directory
-        for file_path in sorted(directory.rglob('*')):
-            if not file_path.is_file() or not self.should_include_file(file_path):
-                continue
-                
-            try:
-                # Get relative path from root for the header
-                rel_path = file_path.relative_to(self.root_dir)
-                
-                # Read file content
-                content = file_path.read_text(encoding='utf-8')
-                
-                # Add to summary with clear separation
-                summary.extend([
-                    '=' * 80,
-                    f'File: {rel_path}',
-                    '=' * 80,
-                    content,
-                    '\n'  # Extra newline for separation
-                ])
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                
-        return '\n'.join(summary)
-        
-    def generate_all_summaries(self) -> List[Path]:
+    def generate_all_summaries(self, full: bool = False) -> List[Path]:
         """Generate summary files for all directories.
         
+        Runs are incremental: a manifest of file sizes, mtimes and hashes
+        from the previous run identifies the directories whose subtree
+        changed, and only their summaries are rebuilt. Summaries are
+        streamed to disk, so memory use doesn't grow with file sizes, and
+        summaries whose content hasn't changed are not rewritten.
+        
+        Args:
+            full: Ignore the manifest and rebuild every summary
+            
         Returns:
             List of paths to generated summary files
         """
         logger.info("Starting summary generation")
-        summary_files = []
-        
-        # Collect directories
-        directories = self._collect_directories()
-        logger.info(f"Found {len(directories)} directories to process")
-        
-        # Generate summaries
-        for directory in sorted(directories):
-            if not self.should_include_directory(directory):
-                continue
-                
-            summary_content = self.generate_directory_summary(directory)
-            summary_path = directory / 'SUMMARY'
-            
-            try:
-                summary_path.write_text(summary_content, encoding='utf-8')
-                logger.info(f"Generated summary for {directory}")
-                summary_files.append(summary_path)
-            except Exception as e:
-                logger.error(f"Error writing summary for {directory}: {e}")
-                
-        return summary_files
+        report = WriteReport()
+        scanned_ns = time.time_ns()
+        plan = _Plan(manifest=SummaryManifest() if full else SummaryManifest.load(self.manifest_path))
+
+        if self.should_include_directory(self.root_dir):
+            self._scan(self.root_dir, plan)
+        logger.info(f"Found {len(plan.summarized)} directories to process")
+
+        files = self._find_changes(plan)
+        rebuild = sorted(plan.dirty & plan.summarized)
+        logger.info(f"Rebuilding {len(rebuild)} of {len(plan.summarized)} summaries")
+
+        # Deepest first, so enclosing summaries reuse the rebuilt ones. Each
+        # build reads the files directly in its directory, in name order.
+        rebuild.sort(key=lambda d: len(d.parts), reverse=True)
+        reads = [path for directory in rebuild
+                 for path, is_dir in plan.entries[directory] if not is_dir]
+
+        summaries: Dict[str, list] = {}
+        try:
+            with self._prefetch(plan, reads) as plan.reader:
+                for directory in rebuild:
+                    if directory in plan.built:
+                        continue
+                    try:
+                        self._build(directory, plan)
+                    except Exception as e:
+                        logger.error(f"Error writing summary for {directory}: {e}")
+
+            # Generate summaries
+            for directory in sorted(plan.summarized):
+                summary_path = directory / 'SUMMARY'
+                key = self._key(summary_path)
+                if directory not in plan.built:
+                    if directory not in plan.dirty:
+                        report.record(summary_path, False)
+                        summaries[key] = plan.manifest.summaries[key]
+                    continue
+
+                tmp_path, digest = plan.built[directory]
+                try:
+                    if report.record(summary_path, replace_if_changed(tmp_path, summary_path)):
+                        logger.info(f"Generated summary for {directory}")
+                except Exception as e:
+                    logger.error(f"Error writing summary for {directory}: {e}")
+                    continue
+                st = summary_path.stat()
+                summaries[key] = [st.st_size, st.st_mtime_ns, digest]
+        finally:
+            for tmp_path, _ in plan.built.values():
+                tmp_path.unlink(missing_ok=True)
+
+        # Files whose sections couldn't be written still need a hash
+        for path, entry in plan.unhashed.items():
+            entry[2] = _sha256(path)
+            if entry[2] is None:
+                del files[plan.files[path][0]]
+
+        SummaryManifest(files, summaries, scanned_ns).save(self.manifest_path)
+        logger.info(f"Summaries: {report}")
+        return report.paths
@@ -0,0 +1,77 @@
+"""Concurrent read-ahead for the summary generators."""
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+# Reads mostly wait on the filesystem, so more threads than cores pay off
+DEFAULT_IO_WORKERS = 8
+
+
+class Prefetcher(Generic[T]):
+    """Read files on a thread pool ahead of when they are needed.
+
+    Files are read in the order given, keeping at most ``window`` results
+    in flight or waiting, so memory use stays bounded. Results are handed
+    back by path, so callers process files in their own order and output
+    doesn't depend on which read finishes first. A file that isn't among
+    the prefetched ones is read on the spot, and a failed read raises when
+    its result is asked for, just as a direct read would.
+
+    With ``workers`` of 1 or less no threads are started and every file
+    is read when asked for.
+    """
+
+    def __init__(self,
+                 read: Callable[[Path], T],
+                 paths: Iterable[Path],
+                 workers: int = DEFAULT_IO_WORKERS,
+                 window: int | None = None):
+        """Start reading ahead.
+
+        Args:
+            read: Reads one file
+            paths: Files to read ahead, in the order they will be needed
+            workers: Number of reader threads
+            window: Most results held at once, by default twice ``workers``
+        """
+        self._read = read
+        self._paths: Iterator[Path] = iter(paths)
+        self._pending: Dict[Path, Future] = {}
+        self._window = window or 2 * workers
+        self._executor = (ThreadPoolExecutor(workers, thread_name_prefix='prefetch')
+                          if workers > 1 else None)
+        self._fill()
+
+    def _fill(self) -> None:
+        if self._executor is None:
+            return
+        while len(self._pending) < self._window:
+            path = next(self._paths, None)
+            if path is None:
+                return
+            if path not in self._pending:
+                self._pending[path] = self._executor.submit(self._read, path)
+
+    def get(self, path: Path) -> T:
+        """Return the result of reading a file, waiting for it if necessary."""
+        future = self._pending.pop(path, None)
+        self._fill()
+        if future is None:
+            return self._read(path)
+        return future.result()
+
+    def close(self) -> None:
+        """Stop reading ahead and discard results nobody asked for."""
+        if self._executor is not None:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._executor.shutdown()
+
+    def __enter__(self) -> 'Prefetcher[T]':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
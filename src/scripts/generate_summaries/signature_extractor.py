@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict
 from loguru import logger
+from .filters import SummaryFilter
+from .prefetch import DEFAULT_IO_WORKERS, Prefetcher
 
 @dataclass
 class Signature:
@@ -172,11 +174,16 @@ class SignatureExtractor:
         
         return lines
 
-def generate_python_summary(root_dir: str | Path) -> str:
+def generate_python_summary(root_dir: str | Path,
+                            io_workers: int = DEFAULT_IO_WORKERS,
+                            filters: SummaryFilter | None = None) -> str:
     """Generate enhanced Python project structure summary.
     
     Args:
         root_dir: Root directory of the project
+        io_workers: Threads reading files ahead of parsing; 1 reads serially
+        filters: Directories to search, by default the rules in the root's
+            pyproject.toml
         
     Returns:
         Formatted markdown string of Python signatures
@@ -185,33 +192,35 @@ def generate_python_summary(root_dir: str | Path) -> str:
     extractor = SignatureExtractor()
     content = ["# Python Project Structure\n"]
     
-    for file in sorted(root_dir.rglob("*.py")):
-        if any(part.startswith('.') for part in file.parts):
-            continue
-        if '__pycache__' in file.parts:
-            continue
-            
-        try:
-            # Get relative path
-            rel_path = file.relative_to(root_dir)
-            
-            # Read and extract signatures
-            source = file.read_text()
-            signatures = extractor.extract_signatures(source)
-            
-            # Only include files that have actual content
-            if signatures:
-                content.append(f"## {rel_path}")
-                content.append("```python")
+    filters = filters or SummaryFilter.from_pyproject(root_dir)
+    files = [
+        file for file in sorted(filters.walk("*.py"))
+        if not any(part.startswith('.') for part in file.parts)
+        and '__pycache__' not in file.parts
+    ]
+    with Prefetcher(Path.read_text, files, io_workers) as sources:
+        for file in files:
+            try:
+                # Get relative path
+                rel_path = file.relative_to(root_dir)
                 
-                # Format each signature
-                for sig in signatures:
-                    content.extend(extractor.format_signature(sig))
-                    content.append("")  # Add spacing between top-level items
+                # Read and extract signatures
+                source = sources.get(file)
+                signatures = extractor.extract_signatures(source)
                 
-                content.append("```\n")
-            
-        except Exception as e:
-            logger.error(f"Error processing {file}: {e}")
+                # Only include files that have actual content
+                if signatures:
+                    content.append(f"## {rel_path}")
+                    content.append("```python")
+                    
+                    # Format each signature
+                    for sig in signatures:
+                        content.extend(extractor.format_signature(sig))
+                        content.append("")  # Add spacing between top-level items
+                    
+                    content.append("```\n")
+                
+            except Exception as e:
+                logger.error(f"Error processing {file}: {e}")
     
     return "\n".join(content)
@@ -1,75 +1,91 @@
 """Special summary generators for project-wide summaries."""
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 from loguru import logger
+from ..utils import WriteReport
+from .filters import SummaryFilter
+from .prefetch import DEFAULT_IO_WORKERS, Prefetcher
 from .signature_extractor import SignatureExtractor, generate_python_summary  # New import
 
 class SpecialSummariesGenerator:
     """Generate special project-wide summary files."""
     
-    def __init__(self, root_dir: str | Path):
-        """Initialize generator with root directory."""
+    def __init__(self,
+                 root_dir: str | Path,
+                 io_workers: int = DEFAULT_IO_WORKERS,
+                 filters: SummaryFilter | None = None):
+        """Initialize generator with root directory.
+        
+        Args:
+            root_dir: Root directory of the project
+            io_workers: Threads reading files ahead; 1 reads serially
+            filters: Directories to search, by default the rules in the
+                root's pyproject.toml
+        """
         self.root_dir = Path(root_dir)
         self.summaries_dir = self.root_dir / "SUMMARIES"
         self.signature_extractor = SignatureExtractor()  # New instance
+        self.io_workers = io_workers
+        self.filters = filters or SummaryFilter.from_pyproject(self.root_dir)
     
     def _find_readmes(self, include_root: bool = True) -> List[Path]:
-        """Find all README files in the project."""
+        """Find all README files in the project, outside excluded and ignored directories."""
         readmes = []
-        for file in self.root_dir.rglob("README.md"):
+        for file in self.filters.walk("README.md"):
             if not include_root and file.parent == self.root_dir:
                 continue
             readmes.append(file)
         return sorted(readmes)
     
+    def _readme_summary(self, readmes: List[Path], texts: Dict[Path, str]) -> str:
+        """Concatenate READMEs under headers naming their paths."""
+        content = []
+        for readme in readmes:
+            rel_path = readme.relative_to(self.root_dir)
+            content.extend([
+                "=" * 80,
+                f"# {rel_path}",
+                "=" * 80,
+                texts[readme],
+                "\n"
+            ])
+        return "\n".join(content)
+    
     def generate_special_summaries(self) -> List[Path]:
         """Generate all special summary files.
         
+        Files whose content hasn't changed are not rewritten.
+        
         Returns:
             List of paths to generated summary files
         """
         self.summaries_dir.mkdir(exist_ok=True)
-        generated_files = []
+        report = WriteReport()
+        
+        # Read every README once, concurrently, for both README summaries
+        readmes = self._find_readmes(include_root=True)
+        with Prefetcher(Path.read_text, readmes, self.io_workers) as ahead:
+            texts = {readme: ahead.get(readme) for readme in readmes}
         
         # Generate READMEs.md
         readmes_path = self.summaries_dir / "READMEs.md"
-        readme_content = []
-        for readme in self._find_readmes(include_root=True):
-            rel_path = readme.relative_to(self.root_dir)
-            readme_content.extend([
-                "=" * 80,
-                f"# {rel_path}",
-                "=" * 80,
-                readme.read_text(),
-                "\n"
-            ])
-        readmes_path.write_text("\n".join(readme_content))
-        generated_files.append(readmes_path)
+        report.write(readmes_path, self._readme_summary(readmes, texts))
         
         # Generate README_SUBs.md
         subs_path = self.summaries_dir / "README_SUBs.md"
-        subs_content = []
-        for readme in self._find_readmes(include_root=False):
-            rel_path = readme.relative_to(self.root_dir)
-            subs_content.extend([
-                "=" * 80,
-                f"# {rel_path}",
-                "=" * 80,
-                readme.read_text(),
-                "\n"
-            ])
-        subs_path.write_text("\n".join(subs_content))
-        generated_files.append(subs_path)
+        subs = [readme for readme in readmes if readme.parent != self.root_dir]
+        report.write(subs_path, self._readme_summary(subs, texts))
         
         # Generate enhanced PYTHON.md
         python_path = self.summaries_dir / "PYTHON.md"
-        python_content = generate_python_summary(self.root_dir)  # Using new generator
-        python_path.write_text(python_content)
-        generated_files.append(python_path)
+        python_content = generate_python_summary(self.root_dir, self.io_workers, self.filters)  # Using new generator
+        report.write(python_path, python_content)
         
-        return generated_files
+        logger.info(f"Special summaries: {report}")
+        return report.paths
 
-def generate_special_summaries(root_dir: str | Path = ".") -> List[Path]:
+def generate_special_summaries(root_dir: str | Path = ".",
+                               io_workers: int = DEFAULT_IO_WORKERS) -> List[Path]:
     """Generate special summaries for the project."""
-    generator = SpecialSummariesGenerator(root_dir)
+    generator = SpecialSummariesGenerator(root_dir, io_workers)
     return generator.generate_special_summaries()
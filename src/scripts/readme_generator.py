@@ -2,7 +2,7 @@ from pathlib import Path
 from typing import List
 from loguru import logger
 from jinja2 import Environment, FileSystemLoader
-from .utils import load_config, get_project_root, commit_and_push
+from .utils import load_config, get_project_root, commit_and_push, write_if_changed
 
 def get_section_templates(template_dir: Path) -> List[str]:
     """Get all section templates in proper order.
@@ -74,7 +74,9 @@ def generate_readme() -> None:
     
     readme_path = project_root / 'README.llm'
     logger.debug(f"Writing README to: {readme_path}")
-    readme_path.write_text(output)
+    if not write_if_changed(readme_path, output):
+        logger.info("README is unchanged, nothing to commit")
+        return
     
     logger.info("Committing changes")
     commit_and_push(readme_path)
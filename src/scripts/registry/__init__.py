@@ -7,12 +7,21 @@ from research papers with unique identifiers and status tracking.
 
 from .types import MLRStatus, Recommendation, Source, Evidence
 from .identifiers import MLRIdentifierRegistry
+from .backends import IdentifierStore, JSONIdentifierStore, LogIdentifierStore
 from .recommendations import RecommendationRegistry, build_registry_from_yaml
+from .query import RecommendationQuery
+from .sqlite_store import SQLiteRegistry, SQLiteIdentifierStore
+from .snapshot import RegistrySnapshot, SnapshotFormatError
+from .streaming import RegistryWriter, iter_registry
+from .validation import ValidationIssue, ValidationReport, validate_research_data
+from .reproducible import content_hash, source_date
+from .dedup import find_near_duplicates, link_near_duplicates
 from .io import (
     load_research_yaml,
     save_registry,
     load_registry,
     registry_to_markdown,
+    write_outputs,
     RegistryDataError
 )
 
@@ -24,11 +33,29 @@ __all__ = [
     'Source',
     'Evidence',
     'MLRIdentifierRegistry',
+    'IdentifierStore',
+    'JSONIdentifierStore',
+    'LogIdentifierStore',
+    'SQLiteRegistry',
+    'SQLiteIdentifierStore',
     'RecommendationRegistry',
     'build_registry_from_yaml',
+    'RecommendationQuery',
     'load_research_yaml',
     'save_registry',
     'load_registry',
     'registry_to_markdown',
+    'write_outputs',
+    'RegistryWriter',
+    'RegistrySnapshot',
+    'SnapshotFormatError',
+    'iter_registry',
     'RegistryDataError',
+    'ValidationIssue',
+    'ValidationReport',
+    'validate_research_data',
+    'content_hash',
+    'source_date',
+    'find_near_duplicates',
+    'link_near_duplicates',
 ]
@@ -0,0 +1,154 @@
+# src/scripts/registry/backends.py
+"""Storage backends for MLR identifier state."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import logging
+
+from ..utils import write_if_changed
+
+logger = logging.getLogger(__name__)
+
+# A single identifier allocation: (section, key, value), e.g.
+# ('paper_ids', 'Smith-2020-none', 'Smith001') or ('recommendation_ids', '2020-Smith001', 3)
+Change = Tuple[str, str, Any]
+
+
+def empty_state() -> Dict[str, Dict]:
+    """Return an empty identifier state."""
+    return {'paper_ids': {}, 'recommendation_ids': {}}
+
+
+class IdentifierStore:
+    """Base class for identifier storage backends.
+
+    A backend loads the full identifier state once and is then handed every
+    committed batch of allocations, together with the resulting state.
+    """
+
+    def load(self) -> Dict[str, Dict]:
+        """Load the identifier state."""
+        raise NotImplementedError
+
+    def commit(self, state: Dict[str, Dict], changes: List[Change]) -> None:
+        """Persist a batch of allocations.
+
+        Args:
+            state: Full identifier state after applying ``changes``
+            changes: Allocations made since the previous commit, in order
+        """
+        raise NotImplementedError
+
+
+class JSONIdentifierStore(IdentifierStore):
+    """Keeps the whole identifier state in one JSON file, rewritten on commit."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict]:
+        """Load existing MLR IDs from the JSON file."""
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            logger.info(f"No existing registry found at {self.path}")
+        except json.JSONDecodeError:
+            logger.warning(f"Error reading registry file {self.path}. Starting fresh.")
+        return empty_state()
+
+    def commit(self, state: Dict[str, Dict], changes: List[Change]) -> None:
+        """Atomically rewrite the JSON file with the full state."""
+        write_if_changed(self.path, json.dumps(state, indent=2), fsync=True)
+        logger.debug(f"Saved registry to {self.path}")
+
+
+class LogIdentifierStore(IdentifierStore):
+    """Append-only write-ahead log with periodic snapshot compaction.
+
+    Each allocation is appended to ``<path>.log`` as one JSON line holding the
+    absolute value it sets, so replaying a record twice is harmless. Once the
+    log holds ``compact_every`` records the state is written atomically to the
+    ``path`` snapshot and the log is truncated. On load the snapshot is read and
+    the log replayed on top of it; a torn final record from a crash mid-append
+    is discarded, while any other corruption raises instead of re-issuing IDs.
+    """
+
+    def __init__(self, path: str | Path, compact_every: int = 1000):
+        """Initialize the log store.
+
+        Args:
+            path: Path of the snapshot file; the log lives next to it
+            compact_every: Number of log records that triggers a compaction
+        """
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + '.log')
+        self.compact_every = compact_every
+        self._log_records = 0
+        self._valid_log_size = None
+
+    def load(self) -> Dict[str, Dict]:
+        """Load the snapshot and replay the log on top of it."""
+        state = empty_state()
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+
+        self._log_records = 0
+        self._valid_log_size = 0
+        if self.log_path.exists():
+            with open(self.log_path, 'rb') as f:
+                lines = f.read().split(b'\n')
+            # Everything before the last newline is a complete record
+            for lineno, line in enumerate(lines[:-1], 1):
+                try:
+                    section, key, value = json.loads(line)
+                except (ValueError, TypeError):
+                    raise ValueError(f"Corrupt record at {self.log_path}:{lineno}")
+                state.setdefault(section, {})[key] = value
+                self._log_records += 1
+                self._valid_log_size += len(line) + 1
+            if lines[-1]:
+                logger.warning(f"Discarding incomplete trailing record in {self.log_path}")
+
+        logger.debug(f"Loaded {self._log_records} log records from {self.log_path}")
+        return state
+
+    def commit(self, state: Dict[str, Dict], changes: List[Change]) -> None:
+        """Append the changes to the log, compacting when it grows too long."""
+        if not changes:
+            return
+        if self._valid_log_size is None:
+            self._valid_log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+
+        # Within a batch only the last value written to each key matters
+        latest = {(section, key): value for section, key, value in changes}
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = ''.join(
+            json.dumps([section, key, value]) + '\n'
+            for (section, key), value in latest.items()
+        ).encode()
+        with open(self.log_path, 'ab') as f:
+            # Drop a torn tail left behind by a previous crash before appending
+            if f.tell() != self._valid_log_size:
+                f.truncate(self._valid_log_size)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._valid_log_size += len(payload)
+        self._log_records += len(latest)
+
+        if self._log_records >= self.compact_every:
+            self.compact(state)
+
+    def compact(self, state: Dict[str, Dict]) -> None:
+        """Write a snapshot of ``state`` and truncate the log."""
+        write_if_changed(self.path, json.dumps(state, indent=2), fsync=True)
+        with open(self.log_path, 'wb') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_records = 0
+        self._valid_log_size = 0
+        logger.debug(f"Compacted {self.log_path} into {self.path}")
@@ -0,0 +1,101 @@
+# scripts/registry/cache.py
+"""On-disk cache of parsed registry documents.
+
+Parsing YAML is the slowest step of opening ``research.yaml`` or
+``registry.yaml``. ``cached_load`` pickles the parsed and validated result
+next to the size and SHA-256 of the source file. Every load hashes the file
+and compares the digest; mtimes are not trusted, as contents can change
+within their granularity and checkouts or ``touch -r`` can restore an old
+mtime on new contents. Hashing costs a small fraction of parsing, and a new
+mtime on the same contents (e.g. after a fresh checkout) still hits the cache.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, TypeVar, Union
+import logging
+
+from ..utils import file_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cache entries or of cached documents changes
+CACHE_VERSION = 2
+
+T = TypeVar('T')
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory, honouring ``MLR_CACHE_DIR`` and ``XDG_CACHE_HOME``."""
+    if cache_dir := os.environ.get('MLR_CACHE_DIR'):
+        return Path(cache_dir)
+    return Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'mlr-registry'
+
+
+def _cache_file(path: Path, load: Callable, cache_dir: Path) -> Path:
+    """Name the cache entry for a source file and the loader that parses it."""
+    key = f"{CACHE_VERSION}:{load.__module__}.{load.__qualname__}:{path.resolve()}"
+    return cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.pickle"
+
+
+def _write_entry(cache_file: Path, entry: dict) -> None:
+    """Atomically write a cache entry, logging rather than raising on failure."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not write cache entry {cache_file}: {e}")
+
+
+def cached_load(path: Union[str, Path],
+                load: Callable[[Path], T],
+                cache_dir: Optional[Union[str, Path]] = None) -> T:
+    """Load a file through ``load``, reusing a cached result if the file is unchanged.
+
+    Exceptions raised by ``load`` propagate and nothing is cached. A missing,
+    unreadable or stale cache entry is silently rebuilt.
+
+    Args:
+        path: Source file
+        load: Function that parses and validates the file
+        cache_dir: Directory holding cache entries (default: ``default_cache_dir()``)
+
+    Returns:
+        Whatever ``load`` returns for the file's current contents
+    """
+    path = Path(path)
+    cache_file = _cache_file(path, load, Path(cache_dir) if cache_dir else default_cache_dir())
+    stat = path.stat()
+
+    entry = None
+    try:
+        with open(cache_file, 'rb') as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cache entry {cache_file}: {e}")
+
+    # Hash before parsing, so an edit made meanwhile can only cause a miss later
+    digest = file_digest(path).hex()
+    if entry is not None and (entry['size'], entry['sha256']) == (stat.st_size, digest):
+        logger.debug(f"Loaded {path} from cache")
+        return entry['data']
+
+    data = load(path)
+    _write_entry(cache_file, {
+        'size': stat.st_size,
+        'sha256': digest,
+        'data': data,
+    })
+    return data
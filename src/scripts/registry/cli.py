@@ -6,11 +6,15 @@ from pathlib import Path
 from loguru import logger
 from typing import Optional
 from . import (
-    build_registry_from_yaml,
     load_research_yaml, 
-    save_registry,
-    registry_to_markdown
+    load_registry,
+    write_outputs
 )
+from .cache import default_cache_dir
+from .dedup import THRESHOLD, link_near_duplicates
+from .reproducible import source_date
+from .shards import write_research_shards
+from .incremental import build_registry_incremental, load_fingerprints, save_fingerprints
 #from ..utils import commit_and_push
 from llamero.utils import commit_and_push_to_branch #commit_and_push
 
@@ -18,34 +22,62 @@ def build(
     input_path: str | Path = "data/research.yaml",
     output_dir: str | Path = "data",
     push: bool = True,
-    branch: Optional[str] = "HEAD"
+    branch: Optional[str] = "HEAD",
+    incremental: bool = False,
+    cache: bool = True,
+    strict: bool = False,
+    workers: Optional[int] = None,
+    reproducible: bool = False,
+    link_duplicates: bool = False,
+    duplicate_threshold: float = THRESHOLD
 ) -> None:
     """Build registry from research YAML and generate outputs.
     
     Args:
-        input_path: Path to research YAML file
+        input_path: Path to research YAML file, or a directory of YAML shards
         output_dir: Directory to save outputs (default: data directory)
         push: Whether to commit and push changes
         branch: Optional branch name to commit to (default: current branch)
+        incremental: Reuse the previous registry output for papers that have
+            not changed since the last build
+        cache: Reuse parsed YAML from the on-disk cache when input files are unchanged
+        strict: Run every research data check and fail with a report of all problems
+        workers: Convert year shards to recommendations in this many processes
+        reproducible: Date the outputs from the research data rather than the
+            clock, so unchanged inputs give byte-identical outputs
+        link_duplicates: Cite near-duplicate recommendations from other papers
+            as supporting evidence
+        duplicate_threshold: Minimum estimated text similarity (0-1) for two
+            recommendations to count as near-duplicates
     """
     logger.info(f"Building registry from {input_path}")
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Generate registry
-    yaml_data = load_research_yaml(input_path)
-    registry = build_registry_from_yaml(yaml_data)
-    
-    # Save outputs
     registry_yaml = output_dir / "registry.yaml"
     registry_md = output_dir / "REGISTRY.md"
+    fingerprints_json = output_dir / "registry.fingerprints.json"
     
-    save_registry(registry, registry_yaml)
-    registry_to_markdown(registry, registry_md)
+    # Generate registry
+    cache_dir = default_cache_dir() if cache else None
+    yaml_data = load_research_yaml(input_path, cache_dir=cache_dir, strict=strict)
+    previous_records, fingerprints = None, None
+    if incremental and registry_yaml.exists():
+        previous_records = load_registry(registry_yaml, cache_dir=cache_dir)['recommendations']
+        fingerprints = load_fingerprints(fingerprints_json)
+    registry, fingerprints = build_registry_incremental(
+        yaml_data, previous_records, fingerprints, max_workers=workers,
+        build_date=source_date([input_path]) if reproducible else None
+    )
+    if link_duplicates:
+        clusters = link_near_duplicates(registry, duplicate_threshold)
+        logger.info(f"Linked {len(clusters)} clusters of near-duplicate recommendations")
+    
+    # Save outputs from a single export
+    rdme = output_dir.parent / "docs/readme/sections/registry.md.j2"
+    write_outputs(registry, [registry_yaml, registry_md, rdme])
+    save_fingerprints(fingerprints, fingerprints_json)
     logger.info(f"Registry outputs saved to {output_dir}")
-
-    rdme= output_dir.parent / "docs/readme/sections/registry.md.j2"
-    registry_to_markdown(registry, rdme)
     
     
     if push:
@@ -54,15 +86,32 @@ def build(
         commit_and_push_to_branch(
             message="Update ML training registry",
             branch=branch or "main",
-            paths=[registry_yaml, registry_md, rdme],
+            paths=[registry_yaml, registry_md, rdme, fingerprints_json],
             force=False
         )
 
 
+def shard(
+    input_path: str | Path = "data/research.yaml",
+    output_dir: str | Path = "data/research"
+) -> None:
+    """Split a research YAML file into one shard per year.
+    
+    Args:
+        input_path: Path to research YAML file
+        output_dir: Directory to write the shards to
+    """
+    report = write_research_shards(load_research_yaml(input_path), output_dir)
+    logger.info(f"Research shards in {output_dir}: {report}")
+    for path in report.written:
+        logger.info(f"Wrote {path}")
+
+
 def cli():
     """CLI entry point."""
     return fire.Fire({
-        'build': build
+        'build': build,
+        'shard': shard
     })
 
 
@@ -0,0 +1,154 @@
+# src/scripts/registry/compact.py
+"""Columnar, memory-compact storage for large recommendation registries."""
+
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+from .types import MLRStatus, Recommendation, Source, Evidence
+
+_STATUSES = list(MLRStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+
+class StringPool:
+    """Interns repeated values and hands out integer codes for them.
+
+    Code 0 is reserved for ``None``.
+    """
+
+    __slots__ = ('values', '_codes')
+
+    def __init__(self):
+        self.values: List[Any] = [None]
+        self._codes: Dict[Hashable, int] = {}
+
+    def encode(self, value: Any) -> int:
+        """Return the code for a value, adding it to the pool if needed."""
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> Any:
+        """Return the value stored under a code."""
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class CompactRecommendationStore(MutableMapping):
+    """A ``Dict[str, Recommendation]`` replacement that stores fields column-wise.
+
+    Fields shared by many recommendations (topic, paper, author, year, arXiv ID,
+    implementations) are interned in a ``StringPool`` and stored as integer
+    codes in ``array`` columns; the status is a one-byte code. Rarely set fields
+    (supporting evidence, supersession, deprecation date) live in a sparse side
+    table. ``Recommendation`` objects are materialized on access, so they are
+    snapshots: write a modified recommendation back with ``store[mlr_id] = rec``.
+    """
+
+    _POOLED = ('topic', 'paper', 'paper_id', 'first_author', 'arxiv_id', 'year', 'implementations')
+
+    def __init__(self):
+        self.pool = StringPool()
+        self._rows: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._text: List[str] = []
+        self._topic_ids: List[str] = []
+        self._status = array('B')
+        self._columns = {name: array('I') for name in self._POOLED}
+        self._sparse: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[str]:
+        return (mlr_id for mlr_id in self._ids if mlr_id is not None)
+
+    def __contains__(self, mlr_id: object) -> bool:
+        return mlr_id in self._rows
+
+    def __getitem__(self, mlr_id: str) -> Recommendation:
+        return self._materialize(self._rows[mlr_id])
+
+    def __setitem__(self, mlr_id: str, rec: Recommendation) -> None:
+        values = {
+            'topic': rec.topic,
+            'paper': rec.source.paper,
+            'paper_id': rec.source.paper_id,
+            'first_author': rec.source.first_author,
+            'arxiv_id': rec.source.arxiv_id,
+            'year': rec.source.year,
+            'implementations': tuple(rec.implementations),
+        }
+        sparse = {
+            key: value for key, value in (
+                ('supporting_evidence', [(e.paper, e.paper_id, e.year, e.arxiv_id)
+                                         for e in rec.supporting_evidence]),
+                ('superseded_by', rec.superseded_by),
+                ('deprecated_date', rec.deprecated_date),
+            ) if value
+        }
+
+        row = self._rows.get(mlr_id)
+        if row is None:
+            row = self._rows[mlr_id] = len(self._ids)
+            self._ids.append(mlr_id)
+            self._text.append(rec.recommendation)
+            self._topic_ids.append(rec.topic_id)
+            self._status.append(_STATUS_CODES[rec.status])
+            for name, value in values.items():
+                self._columns[name].append(self.pool.encode(value))
+        else:
+            self._text[row] = rec.recommendation
+            self._topic_ids[row] = rec.topic_id
+            self._status[row] = _STATUS_CODES[rec.status]
+            for name, value in values.items():
+                self._columns[name][row] = self.pool.encode(value)
+
+        if sparse:
+            self._sparse[row] = sparse
+        else:
+            self._sparse.pop(row, None)
+
+    def __delitem__(self, mlr_id: str) -> None:
+        # Leave a tombstone so that later row numbers stay valid
+        row = self._rows.pop(mlr_id)
+        self._ids[row] = None
+        self._sparse.pop(row, None)
+
+    def _materialize(self, row: int) -> Recommendation:
+        decode = self.pool.decode
+        columns = self._columns
+        sparse = self._sparse.get(row, {})
+        return Recommendation(
+            id=self._ids[row],
+            recommendation=self._text[row],
+            topic=decode(columns['topic'][row]),
+            topic_id=self._topic_ids[row],
+            source=Source(
+                paper=decode(columns['paper'][row]),
+                paper_id=decode(columns['paper_id'][row]),
+                year=decode(columns['year'][row]),
+                first_author=decode(columns['first_author'][row]),
+                arxiv_id=decode(columns['arxiv_id'][row]),
+            ),
+            status=_STATUSES[self._status[row]],
+            supporting_evidence=[Evidence(*fields) for fields in sparse.get('supporting_evidence', [])],
+            superseded_by=sparse.get('superseded_by'),
+            deprecated_date=sparse.get('deprecated_date'),
+            implementations=list(decode(columns['implementations'][row])),
+        )
+
+    def status_of(self, mlr_id: str) -> MLRStatus:
+        """Return a recommendation's status without materializing it."""
+        return _STATUSES[self._status[self._rows[mlr_id]]]
+
+    def year_of(self, mlr_id: str) -> int:
+        """Return a recommendation's source year without materializing it."""
+        return self.pool.decode(self._columns['year'][self._rows[mlr_id]])
@@ -0,0 +1,204 @@
+# scripts/registry/dedup.py
+"""Near-duplicate detection for recommendations.
+
+Recommendation texts are normalized and cut into character shingles. Each
+text gets a MinHash signature, and locality-sensitive hashing splits the
+signatures into bands: texts that agree on every row of some band land in
+the same bucket and become candidate pairs. Only candidates are compared,
+so the work grows with the number of texts rather than its square.
+
+Signatures use one-permutation hashing: each shingle is hashed once and
+the hash picks both a bin and a value, each bin keeping its minimum, with
+empty bins filled in from their neighbours ("densified"). That costs one
+hash per shingle instead of one per shingle and signature position.
+Shingles are hashed with BLAKE2b, which is stable across processes, so
+results are reproducible.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+import logging
+
+from .types import Evidence
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 4
+THRESHOLD = 0.5
+
+Signature = Tuple[int, ...]
+
+_HASH_BITS = 64
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Cut normalized text into overlapping character shingles.
+
+    Text is lower-cased and runs of punctuation and whitespace become single
+    spaces, so formatting differences don't count as differences.
+    """
+    normalized = _NON_WORD.sub(' ', text.lower()).strip()
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+@lru_cache(maxsize=1 << 18)
+def _shingle_hash(shingle: str) -> int:
+    """Hash a shingle to 64 bits; cached, as shingles recur across texts."""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def minhash(shingle_set: Iterable[str], num_perm: int = NUM_PERM) -> Signature:
+    """Compute the MinHash signature of a set of shingles.
+
+    Args:
+        shingle_set: Non-empty set of shingles
+        num_perm: Signature length
+
+    Returns:
+        The signature; positions of two signatures agree with probability
+        close to the Jaccard similarity of their shingle sets
+    """
+    empty = 1 << _HASH_BITS
+    bins = [empty] * num_perm
+    for h in map(_shingle_hash, shingle_set):
+        position, value = h % num_perm, h // num_perm
+        if value < bins[position]:
+            bins[position] = value
+
+    # Fill each empty bin from the next non-empty one to its right, offset by
+    # the distance so borrowed values never equal genuine ones
+    signature = list(bins)
+    for position in range(num_perm):
+        if bins[position] == empty:
+            distance = 1
+            while bins[(position + distance) % num_perm] == empty:
+                distance += 1
+            signature[position] = bins[(position + distance) % num_perm] + distance * empty
+    return tuple(signature)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class _DisjointSet:
+    """Union-find over integer positions."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # Keep the earliest position as the root, so clusters are ordered
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def find_near_duplicates(texts: Sequence[str],
+                         threshold: float = THRESHOLD,
+                         num_perm: int = NUM_PERM,
+                         bands: int = BANDS) -> List[List[int]]:
+    """Cluster texts that are near-duplicates of each other.
+
+    Within each LSH bucket, members are compared with the bucket's first
+    member only, which keeps the number of comparisons linear in the bucket
+    size; pairs missed that way are usually joined through another band or
+    transitively.
+
+    Args:
+        texts: Texts to cluster
+        threshold: Minimum estimated Jaccard similarity of shingle sets for
+            two texts to be linked
+        num_perm: MinHash signature length
+        bands: Number of LSH bands; ``num_perm`` must be a multiple of it.
+            More bands find less similar candidates at the cost of more
+            comparisons.
+
+    Returns:
+        Clusters of two or more positions into ``texts``, each in ascending
+        order, ordered by their first position
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+    rows = num_perm // bands
+    signatures = [minhash(shingles(text), num_perm) for text in texts]
+
+    buckets: Dict[Tuple[int, Signature], List[int]] = defaultdict(list)
+    for position, signature in enumerate(signatures):
+        for band in range(bands):
+            buckets[band, signature[band * rows:(band + 1) * rows]].append(position)
+
+    clusters = _DisjointSet(len(texts))
+    comparisons = 0
+    for members in buckets.values():
+        first = members[0]
+        for other in members[1:]:
+            if clusters.find(first) == clusters.find(other):
+                continue
+            comparisons += 1
+            if similarity(signatures[first], signatures[other]) >= threshold:
+                clusters.union(first, other)
+
+    grouped: Dict[int, List[int]] = defaultdict(list)
+    for position in range(len(texts)):
+        grouped[clusters.find(position)].append(position)
+    result = [members for members in grouped.values() if len(members) > 1]
+    logger.info(f"Found {len(result)} near-duplicate clusters among {len(texts)} texts "
+                f"({comparisons} candidate comparisons)")
+    return result
+
+
+def link_near_duplicates(registry, threshold: float = THRESHOLD) -> List[List[str]]:
+    """Record near-duplicate recommendations from other papers as supporting evidence.
+
+    Each recommendation in a cluster gains an ``Evidence`` entry for every
+    other paper in the cluster it doesn't already cite. Linking is
+    idempotent, so it can run again on a registry restored from an earlier
+    build.
+
+    Args:
+        registry: ``RecommendationRegistry`` to update in place
+        threshold: Minimum estimated Jaccard similarity, see ``find_near_duplicates``
+
+    Returns:
+        The clusters found, as lists of MLR IDs
+    """
+    mlr_ids = list(registry.recommendations)
+    recs = [registry.recommendations[mlr_id] for mlr_id in mlr_ids]
+    clusters = find_near_duplicates([rec.recommendation for rec in recs], threshold)
+
+    for cluster in clusters:
+        for position in cluster:
+            rec = recs[position]
+            cited = {e.paper_id for e in rec.supporting_evidence} | {rec.source.paper_id}
+            added = False
+            for other in cluster:
+                source = recs[other].source
+                if source.paper_id in cited:
+                    continue
+                rec.supporting_evidence.append(Evidence(
+                    paper=source.paper, paper_id=source.paper_id,
+                    year=source.year, arxiv_id=source.arxiv_id
+                ))
+                cited.add(source.paper_id)
+                added = True
+            if added:
+                # Compact stores hand out copies, so write the change back
+                registry.recommendations[rec.id] = rec
+    return [[mlr_ids[position] for position in cluster] for cluster in clusters]
@@ -1,39 +1,40 @@
 # scripts/registry/identifiers.py
 """MLR identifier generation and management."""
 
-import json
-import os
+import copy
 import re
 from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional
 import logging
 
+from .backends import Change, IdentifierStore, JSONIdentifierStore
+
 logger = logging.getLogger(__name__)
 
 class MLRIdentifierRegistry:
     """Manages unique identifiers for ML recommendations."""
     
-    def __init__(self, registry_file: str | Path = "mlr_registry.json"):
+    def __init__(self,
+                 registry_file: str | Path = "mlr_registry.json",
+                 store: Optional[IdentifierStore] = None):
         """Initialize the identifier registry.
         
         Args:
             registry_file: Path to the JSON file storing ID mappings
+            store: Storage backend; defaults to a JSONIdentifierStore on registry_file
         """
         self.registry_file = Path(registry_file)
+        self.store = store or JSONIdentifierStore(self.registry_file)
         self.current_ids = self._load_registry()
         self.author_counters = self._initialize_author_counters()
+        self._batch_depth = 0
+        self._pending: List[Change] = []
         
     def _load_registry(self) -> Dict[str, Dict]:
-        """Load existing MLR IDs from registry file."""
-        try:
-            if self.registry_file.exists():
-                with open(self.registry_file, 'r') as f:
-                    return json.load(f)
-            logger.info(f"No existing registry found at {self.registry_file}")
-        except json.JSONDecodeError:
-            logger.warning(f"Error reading registry file {self.registry_file}. Starting fresh.")
-        return {'paper_ids': {}, 'recommendation_ids': {}}
+        """Load existing MLR IDs from the storage backend."""
+        return self.store.load()
     
     def _initialize_author_counters(self) -> Dict[str, int]:
         """Initialize counters for author IDs from existing registry."""
@@ -45,11 +46,52 @@ class MLRIdentifierRegistry:
         return counters
     
     def _save_registry(self) -> None:
-        """Save current MLR IDs to registry file."""
-        self.registry_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.registry_file, 'w') as f:
-            json.dump(self.current_ids, f, indent=2)
-        logger.debug(f"Saved registry to {self.registry_file}")
+        """Hand pending allocations to the storage backend."""
+        self.store.commit(self.current_ids, self._pending)
+        self._pending = []
+    
+    def _record(self, section: str, key: str, value) -> None:
+        """Record an allocation, persisting immediately unless inside a batch."""
+        self._pending.append((section, key, value))
+        if not self._batch_depth:
+            self._save_registry()
+    
+    @contextmanager
+    def batch(self) -> Iterator['MLRIdentifierRegistry']:
+        """Group identifier allocations into a single transaction.
+        
+        Inside the block new IDs are only kept in memory. On normal exit the
+        registry is flushed once; if the block raises, all allocations made
+        inside it are rolled back. Nested batches join the outermost one.
+        
+        Yields:
+            This registry
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+        
+        saved_ids = copy.deepcopy(self.current_ids)
+        saved_counters = dict(self.author_counters)
+        saved_pending = list(self._pending)
+        self._batch_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.current_ids = saved_ids
+            self.author_counters = defaultdict(int, saved_counters)
+            self._pending = saved_pending
+            logger.debug(f"Rolled back identifier batch for {self.registry_file}")
+            raise
+        finally:
+            self._batch_depth = 0
+        
+        if self._pending:
+            self._save_registry()
     
     def get_paper_id(self, first_author: str, year: int, arxiv_id: Optional[str] = None) -> str:
         """Get or generate a paper identifier.
@@ -72,7 +114,7 @@ class MLRIdentifierRegistry:
         paper_id = f"{author_base}{self.author_counters[author_base]:03d}"
         
         self.current_ids['paper_ids'][paper_key] = paper_id
-        self._save_registry()
+        self._record('paper_ids', paper_key, paper_id)
         logger.debug(f"Generated new paper ID {paper_id} for {paper_key}")
         
         return paper_id
@@ -92,7 +134,43 @@ class MLRIdentifierRegistry:
             self.current_ids['recommendation_ids'][key] = 0
         
         self.current_ids['recommendation_ids'][key] += 1
-        mlr_id = f"MLR-{year}-{paper_id}-{self.current_ids['recommendation_ids'][key]:04d}"
-        self._save_registry()
+        count = self.current_ids['recommendation_ids'][key]
+        mlr_id = f"MLR-{year}-{paper_id}-{count:04d}"
+        self._record('recommendation_ids', key, count)
         logger.debug(f"Generated new MLR ID {mlr_id}")
         return mlr_id
+
+    def reserve_id(self, mlr_id: str, first_author: str, arxiv_id: Optional[str] = None) -> str:
+        """Mark an MLR identifier issued by an earlier build as taken.
+        
+        Registers the identifier's paper ID and raises the author and
+        recommendation counters to at least the reserved values, so IDs
+        generated afterwards can never collide with it.
+        
+        Args:
+            mlr_id: Previously issued MLR identifier
+            first_author: First author of the source paper
+            arxiv_id: Optional arXiv identifier of the source paper
+            
+        Returns:
+            The identifier's paper ID
+            
+        Raises:
+            ValueError: If mlr_id is not a well-formed MLR identifier
+        """
+        match = re.fullmatch(r'MLR-(\d+)-(([A-Za-z]+)(\d+))-(\d+)', mlr_id)
+        if not match:
+            raise ValueError(f"Malformed MLR identifier: {mlr_id}")
+        year, paper_id, author_base, author_num, count = match.groups()
+        
+        paper_key = f"{first_author}-{year}-{arxiv_id if arxiv_id else 'none'}"
+        if paper_key not in self.current_ids['paper_ids']:
+            self.current_ids['paper_ids'][paper_key] = paper_id
+            self._record('paper_ids', paper_key, paper_id)
+        self.author_counters[author_base] = max(self.author_counters[author_base], int(author_num))
+        
+        key = f"{year}-{paper_id}"
+        if self.current_ids['recommendation_ids'].get(key, 0) < int(count):
+            self.current_ids['recommendation_ids'][key] = int(count)
+            self._record('recommendation_ids', key, int(count))
+        return paper_id
@@ -0,0 +1,154 @@
+# scripts/registry/incremental.py
+"""Incremental registry builds.
+
+Each paper entry in the research data is fingerprinted by hashing the fields
+that feed its recommendations. The fingerprints, together with the MLR IDs each
+paper produced, are saved next to the registry output. On the next build,
+papers whose fingerprint is unchanged get their previously exported
+recommendations restored as-is; only new or edited papers go through
+``add_recommendation`` again. Every previously issued ID is reserved in the
+identifier registry first, so newly issued IDs never collide with them and
+an edited paper keeps its paper ID. Within an edited paper, recommendations
+whose text is unchanged keep their MLR IDs too; only new texts get new ones.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import logging
+
+from .types import Recommendation
+from .recommendations import RecommendationRegistry, draft_shards
+from .identifiers import MLRIdentifierRegistry
+from ..utils import write_if_changed
+
+logger = logging.getLogger(__name__)
+
+# Paper fields that determine the recommendations built from an entry
+FINGERPRINT_FIELDS = ('title', 'first_author', 'arxiv_id', 'sota', 'topics', 'attic', 'models', 'experimental')
+
+Fingerprints = Dict[str, Dict[str, Any]]
+
+
+def paper_key(year, paper: Dict) -> str:
+    """Identify a paper entry across builds by its year and arXiv ID or title."""
+    return f"{year}/{paper.get('arxiv_id') or paper.get('title')}"
+
+
+def paper_fingerprint(year, paper: Dict) -> str:
+    """Hash the fields of a paper entry that affect its recommendations."""
+    fields = {name: paper.get(name) for name in FINGERPRINT_FIELDS}
+    fields['year'] = str(year)
+    payload = json.dumps(fields, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_fingerprints(file_path: Union[str, Path]) -> Fingerprints:
+    """Load saved paper fingerprints, returning an empty mapping if there are none."""
+    file_path = Path(file_path)
+    if not file_path.exists():
+        return {}
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
+def save_fingerprints(fingerprints: Fingerprints, file_path: Union[str, Path]) -> bool:
+    """Atomically write paper fingerprints to a JSON file, unless they are unchanged."""
+    return write_if_changed(file_path, json.dumps(fingerprints, indent=2, sort_keys=True))
+
+
+def _keep_ids(drafts: Iterable[Dict], previous_records: Iterable[Dict]) -> List[Dict]:
+    """Give drafts the MLR IDs of previous recommendations with the same text and source.
+
+    Previous IDs are handed out in order, so a text drafted several times
+    (say as a standard and an experimental recommendation) keeps each ID.
+    """
+    available: Dict[Tuple, List[str]] = {}
+    for rec in previous_records:
+        source = rec['source']
+        key = (rec['recommendation'], source['first_author'], source.get('arxiv_id'))
+        available.setdefault(key, []).append(rec['id'])
+    kept = []
+    for draft in drafts:
+        ids = available.get((draft['recommendation'], draft['first_author'], draft.get('arxiv_id')))
+        kept.append({**draft, 'mlr_id': ids.pop(0)} if ids else draft)
+    return kept
+
+
+def build_registry_incremental(
+    yaml_data: Dict,
+    previous_records: Optional[List[Dict]] = None,
+    fingerprints: Optional[Fingerprints] = None,
+    id_registry: Optional[MLRIdentifierRegistry] = None,
+    compact: bool = False,
+    max_workers: Optional[int] = None,
+    build_date: Optional[str] = None
+) -> Tuple[RecommendationRegistry, Fingerprints]:
+    """Build a registry, reusing previous records for unchanged papers.
+
+    Without previous records or fingerprints this is a full build.
+
+    Args:
+        yaml_data: Research data keyed by year
+        previous_records: Recommendations exported by the previous build
+        fingerprints: Fingerprints saved by the previous build
+        id_registry: Identifier registry used to allocate MLR IDs
+        compact: Build a registry backed by a ``CompactRecommendationStore``
+        max_workers: Draft changed papers in a process pool of this size
+        build_date: Date to record instead of today's, for reproducible builds
+
+    Returns:
+        The registry and the fingerprints to save for the next build
+    """
+    registry = RecommendationRegistry(id_registry, compact=compact, build_date=build_date)
+    previous = {rec['id']: rec for rec in previous_records or []}
+    fingerprints = fingerprints or {}
+    new_fingerprints: Fingerprints = {}
+    reused = rebuilt = 0
+
+    plan = []
+    for year, papers in yaml_data.items():
+        for position, paper in enumerate(papers):
+            key = paper_key(year, paper)
+            if key in new_fingerprints:
+                key = f"{key}#{position}"
+            fingerprint = paper_fingerprint(year, paper)
+            saved = fingerprints.get(key, {})
+            saved_ids = saved.get('ids') or []
+            previous_ids = [mlr_id for mlr_id in saved_ids if mlr_id in previous]
+            unchanged = (saved.get('fingerprint') == fingerprint
+                         and len(previous_ids) == len(saved_ids))
+            new_fingerprints[key] = {'fingerprint': fingerprint, 'ids': saved_ids if unchanged else None}
+            plan.append((key, year, position, unchanged, previous_ids))
+
+    # Draft the changed papers of each year, possibly in parallel
+    changed: Dict[Any, List[Dict]] = {}
+    for key, year, position, unchanged, previous_ids in plan:
+        if not unchanged:
+            changed.setdefault(year, []).append(yaml_data[year][position])
+    drafted = draft_shards(list(changed.items()), max_workers)
+    pending_drafts = iter(drafts for shard in drafted for drafts in shard)
+
+    with registry.id_registry.batch():
+        # Reserve the IDs of changed papers as well as unchanged ones before
+        # anything new is allocated
+        for key, year, position, unchanged, previous_ids in plan:
+            for mlr_id in previous_ids:
+                registry.id_registry.reserve_id(
+                    mlr_id, previous[mlr_id]['source']['first_author'],
+                    previous[mlr_id]['source'].get('arxiv_id')
+                )
+
+        for key, year, position, unchanged, previous_ids in plan:
+            if unchanged:
+                for mlr_id in previous_ids:
+                    registry.restore_recommendation(Recommendation.from_dict(previous[mlr_id]))
+                reused += 1
+            else:
+                drafts = _keep_ids(next(pending_drafts), (previous[mlr_id] for mlr_id in previous_ids))
+                new_fingerprints[key]['ids'] = registry.add_recommendations(drafts)
+                rebuilt += 1
+
+    logger.info(f"Incremental build reused {reused} papers and rebuilt {rebuilt}")
+    return registry, new_fingerprints
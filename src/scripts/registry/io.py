@@ -1,84 +1,85 @@
 # src/scripts/registry/io.py
 """I/O operations for the ML recommendation registry."""
 
+import io
 import yaml
 import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, Iterable, Optional, Union
 from loguru import logger
 from datetime import datetime
 from collections import defaultdict
 
 from .recommendations import RecommendationRegistry
+from .sqlite_store import SQLiteRegistry, is_sqlite_path, write_sqlite_registry
+from .snapshot import RegistrySnapshot, is_snapshot_path, write_snapshot
+from .streaming import RegistryWriter, is_jsonl_path, iter_registry_records
+from .cache import cached_load
+from .shards import combine_shards, research_shard_paths
 from .types import MLRStatus
+from .validation import RegistryDataError, check_paper, validate_research_data
+from ..utils import WriteReport, write_if_changed
 
-class RegistryDataError(Exception):
-    """Raised when there are issues with registry data format."""
-    pass
+# Use the libyaml bindings when PyYAML was built with them
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
-def validate_paper_entry(paper: Dict, year: str) -> None:
+class _ReadOnlyDict(dict):
+    """A dict that refuses to change, so concurrent writers can share it.
+
+    Being a real dict, it serializes like one with ``json``; ``yaml`` needs
+    the representer registered below.
+    """
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError("Registry exports shared between writers are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _refuse
+    clear = pop = popitem = setdefault = update = _refuse
+
+class _Dumper(SafeDumper):
+    """SafeDumper that also writes read-only exports."""
+
+_Dumper.add_representer(_ReadOnlyDict, _Dumper.represent_dict)
+
+def _read_only(value):
+    """Copy export data into read-only dicts and tuples."""
+    if isinstance(value, dict):
+        return _ReadOnlyDict((key, _read_only(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_read_only(item) for item in value)
+    return value
+
+def validate_paper_entry(paper: Dict, year: str, strict: bool = False) -> None:
     """Validate a single paper entry.
     
     Args:
         paper: Dictionary containing paper data
         year: Year the paper is from (for error messages)
+        strict: Also check field types, year consistency, topics and SOTA entries
         
     Raises:
         RegistryDataError: If paper data is invalid
     """
-    required_fields = {
-        'title': str,
-        'first_author': str,
-        'year': int,
-        #'topics': list
-    }
-
-    # Check for missing required fields
-    missing_fields = [field for field in required_fields if field not in paper]
-    if missing_fields:
+    problems = check_paper(paper, year, strict)
+    if problems:
         logger.warning(paper)
-        raise RegistryDataError(
-            f"Paper in year {year} missing required fields: {', '.join(missing_fields)}"
-        )
-
-    # Check field types
-    # for field, expected_type in required_fields.items():
-    #     if not isinstance(paper[field], expected_type):
-    #         logger.warning(paper)
-    #         raise RegistryDataError(
-    #             f"Paper in year {year} has invalid type for {field}: "
-    #             f"expected {expected_type.__name__}, got {type(paper[field]).__name__}"
-    #         )
-
-    # # Validate year matches container
-    # if str(paper['year']) != str(year):
-    #     raise RegistryDataError(
-    #         f"Paper year {paper['year']} doesn't match container year {year}"
-    #     )
-
-    # # Validate topics not empty
-    # if not paper['topics']:
-    #     raise RegistryDataError(
-    #         f"Paper '{paper['title']}' ({year}) has empty topics list"
-    #     )
-
-    # Validate topics are strings
-    # if not all(isinstance(topic, str) for topic in paper['topics']):
-    #     raise RegistryDataError(
-    #         f"Paper '{paper['title']}' ({year}) has non-string topics"
-    #     )
-
-    # # If SOTA recommendations present, validate they're strings
-    # if 'sota' in paper and not all(isinstance(rec, str) for rec in paper['sota']):
-    #     raise RegistryDataError(
-    #         f"Paper '{paper['title']}' ({year}) has non-string SOTA recommendations"
-    #     )
-
-def load_research_yaml(file_path: Union[str, Path]) -> Dict:
-    """Load research data from YAML file.
+        raise RegistryDataError(f"Paper in year {year} {'; '.join(problems)}")
+
+def load_research_yaml(file_path: Union[str, Path],
+                       cache_dir: Optional[Union[str, Path]] = None,
+                       strict: bool = False) -> Dict:
+    """Load research data from a YAML file or a directory of YAML shards.
+    
+    Shards are parsed concurrently and combined as described in ``shards``.
     
     Args:
-        file_path: Path to the YAML file
+        file_path: Path to the YAML file or shard directory
+        cache_dir: If given, reuse the parsed data cached there for every
+            file that is unchanged
+        strict: Run every check in ``validation`` instead of only the basic ones
         
     Returns:
         Dictionary containing the research data
@@ -86,81 +87,107 @@ def load_research_yaml(file_path: Union[str, Path]) -> Dict:
     Raises:
         FileNotFoundError: If the file doesn't exist
         yaml.YAMLError: If the file contains invalid YAML
-        RegistryDataError: If the data format is invalid
+        RegistryDataError: If the data format is invalid, listing every problem found
     """
     file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"Research data file not found: {file_path}")
+    if file_path.is_dir():
+        paths = research_shard_paths(file_path)
+        with ThreadPoolExecutor() as pool:
+            documents = list(pool.map(lambda path: _load_yaml(path, cache_dir), paths))
+        data = combine_shards(zip(paths, documents))
+        logger.info(f"Loaded {len(paths)} research shards from {file_path}")
+    else:
+        data = _load_yaml(file_path, cache_dir)
 
+    # Validation is a single cheap pass, so it runs even on cached data
+    report = validate_research_data(data, strict=strict)
+    if not report:
+        logger.warning(f"Invalid research data in {file_path}:\n{report.format()}")
+    report.raise_for_issues()
+    return data
+
+def _load_yaml(file_path: Path, cache_dir: Optional[Union[str, Path]] = None):
+    """Parse a YAML file, through the cache if a cache directory is given."""
+    if cache_dir is not None:
+        return cached_load(file_path, _read_yaml, cache_dir)
+    return _read_yaml(file_path)
+
+def _read_yaml(file_path: Path):
+    """Parse a YAML file."""
     try:
         with open(file_path, 'r') as f:
-            data = yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)
     except yaml.YAMLError as e:
         logger.error(f"Error parsing YAML file {file_path}: {e}")
         raise
 
-    # Validate basic data structure
-    if not isinstance(data, dict):
-        raise RegistryDataError("Research data must be a dictionary")
-
-    # Validate years and entries
-    for year, papers in data.items():
-        try:
-            year_int = int(year)
-            if not 1900 <= year_int <= datetime.now().year:
-                raise RegistryDataError(f"Invalid year: {year}")
-        except ValueError:
-            raise RegistryDataError(f"Invalid year format: {year}")
-
-        if not isinstance(papers, list):
-            raise RegistryDataError(f"Papers for year {year} must be a list")
-
-        # Validate each paper
-        for paper in papers:
-            if not isinstance(paper, dict):
-                raise RegistryDataError(f"Invalid paper entry in year {year}")
-            validate_paper_entry(paper, year)
+RegistryOrExport = Union[RecommendationRegistry, Dict]
 
-    return data
+def _exported(registry: RegistryOrExport) -> Dict:
+    """Return registry export data, exporting only if given a registry."""
+    if isinstance(registry, RecommendationRegistry):
+        return registry.export_registry()
+    return registry
 
-def save_registry(registry: RecommendationRegistry, output_file: Union[str, Path]) -> None:
+def save_registry(registry: RegistryOrExport, output_file: Union[str, Path]) -> bool:
     """Save registry to a file.
     
+    An existing file with identical content is left untouched.
+    
     Args:
-        registry: RecommendationRegistry instance
+        registry: RecommendationRegistry instance, or data it already exported
         output_file: Path where to save the file
+        
+    Returns:
+        True if the file was written, False if it was already up to date
     """
     output_file = Path(output_file)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    data = registry.export_registry()
-    
     try:
-        # Write as JSONL if .jsonl extension
-        if output_file.suffix == '.jsonl':
-            with open(output_file, 'w') as f:
-                for rec in data['recommendations']:
-                    f.write(json.dumps(rec) + '\n')
+        # Stream JSONL (optionally compressed) one recommendation at a time,
+        # without building a full export first
+        if is_jsonl_path(output_file):
+            with RegistryWriter(output_file) as writer:
+                if isinstance(registry, RecommendationRegistry):
+                    writer.write_all(registry.recommendations.values())
+                else:
+                    writer.write_all(registry['recommendations'])
+            changed = writer.changed
+        # Write as SQLite database for .sqlite/.sqlite3/.db extensions
+        elif is_sqlite_path(output_file):
+            changed = write_sqlite_registry(_exported(registry), output_file)
+        # Write a memory-mappable binary snapshot for .mlrsnap
+        elif is_snapshot_path(output_file):
+            changed = write_snapshot(_exported(registry), output_file)
         # Write as YAML for other extensions
         else:
-            with open(output_file, 'w') as f:
-                yaml.safe_dump(
-                    data,
-                    f,
-                    sort_keys=False,
-                    allow_unicode=True,
-                    default_flow_style=False
-                )
-        logger.info(f"Registry saved to {output_file}")
+            changed = write_if_changed(output_file, yaml.dump(
+                _exported(registry),
+                Dumper=_Dumper,
+                sort_keys=False,
+                allow_unicode=True,
+                default_flow_style=False
+            ))
+        if changed:
+            logger.info(f"Registry saved to {output_file}")
+        else:
+            logger.info(f"Registry at {output_file} is unchanged")
+        return changed
     except Exception as e:
         logger.error(f"Error saving registry to {output_file}: {e}")
         raise
 
-def load_registry(file_path: Union[str, Path]) -> Dict:
+def load_registry(file_path: Union[str, Path],
+                  cache_dir: Optional[Union[str, Path]] = None) -> Dict:
     """Load a saved registry file.
     
     Args:
         file_path: Path to the registry file
+        cache_dir: If given, reuse the parsed YAML registry cached there while
+            the file is unchanged (other formats are never cached)
         
     Returns:
         Dictionary containing the registry data
@@ -168,15 +195,25 @@ def load_registry(file_path: Union[str, Path]) -> Dict:
     file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"Registry file not found: {file_path}")
-    
+    is_yaml = not (is_sqlite_path(file_path) or is_jsonl_path(file_path) or is_snapshot_path(file_path))
+    if cache_dir is not None and is_yaml:
+        return cached_load(file_path, _parse_registry, cache_dir)
+    return _parse_registry(file_path)
+
+def _parse_registry(file_path: Path) -> Dict:
+    """Parse and validate a registry file of any supported format."""
     try:
-        # Handle JSONL format
-        if file_path.suffix == '.jsonl':
-            recommendations = []
-            with open(file_path, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        recommendations.append(json.loads(line))
+        # Handle SQLite format
+        if is_sqlite_path(file_path):
+            with SQLiteRegistry(file_path) as db:
+                data = db.export_registry()
+        # Handle binary snapshots
+        elif is_snapshot_path(file_path):
+            with RegistrySnapshot(file_path) as snapshot:
+                data = snapshot.export_registry()
+        # Handle JSONL format, plain or compressed
+        elif is_jsonl_path(file_path):
+            recommendations = list(iter_registry_records(file_path))
             data = {
                 'metadata': {
                     'schema_version': '1.0',
@@ -187,8 +224,8 @@ def load_registry(file_path: Union[str, Path]) -> Dict:
         # Handle YAML format
         else:
             with open(file_path, 'r') as f:
-                data = yaml.safe_load(f)
-    except (yaml.YAMLError, json.JSONDecodeError) as e:
+                data = yaml.load(f, Loader=SafeLoader)
+    except (yaml.YAMLError, json.JSONDecodeError, sqlite3.DatabaseError) as e:
         logger.error(f"Error parsing registry file {file_path}: {e}")
         raise
     
@@ -204,14 +241,15 @@ def load_registry(file_path: Union[str, Path]) -> Dict:
         
     return data
 
-def registry_to_markdown(registry: RecommendationRegistry, output_file: Union[str, Path]) -> None:
-    """Export registry to a markdown document."""
-    output_file = Path(output_file)
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+def registry_to_markdown(registry: RegistryOrExport, output_file: Union[str, Path]) -> bool:
+    """Export registry, or data it already exported, to a markdown document.
     
-    data = registry.export_registry()
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = _exported(registry)
     
-    with open(output_file, 'w') as f:
+    with io.StringIO() as f:
         f.write("# ML Training Recommendations Registry\n\n")
         f.write(f"Last updated: {data['metadata']['last_updated']}\n\n")
         
@@ -245,3 +283,41 @@ def registry_to_markdown(registry: RecommendationRegistry, output_file: Union[st
             if stats['years']['earliest'] and stats['years']['latest']:
                 f.write(f"- Year range: {stats['years']['earliest']} - {stats['years']['latest']}\n")
             f.write("\n")
+        return write_if_changed(output_file, f.getvalue())
+
+def write_outputs(registry: RecommendationRegistry,
+                  output_files: Iterable[Union[str, Path]],
+                  max_workers: Optional[int] = None) -> Dict:
+    """Export the registry once and write it to several files concurrently.
+    
+    Files with ``.md`` among their suffixes (including templates such as
+    ``registry.md.j2``) are rendered with ``registry_to_markdown``; everything
+    else goes through ``save_registry``, which picks the format from the
+    suffix. All writers share one read-only copy of the export, so a writer
+    that tries to modify it fails instead of corrupting the other formats.
+    
+    Args:
+        registry: RecommendationRegistry instance
+        output_files: Paths to write
+        max_workers: Thread pool size (default: one thread per file)
+        
+    Returns:
+        The exported registry data, the caller's to modify
+    """
+    data = registry.export_registry()
+    report = WriteReport()
+    output_files = [Path(p) for p in output_files]
+    if not output_files:
+        return data
+    
+    snapshot = _read_only(data)
+    with ThreadPoolExecutor(max_workers=max_workers or len(output_files)) as pool:
+        futures = [
+            pool.submit(registry_to_markdown if '.md' in path.suffixes else save_registry, snapshot, path)
+            for path in output_files
+        ]
+        # Surface the first failure once every writer has finished
+        for path, future in zip(output_files, futures):
+            report.record(path, future.result())
+    logger.info(f"Registry outputs: {report}")
+    return data
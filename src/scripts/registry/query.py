@@ -0,0 +1,190 @@
+# scripts/registry/query.py
+"""Composable queries over a recommendation registry.
+
+Filters on indexed fields are resolved to MLR ID lists from the registry's
+secondary indexes and intersected smallest-first before anything is
+materialized. Arbitrary predicates given to ``where`` run afterwards, on the
+surviving recommendations only. Results are produced lazily, so
+``limit``/``first`` stop materializing as soon as enough rows are found.
+
+Example:
+    >>> recs = (registry.query()
+    ...         .topic("attention")
+    ...         .status("standard")
+    ...         .year_between(2020, 2024)
+    ...         .implemented_in("llama2")
+    ...         .order_by("year", descending=True)
+    ...         .limit(10)
+    ...         .all())
+"""
+
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Set, Union
+
+from .types import MLRStatus, Recommendation
+
+if TYPE_CHECKING:
+    from .recommendations import RecommendationRegistry
+
+Predicate = Callable[[Recommendation], bool]
+SortKey = Union[str, Callable[[Recommendation], object]]
+
+
+class RecommendationQuery:
+    """A lazily evaluated, chainable query over a ``RecommendationRegistry``.
+
+    Every builder method returns the query itself, so calls can be chained.
+    The query is evaluated each time it is iterated.
+    """
+
+    def __init__(self, registry: 'RecommendationRegistry'):
+        self._registry = registry
+        self._candidates: List[Callable[[], List[str]]] = []
+        self._predicates: List[Predicate] = []
+        self._order: Optional[SortKey] = None
+        self._descending = False
+        self._limit: Optional[int] = None
+        self._offset = 0
+
+    # Indexed filters
+
+    def topic(self, topic: str) -> 'RecommendationQuery':
+        """Keep recommendations for a topic."""
+        self._candidates.append(lambda: self._registry.topic_to_recommendations.get(topic, []))
+        return self
+
+    def status(self, status: Union[MLRStatus, str]) -> 'RecommendationQuery':
+        """Keep recommendations with a status, given as an ``MLRStatus`` or its value."""
+        status = MLRStatus(status)
+        self._candidates.append(lambda: self._registry.status_index.get(status, []))
+        return self
+
+    def year(self, year: int) -> 'RecommendationQuery':
+        """Keep recommendations whose source was published in a given year."""
+        return self.year_between(year, year)
+
+    def year_between(self, start: int, end: int) -> 'RecommendationQuery':
+        """Keep recommendations whose source year lies in ``[start, end]``."""
+        def candidates() -> List[str]:
+            year_index = self._registry.year_index
+            # Look up only the years in range, unless the index has fewer years
+            if end - start < len(year_index):
+                years = range(start, end + 1)
+            else:
+                years = [year for year in sorted(year_index) if start <= year <= end]
+            return [mlr_id for year in years for mlr_id in year_index.get(year, ())]
+        self._candidates.append(candidates)
+        return self
+
+    def paper(self, paper_id: str) -> 'RecommendationQuery':
+        """Keep recommendations from a paper."""
+        self._candidates.append(lambda: self._registry.paper_index.get(paper_id, []))
+        return self
+
+    def arxiv_id(self, arxiv_id: str) -> 'RecommendationQuery':
+        """Keep recommendations sourced from an arXiv paper."""
+        self._candidates.append(lambda: self._registry.arxiv_index.get(arxiv_id, []))
+        return self
+
+    def implemented_in(self, implementation: str) -> 'RecommendationQuery':
+        """Keep recommendations implemented by a given model."""
+        self._candidates.append(lambda: self._registry.implementation_index.get(implementation, []))
+        return self
+
+    # Everything else
+
+    def where(self, predicate: Predicate) -> 'RecommendationQuery':
+        """Keep recommendations for which ``predicate`` returns true.
+
+        Predicates run after all indexed filters, on materialized recommendations.
+        """
+        self._predicates.append(predicate)
+        return self
+
+    def order_by(self, key: SortKey, descending: bool = False) -> 'RecommendationQuery':
+        """Order results by ``"year"``, a ``Recommendation`` field name, or a key function.
+
+        Ordering by year uses the year index and does not materialize anything;
+        other keys materialize every match before sorting. Without an ordering,
+        results come back in the order they were added to the registry.
+        """
+        self._order = key
+        self._descending = descending
+        return self
+
+    def limit(self, count: int) -> 'RecommendationQuery':
+        """Return at most ``count`` results."""
+        self._limit = count
+        return self
+
+    def offset(self, count: int) -> 'RecommendationQuery':
+        """Skip the first ``count`` results."""
+        self._offset = count
+        return self
+
+    # Evaluation
+
+    def _matching_ids(self) -> Optional[Set[str]]:
+        """Intersect the indexed filters, or return ``None`` if there are none."""
+        lists = sorted((candidates() for candidates in self._candidates), key=len)
+        if not lists:
+            return None
+        matches = set(lists[0])
+        for mlr_ids in lists[1:]:
+            if not matches:
+                break
+            matches.intersection_update(mlr_ids)
+        return matches
+
+    def _ordered_ids(self, matches: Optional[Set[str]]) -> Iterator[str]:
+        """Yield matching IDs in year or insertion order, without materializing."""
+        registry = self._registry
+        if matches is not None:
+            # Candidate sets are cheaper to sort than to find by a full scan.
+            # Ties keep insertion order either way, as sorted() does.
+            positions = registry._positions
+            if self._order != 'year':
+                return iter(sorted(matches, key=positions.__getitem__))
+            sign = -1 if self._descending else 1
+            years = registry._years
+            return iter(sorted(matches, key=lambda mlr_id: (sign * years[mlr_id], positions[mlr_id])))
+        if self._order == 'year':
+            years = sorted(registry.year_index, reverse=self._descending)
+            return (mlr_id for year in years for mlr_id in registry.year_index[year])
+        return iter(registry.recommendations)
+
+    def __iter__(self) -> Iterator[Recommendation]:
+        matches = self._matching_ids()
+        recommendations = self._registry.recommendations
+        results = (recommendations[mlr_id] for mlr_id in self._ordered_ids(matches))
+        if self._predicates:
+            results = (rec for rec in results if all(p(rec) for p in self._predicates))
+        if self._order is not None and self._order != 'year':
+            key = self._order
+            if isinstance(key, str):
+                field_name = key
+                key = lambda rec: getattr(rec, field_name)
+            results = iter(sorted(results, key=key, reverse=self._descending))
+        stop = None if self._limit is None else self._offset + self._limit
+        return islice(results, self._offset, stop)
+
+    def ids(self) -> List[str]:
+        """Return the MLR IDs of all results."""
+        return [rec.id for rec in self]
+
+    def all(self) -> List[Recommendation]:
+        """Return all results as a list."""
+        return list(self)
+
+    def first(self) -> Optional[Recommendation]:
+        """Return the first result, or ``None`` if nothing matches."""
+        return next(iter(self), None)
+
+    def count(self) -> int:
+        """Count results, without materializing them when only indexed filters are used."""
+        if self._predicates:
+            return sum(1 for _ in self)
+        matches = self._matching_ids()
+        total = len(self._registry.recommendations) if matches is None else len(matches)
+        total = max(total - self._offset, 0)
+        return total if self._limit is None else min(total, self._limit)
@@ -1,37 +1,90 @@
 # src/scripts/registry/recommendations.py
 """Core recommendation registry functionality."""
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Sequence, Set, Tuple
 import logging
-from omegaconf import OmegaConf, DictConfig
+import re
 
-from .types import MLRStatus, Recommendation, Source, Evidence, create_config_from_dict
+from .types import MLRStatus, Recommendation, Source, _plain, create_config_from_dict
 from .identifiers import MLRIdentifierRegistry
+from .compact import CompactRecommendationStore
+from .query import RecommendationQuery
+from .reproducible import content_hash
 
 logger = logging.getLogger(__name__)
 
+_SLUG_INVALID = re.compile(r'[^a-z0-9-]')
+
+def _topic_slug(topic: str) -> str:
+    return topic.lower().replace(' ', '-')
+
+def _recommendation_slug(recommendation: str) -> str:
+    return _SLUG_INVALID.sub('', '-'.join(recommendation.lower().split()[:5]))
+
 def generate_topic_id(topic: str, recommendation: str) -> str:
     """Generate a unique topic-based ID for a recommendation."""
-    import re
-    words = recommendation.lower().split()[:5]
-    slug = '-'.join(words)
-    slug = re.sub(r'[^a-z0-9-]', '', slug)
-    return f"{topic.lower().replace(' ', '-')}/{slug}"
+    return f"{_topic_slug(topic)}/{_recommendation_slug(recommendation)}"
+
+def generate_topic_ids(pairs: Iterable[Tuple[str, str]]) -> List[str]:
+    """Generate topic IDs for many ``(topic, recommendation)`` pairs in one pass.
+
+    Gives the same result as calling ``generate_topic_id`` on each pair, but
+    slugs every distinct topic only once.
+    """
+    topic_slugs: Dict[str, str] = {}
+    topic_ids = []
+    for topic, recommendation in pairs:
+        topic_slug = topic_slugs.get(topic)
+        if topic_slug is None:
+            topic_slug = topic_slugs[topic] = _topic_slug(topic)
+        topic_ids.append(f"{topic_slug}/{_recommendation_slug(recommendation)}")
+    return topic_ids
 
 class RecommendationRegistry:
     """Registry for ML training recommendations."""
     
-    def __init__(self, id_registry: Optional[MLRIdentifierRegistry] = None):
-        """Initialize the recommendation registry."""
-        self.recommendations: Dict[str, Recommendation] = {}
+    def __init__(self,
+                 id_registry: Optional[MLRIdentifierRegistry] = None,
+                 compact: bool = False,
+                 build_date: Optional[str] = None):
+        """Initialize the recommendation registry.
+        
+        Args:
+            id_registry: Identifier registry used to allocate MLR IDs
+            compact: Store recommendations column-wise to save memory on large
+                registries. Recommendations are then materialized on access, so
+                changes to a returned object must be written back explicitly.
+            build_date: Date (``YYYY-MM-DD``) to record instead of today's, for
+                reproducible builds
+        """
+        self.build_date = build_date
+        self.recommendations: MutableMapping[str, Recommendation] = (
+            CompactRecommendationStore() if compact else {}
+        )
+        # Topic lists are kept sorted by source year
         self.topic_to_recommendations: Dict[str, List[str]] = defaultdict(list)
+        self._topic_years: Dict[str, List[int]] = defaultdict(list)
+        # Secondary indexes, each mapping a field value to MLR IDs in insertion order
+        self.status_index: Dict[MLRStatus, List[str]] = defaultdict(list)
+        self.year_index: Dict[int, List[str]] = defaultdict(list)
+        self.paper_index: Dict[str, List[str]] = defaultdict(list)
+        self.implementation_index: Dict[str, List[str]] = defaultdict(list)
+        self.arxiv_index: Dict[str, List[str]] = defaultdict(list)
+        # Topic IDs are unique; this maps each to its MLR ID
+        self.topic_id_index: Dict[str, str] = {}
+        self._topic_id_suffixes: Dict[str, int] = {}
+        # Insertion position and source year of each MLR ID, for ordering query results
+        self._positions: Dict[str, int] = {}
+        self._years: Dict[str, int] = {}
         self.id_registry = id_registry or MLRIdentifierRegistry()
         self._config = create_config_from_dict({
             'recommendations': {},
             'metadata': {
                 'schema_version': '1.0',
-                'last_updated': datetime.now().strftime('%Y-%m-%d')
+                'last_updated': self.today()
             }
         })
         logger.info("Initialized recommendation registry")
@@ -45,11 +98,74 @@ class RecommendationRegistry:
                          arxiv_id: Optional[str] = None,
                          experimental: bool = False,
                          superseded_by: Optional[str] = None,
-                         implementations: Optional[List[str]] = None) -> str:
-        """Add a recommendation to the registry."""
-        topic_id = generate_topic_id(topic, recommendation)
-        paper_id = self.id_registry.get_paper_id(first_author, year, arxiv_id)
-        mlr_id = self.id_registry.generate_id(year, paper_id)
+                         implementations: Optional[List[str]] = None,
+                         topic_id: Optional[str] = None) -> str:
+        """Add a recommendation to the registry.
+
+        ``topic_id`` is derived from the topic and text unless it was
+        already computed by the caller.
+        """
+        rec = self._create(topic, recommendation, first_author, source_paper, year,
+                           arxiv_id, experimental, superseded_by, implementations,
+                           topic_id or generate_topic_id(topic, recommendation))
+        self._index(rec)
+        self.recommendations[rec.id] = rec
+
+        logger.info(f"Added recommendation {rec.id} with status {rec.status}")
+        return rec.id
+
+    def add_recommendations(self, records: Iterable[Dict[str, Any]]) -> List[str]:
+        """Add many recommendations at once.
+
+        Equivalent to calling ``add_recommendation`` on each record in order,
+        but missing topic IDs are computed in one pass, MLR IDs are allocated
+        in a single identifier batch (persisted once) and the indexes are
+        updated once for the whole set.
+
+        Args:
+            records: Keyword arguments for ``add_recommendation``, one dict
+                per recommendation. A record may also carry the ``mlr_id``
+                an earlier build issued for it, which is then kept instead
+                of allocating a new one.
+
+        Returns:
+            MLR IDs of the added recommendations, in order
+        """
+        records = list(records)
+        missing = [i for i, record in enumerate(records) if not record.get('topic_id')]
+        topic_ids = generate_topic_ids(
+            (records[i]['topic'], records[i]['recommendation']) for i in missing
+        )
+        for i, topic_id in zip(missing, topic_ids):
+            records[i] = {**records[i], 'topic_id': topic_id}
+
+        with self.id_registry.batch():
+            recs = [self._create(**record) for record in records]
+        self._index_many(recs)
+        for rec in recs:
+            self.recommendations[rec.id] = rec
+
+        logger.info(f"Added {len(recs)} recommendations")
+        return [rec.id for rec in recs]
+
+    def _create(self,
+                topic: str,
+                recommendation: str,
+                first_author: str,
+                source_paper: str,
+                year: int,
+                arxiv_id: Optional[str] = None,
+                experimental: bool = False,
+                superseded_by: Optional[str] = None,
+                implementations: Optional[List[str]] = None,
+                topic_id: Optional[str] = None,
+                mlr_id: Optional[str] = None) -> Recommendation:
+        """Allocate an MLR ID, or reserve a given one, and build a recommendation without adding it."""
+        if mlr_id:
+            paper_id = self.id_registry.reserve_id(mlr_id, first_author, arxiv_id)
+        else:
+            paper_id = self.id_registry.get_paper_id(first_author, year, arxiv_id)
+            mlr_id = self.id_registry.generate_id(year, paper_id)
         
         source = Source(
             paper=source_paper,
@@ -75,113 +191,295 @@ class RecommendationRegistry:
             source=source,
             status=status,
             superseded_by=superseded_by,
-            deprecated_date=datetime.now().strftime('%Y-%m-%d') if superseded_by else None,
+            deprecated_date=self.today() if superseded_by else None,
             implementations=implementations or []
         )
+        return rec
+
+    def restore_recommendation(self, rec: Recommendation) -> None:
+        """Add a recommendation exported by an earlier build, keeping its MLR ID.
+        
+        The ID is reserved in the identifier registry so that later
+        allocations cannot reuse it.
         
-        self.recommendations[mlr_id] = rec
-        self.topic_to_recommendations[topic].append(mlr_id)
+        Raises:
+            ValueError: If a recommendation with the same ID is already present
+        """
+        if rec.id in self.recommendations:
+            raise ValueError(f"Duplicate recommendation ID: {rec.id}")
+        self.id_registry.reserve_id(rec.id, rec.source.first_author, rec.source.arxiv_id)
+        self._index(rec)
+        self.recommendations[rec.id] = rec
+        logger.debug(f"Restored recommendation {rec.id}")
+
+    def _claim_topic_id(self, rec: Recommendation) -> None:
+        """Register a recommendation's topic ID, making it unique if it is taken.
+
+        Collisions are resolved in insertion order: the first recommendation
+        keeps the plain topic ID and later ones get ``-2``, ``-3``, ... appended.
+        """
+        topic_id = rec.topic_id
+        if topic_id in self.topic_id_index:
+            suffix = self._topic_id_suffixes.get(topic_id, 1) + 1
+            while f"{topic_id}-{suffix}" in self.topic_id_index:
+                suffix += 1
+            self._topic_id_suffixes[topic_id] = suffix
+            rec.topic_id = f"{topic_id}-{suffix}"
+            logger.debug(f"Topic ID {topic_id} is taken by {self.topic_id_index[topic_id]}; "
+                         f"using {rec.topic_id} for {rec.id}")
+        self.topic_id_index[rec.topic_id] = rec.id
+
+    def _index(self, rec: Recommendation) -> None:
+        """Add a recommendation to the topic list and secondary indexes.
+
+        Must run before the recommendation is stored, as its topic ID may be
+        changed to keep topic IDs unique.
+        """
+        self._index_many([rec])
+
+    def _index_many(self, recs: Sequence[Recommendation]) -> None:
+        """Index several recommendations in order, re-sorting each touched topic once.
+
+        New entries are appended to their topic and a stable sort by year
+        then places them after existing ones of the same year. Topics whose
+        new entries arrive in year order, the usual case, are not sorted, and
+        a single new entry is moved into place with ``bisect_right``.
+        """
+        # Where each touched topic's new entries start
+        appended: Dict[str, int] = {}
+        for rec in recs:
+            self._claim_topic_id(rec)
+            self._positions[rec.id] = len(self._positions)
+            self._years[rec.id] = rec.source.year
+            appended.setdefault(rec.topic, len(self._topic_years[rec.topic]))
+            self.topic_to_recommendations[rec.topic].append(rec.id)
+            self._topic_years[rec.topic].append(rec.source.year)
+            self.status_index[rec.status].append(rec.id)
+            self.year_index[rec.source.year].append(rec.id)
+            self.paper_index[rec.source.paper_id].append(rec.id)
+            if rec.source.arxiv_id:
+                self.arxiv_index[rec.source.arxiv_id].append(rec.id)
+            for implementation in rec.implementations:
+                self.implementation_index[implementation].append(rec.id)
+
+        for topic, start in appended.items():
+            years = self._topic_years[topic]
+            tail = years[max(start - 1, 0):]
+            if all(a <= b for a, b in zip(tail, tail[1:])):
+                continue
+            mlr_ids = self.topic_to_recommendations[topic]
+            if start == len(years) - 1:
+                # A single new entry is cheaper to move into place than to sort
+                year, mlr_id = years.pop(), mlr_ids.pop()
+                position = bisect_right(years, year)
+                years.insert(position, year)
+                mlr_ids.insert(position, mlr_id)
+            else:
+                order = sorted(range(len(years)), key=years.__getitem__)
+                self.topic_to_recommendations[topic] = [mlr_ids[i] for i in order]
+                self._topic_years[topic] = [years[i] for i in order]
+
+    def _lookup(self, index: Dict, key) -> List[Recommendation]:
+        """Materialize the recommendations listed under an index key."""
+        return [self.recommendations[mlr_id] for mlr_id in index.get(key, [])]
+
+    def query(self) -> RecommendationQuery:
+        """Start a composable query over the registry.
         
-        logger.info(f"Added recommendation {mlr_id} with status {status}")
-        return mlr_id
+        See ``RecommendationQuery`` for the available filters.
+        """
+        return RecommendationQuery(self)
 
     def get_recommendation_by_mlr(self, mlr_id: str) -> Optional[Recommendation]:
         """Get a recommendation by its MLR ID."""
         return self.recommendations.get(mlr_id)
     
+    def get_recommendation_by_topic_id(self, topic_id: str) -> Optional[Recommendation]:
+        """Get a recommendation by its topic ID."""
+        mlr_id = self.topic_id_index.get(topic_id)
+        return None if mlr_id is None else self.recommendations[mlr_id]
+
     def get_recommendations_by_status(self, status: MLRStatus) -> List[Recommendation]:
         """Get all recommendations with a given status."""
-        return [rec for rec in self.recommendations.values() if rec.status == status]
+        return self._lookup(self.status_index, MLRStatus(status))
     
     def get_recommendations_by_topic(self, topic: str, status: Optional[MLRStatus] = None) -> List[Recommendation]:
         """Get recommendations for a topic, optionally filtered by status."""
-        recs = [self.recommendations[mlr_id] for mlr_id in self.topic_to_recommendations[topic]]
-        if status:
-            recs = [rec for rec in recs if rec.status == status]
-        return sorted(recs, key=lambda x: x.source.year)
+        mlr_ids = self.topic_to_recommendations.get(topic, [])
+        if not status:
+            return [self.recommendations[mlr_id] for mlr_id in mlr_ids]
+        # Filter the topic itself, so the cost doesn't grow with the status bucket
+        status = MLRStatus(status)
+        if isinstance(self.recommendations, CompactRecommendationStore):
+            status_of = self.recommendations.status_of
+            return [self.recommendations[mlr_id] for mlr_id in mlr_ids if status_of(mlr_id) == status]
+        recs = (self.recommendations[mlr_id] for mlr_id in mlr_ids)
+        return [rec for rec in recs if rec.status == status]
+
+    def get_recommendations_by_year(self, year: int) -> List[Recommendation]:
+        """Get all recommendations whose source was published in a given year."""
+        return self._lookup(self.year_index, year)
+
+    def get_recommendations_by_paper(self, paper_id: str) -> List[Recommendation]:
+        """Get all recommendations from a paper."""
+        return self._lookup(self.paper_index, paper_id)
+
+    def get_recommendations_by_implementation(self, implementation: str) -> List[Recommendation]:
+        """Get all recommendations implemented by a given model."""
+        return self._lookup(self.implementation_index, implementation)
+
+    def get_recommendations_by_arxiv_id(self, arxiv_id: str) -> List[Recommendation]:
+        """Get all recommendations sourced from an arXiv paper."""
+        return self._lookup(self.arxiv_index, arxiv_id)
+
+    def today(self) -> str:
+        """Return the build date, or today's date if none was set."""
+        return self.build_date or datetime.now().strftime('%Y-%m-%d')
 
     def get_topics(self) -> Set[str]:
         """Get all unique topics in the registry."""
         return set(self.topic_to_recommendations.keys())
 
-    def export_registry(self) -> Dict:
-        """Export the registry as a list of atomic recommendations."""
+    def export_registry(self, validate: bool = False) -> Dict:
+        """Export the registry as a list of atomic recommendations.
+        
+        The metadata carries a ``content_hash`` of the recommendations and
+        topic stats, which only changes when the registry content does.
+        
+        Args:
+            validate: Check every recommendation against its schema while exporting
+        """
+        recommendations = [
+            rec.to_dict(validate=validate) for rec in self.recommendations.values()
+        ]
+        # Include topic stats for informational purposes
+        topics = {
+            topic: {
+                'count': len(recs),
+                'years': {
+                    'earliest': self._topic_years[topic][0],
+                    'latest': self._topic_years[topic][-1]
+                }
+            }
+            for topic, recs in self.topic_to_recommendations.items()
+        }
         return {
             'metadata': {
-                'last_updated': datetime.now().strftime('%Y-%m-%d'),
+                'last_updated': self.today(),
                 'schema_version': '1.0',
-                'status_types': [status.value for status in MLRStatus]
+                'status_types': [status.value for status in MLRStatus],
+                'content_hash': content_hash(recommendations, topics)
             },
-            'recommendations': [
-                rec.to_dict() for rec in self.recommendations.values()
-            ],
-            # Include topic stats for informational purposes
-            'topics': {
-                topic: {
-                    'count': len(recs),
-                    'years': {
-                        'earliest': min(self.recommendations[rid].source.year for rid in recs),
-                        'latest': max(self.recommendations[rid].source.year for rid in recs)
-                    }
-                }
-                for topic, recs in self.topic_to_recommendations.items()
-            }
+            'recommendations': recommendations,
+            'topics': topics
         }
 
-def build_registry_from_yaml(yaml_data: Dict) -> RecommendationRegistry:
-    """Build a recommendation registry from YAML research data."""
-    registry = RecommendationRegistry()
-    config = create_config_from_dict(yaml_data)
+def paper_drafts(year, paper: Any) -> List[Dict]:
+    """Turn one research paper entry into ``add_recommendation`` arguments.
     
-    # Process each year's papers
-    for year, papers in config.items():
-        for paper in papers:
-            # Extract basic paper info
-            first_author = paper.first_author
-            arxiv_id = paper.get('arxiv_id', None)
-            paper_id = f"{first_author} et al. ({year})"
-            
-            # Process SOTA recommendations
-            if hasattr(paper, 'sota') and paper.sota:
-                for rec in paper.sota:
-                    main_topic = paper.topics[0] if paper.topics else 'general'
-                    mlr_id = registry.add_recommendation(
-                        topic=main_topic,
-                        recommendation=rec,
-                        first_author=first_author,
-                        source_paper=paper_id,
-                        year=int(year),
-                        arxiv_id=arxiv_id,
-                        implementations=paper.get('models', [])
-                    )
-                    logger.info(f"Added recommendation {mlr_id}: {rec}")
-            
-            # Process experimental recommendations
-            if paper.get('experimental', False):
-                for rec in paper.get('sota', []):
-                    mlr_id = registry.add_recommendation(
-                        topic=paper.topics[0],
-                        recommendation=rec,
-                        first_author=first_author,
-                        source_paper=paper_id,
-                        year=int(year),
-                        arxiv_id=arxiv_id,
-                        experimental=True
-                    )
-                    logger.info(f"Added experimental recommendation {mlr_id}: {rec}")
-            
-            # Process deprecated/superseded recommendations
-            if 'attic' in paper and 'superseded_by' in paper.attic:
-                for rec in paper.get('sota', []):
-                    mlr_id = registry.add_recommendation(
-                        topic=paper.topics[0],
-                        recommendation=rec,
-                        first_author=first_author,
-                        source_paper=paper_id,
-                        year=int(year),
-                        arxiv_id=arxiv_id,
-                        superseded_by=paper.attic.superseded_by
-                    )
-                    logger.info(f"Added deprecated recommendation {mlr_id}: {rec}")
+    Works on plain dictionaries and on DictConfig entries alike, and does not
+    touch any identifier registry, so it can run in a worker process.
+    
+    Args:
+        year: Year key the paper is listed under
+        paper: Paper entry from the research data
+        
+    Returns:
+        Keyword arguments for ``add_recommendation``, one dict per
+        recommendation, in insertion order
+    """
+    drafts = []
+    # Extract basic paper info
+    first_author = paper['first_author']
+    base = {
+        'first_author': first_author,
+        'source_paper': f"{first_author} et al. ({year})",
+        'year': int(year),
+        'arxiv_id': paper.get('arxiv_id', None),
+    }
+    sota = paper.get('sota', None) or []
+
+    def draft(topic, rec, **kwargs):
+        drafts.append({**base, 'topic': topic, 'recommendation': rec,
+                       'topic_id': generate_topic_id(topic, rec), **kwargs})
+
+    # Process SOTA recommendations
+    for rec in sota:
+        topics = paper.get('topics', None)
+        main_topic = topics[0] if topics else 'general'
+        draft(main_topic, rec, implementations=_plain(paper.get('models', [])))
+
+    # Process experimental recommendations
+    if paper.get('experimental', False):
+        for rec in sota:
+            draft(paper['topics'][0], rec, experimental=True)
+
+    # Process deprecated/superseded recommendations
+    if 'attic' in paper and 'superseded_by' in paper['attic']:
+        for rec in sota:
+            draft(paper['topics'][0], rec, superseded_by=_plain(paper['attic']['superseded_by']))
+
+    return drafts
+
+def _shard_drafts(year, papers: Sequence[Dict]) -> List[List[Dict]]:
+    """Draft every paper of one year shard."""
+    return [paper_drafts(year, paper) for paper in papers]
+
+def draft_shards(shards: Sequence[Tuple[Any, Sequence[Dict]]],
+                 max_workers: Optional[int] = None) -> List[List[List[Dict]]]:
+    """Draft the recommendations of several year shards.
+    
+    Args:
+        shards: ``(year, papers)`` pairs
+        max_workers: Draft shards in a process pool of this size; by default
+            shards are drafted in this process
+        
+    Returns:
+        For each shard, in order, the drafts of each of its papers
+    """
+    if max_workers and max_workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_shard_drafts, *zip(*shards)))
+    return [_shard_drafts(year, papers) for year, papers in shards]
+
+def add_paper(registry: RecommendationRegistry, year, paper: Any) -> List[str]:
+    """Add every recommendation from one research paper entry.
+    
+    Args:
+        registry: Registry to add to
+        year: Year key the paper is listed under
+        paper: Paper entry from the research data
+        
+    Returns:
+        MLR IDs of the added recommendations, in insertion order
+    """
+    return registry.add_recommendations(paper_drafts(year, paper))
+
+def build_registry_from_yaml(yaml_data: Dict,
+                             compact: bool = False,
+                             max_workers: Optional[int] = None,
+                             build_date: Optional[str] = None,
+                             id_registry: Optional[MLRIdentifierRegistry] = None) -> RecommendationRegistry:
+    """Build a recommendation registry from YAML research data.
+    
+    Recommendations are drafted per year shard, optionally in a process
+    pool, and then given IDs in a single ordered pass, so the result is the
+    same whatever the number of workers.
+    
+    Args:
+        yaml_data: Research data keyed by year
+        compact: Build a registry backed by a ``CompactRecommendationStore``
+        max_workers: Draft year shards in a process pool of this size
+        build_date: Date to record instead of today's, for reproducible builds
+        id_registry: Identifier registry used to allocate MLR IDs
+    """
+    registry = RecommendationRegistry(id_registry, compact=compact, build_date=build_date)
+    shards = list(yaml_data.items())
+    
+    # Persist identifier allocations once for the whole build
+    with registry.id_registry.batch():
+        for shard in draft_shards(shards, max_workers):
+            for drafts in shard:
+                registry.add_recommendations(drafts)
 
     return registry
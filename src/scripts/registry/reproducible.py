@@ -0,0 +1,73 @@
+# scripts/registry/reproducible.py
+"""Helpers for reproducible registry builds.
+
+A reproducible build takes its date from the inputs rather than the clock,
+and every export carries a hash of its content, so two builds from the same
+research data produce identical files and consumers can tell whether
+anything changed by comparing hashes.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(recommendations: List[Dict], topics: Dict) -> str:
+    """Hash exported recommendations and topic stats.
+
+    The hash covers everything in an export except its metadata, serialized
+    with sorted keys, so it only changes when the registry content does.
+    """
+    payload = json.dumps({'recommendations': recommendations, 'topics': topics},
+                         sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return f"sha256:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def _git_commit_date(paths: List[Path]) -> Optional[str]:
+    """Return the date of the last commit touching any of the paths, if tracked."""
+    try:
+        result = subprocess.run(
+            ['git', 'log', '-1', '--format=%cs', '--', *map(str, paths)],
+            cwd=paths[0].parent, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def source_date(paths: Iterable[Union[str, Path]]) -> str:
+    """Derive a build date from input files instead of the clock.
+
+    Uses, in order of preference, the ``SOURCE_DATE_EPOCH`` environment
+    variable, the date of the last git commit touching the inputs, or the
+    newest modification time among them.
+
+    Args:
+        paths: Input files or directories
+
+    Returns:
+        The date as ``YYYY-MM-DD``
+    """
+    if epoch := os.environ.get('SOURCE_DATE_EPOCH'):
+        return datetime.fromtimestamp(int(epoch), timezone.utc).strftime('%Y-%m-%d')
+
+    paths = [Path(p).resolve() for p in paths]
+    if paths and (date := _git_commit_date(paths)):
+        # Uncommitted edits are newer than the last commit
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--', *map(str, paths)],
+                               cwd=paths[0].parent, capture_output=True, text=True)
+        if not dirty.stdout.strip():
+            return date
+
+    files = [f for p in paths for f in ([p] if p.is_file() else p.rglob('*')) if f.is_file()]
+    if not files:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    newest = max(f.stat().st_mtime for f in files)
+    return datetime.fromtimestamp(newest, timezone.utc).strftime('%Y-%m-%d')
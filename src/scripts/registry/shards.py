@@ -0,0 +1,97 @@
+# scripts/registry/shards.py
+"""Research data split across a directory of YAML shards.
+
+A research data directory holds any number of ``.yaml``/``.yml`` files,
+searched recursively. Each shard is either a mapping of year to a list of
+papers, in the same format as a monolithic ``research.yaml``, or a single
+paper entry carrying its own ``year``. Shards are combined in path order,
+and years are sorted numerically, so the combined data does not depend on
+the order in which files were read.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import yaml
+
+from .validation import RegistryDataError
+from ..utils import WriteReport
+
+SHARD_SUFFIXES = ('.yaml', '.yml')
+
+
+def research_shard_paths(directory: Union[str, Path]) -> List[Path]:
+    """List the YAML shards under a research data directory in a stable order."""
+    directory = Path(directory)
+    return sorted(
+        path for path in directory.rglob('*')
+        if path.suffix in SHARD_SUFFIXES and path.is_file()
+        and not any(part.startswith('.') for part in path.relative_to(directory).parts)
+    )
+
+
+def _year_key(year: Any) -> Any:
+    """Merge ``2020`` and ``"2020"`` into one key; leave invalid years for validation."""
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return year
+
+
+def combine_shards(shards: Iterable[Tuple[Path, Any]]) -> Dict:
+    """Combine parsed shards into one research data mapping.
+
+    Args:
+        shards: ``(path, parsed document)`` pairs, in path order
+
+    Returns:
+        Research data keyed by year, with years in ascending order and papers
+        of the same year in shard order
+
+    Raises:
+        RegistryDataError: If a shard is neither a year mapping nor a paper entry
+    """
+    combined: Dict[Any, List] = {}
+    for path, document in shards:
+        if document is None:
+            continue
+        if not isinstance(document, dict):
+            raise RegistryDataError(f"Research shard {path} must be a mapping")
+        if 'title' in document:
+            if 'year' not in document:
+                raise RegistryDataError(f"Research shard {path} holds a paper without a year")
+            items = [(document['year'], [document])]
+        else:
+            items = document.items()
+        for year, papers in items:
+            key = _year_key(year)
+            if not isinstance(papers, list):
+                # Keep the malformed value so validation reports it
+                combined[key] = papers
+            elif isinstance(combined.setdefault(key, []), list):
+                combined[key].extend(papers)
+
+    years = sorted(y for y in combined if isinstance(y, int))
+    others = [y for y in combined if not isinstance(y, int)]
+    return {year: combined[year] for year in years + others}
+
+
+def write_research_shards(data: Dict, directory: Union[str, Path]) -> WriteReport:
+    """Split research data into one ``<year>.yaml`` shard per year.
+
+    Shards whose content is unchanged are not rewritten, so their mtimes
+    and anything watching them stay untouched.
+
+    Args:
+        data: Research data keyed by year
+        directory: Directory to write the shards to
+
+    Returns:
+        Which shards were written and which were unchanged
+    """
+    directory = Path(directory)
+    report = WriteReport()
+    for year, papers in data.items():
+        text = yaml.safe_dump({year: papers}, sort_keys=False, allow_unicode=True, default_flow_style=False)
+        report.write(directory / f"{year}.yaml", text)
+    return report
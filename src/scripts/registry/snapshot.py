@@ -0,0 +1,232 @@
+# src/scripts/registry/snapshot.py
+"""Binary snapshot format for the ML recommendation registry.
+
+A snapshot is a single file that can be memory-mapped and queried without
+decoding it as a whole. Layout (all integers little-endian)::
+
+    header     magic, version, record count and the offsets of the sections below
+    records    one compact JSON document per recommendation, back to back
+    offsets    fixed-width (offset, length) entry per record, in registry order
+    id pool    MLR IDs as UTF-8, back to back
+    id index   fixed-width (id offset, id length, record index) entries, sorted by ID
+    metadata   JSON document holding the export's ``metadata`` and ``topics``
+
+Records are located through the offsets table and decoded only when
+accessed; lookups by MLR ID binary-search the sorted ID index, touching
+O(log n) pages of the file.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from .types import Recommendation
+from ..utils import replace_if_changed
+
+SNAPSHOT_SUFFIX = '.mlrsnap'
+MAGIC = b'MLRSNAP\0'
+VERSION = 1
+
+# magic, version, count, offsets table, id pool, id index, metadata offset, metadata length
+_HEADER = struct.Struct('<8sII5Q')
+_OFFSET_ENTRY = struct.Struct('<QI')
+_ID_ENTRY = struct.Struct('<QII')
+
+
+class SnapshotFormatError(Exception):
+    """Raised when a file is not a readable registry snapshot."""
+    pass
+
+
+def is_snapshot_path(path: Union[str, Path]) -> bool:
+    """Check whether a path names a binary registry snapshot."""
+    return Path(path).suffix == SNAPSHOT_SUFFIX
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def write_snapshot(data: Dict, output_file: Union[str, Path]) -> bool:
+    """Write an exported registry as a binary snapshot.
+
+    The snapshot is written next to the target and renamed into place, so
+    readers never map a half-written file. An identical existing snapshot
+    is left in place.
+
+    Args:
+        data: Registry export as returned by ``export_registry``
+        output_file: Path of the snapshot file
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\0' * _HEADER.size)
+
+            offsets = []
+            ids = []
+            for rec in data['recommendations']:
+                payload = _encode(rec)
+                offsets.append((f.tell(), len(payload)))
+                ids.append(rec['id'].encode('utf-8'))
+                f.write(payload)
+
+            offsets_start = f.tell()
+            for offset, length in offsets:
+                f.write(_OFFSET_ENTRY.pack(offset, length))
+
+            id_pool_start = f.tell()
+            id_offsets = []
+            for mlr_id in ids:
+                id_offsets.append(f.tell())
+                f.write(mlr_id)
+
+            id_index_start = f.tell()
+            for index in sorted(range(len(ids)), key=ids.__getitem__):
+                f.write(_ID_ENTRY.pack(id_offsets[index], len(ids[index]), index))
+
+            metadata = _encode({'metadata': data.get('metadata', {}), 'topics': data.get('topics', {})})
+            metadata_start = f.tell()
+            f.write(metadata)
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, len(offsets), offsets_start, id_pool_start,
+                                 id_index_start, metadata_start, len(metadata)))
+        return replace_if_changed(tmp_path, output_file)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+class RegistrySnapshot:
+    """Lazy, memory-mapped read access to a registry snapshot.
+
+    Supports ``len()``, access by position (``snapshot[i]``) and lookups by MLR
+    ID. Only the records actually accessed are decoded.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open a registry snapshot.
+
+        Args:
+            path: Path of the snapshot file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            SnapshotFormatError: If the file is not a snapshot of a supported version
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Registry file not found: {self.path}")
+        with open(self.path, 'rb') as f:
+            try:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise SnapshotFormatError(f"Empty registry snapshot: {self.path}") from e
+        if len(self._buf) < _HEADER.size:
+            self.close()
+            raise SnapshotFormatError(f"Truncated registry snapshot: {self.path}")
+        (magic, version, self._count, self._offsets, self._id_pool, self._id_index,
+         self._metadata_start, self._metadata_length) = _HEADER.unpack_from(self._buf)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SnapshotFormatError(f"Not a version {VERSION} registry snapshot: {self.path}")
+        self._metadata: Optional[Dict] = None
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._buf.close()
+
+    def __enter__(self) -> 'RegistrySnapshot':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, index: int) -> Dict:
+        """Decode the exported dictionary of the record at a position."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"Snapshot record index out of range: {index}")
+        offset, length = _OFFSET_ENTRY.unpack_from(self._buf, self._offsets + index * _OFFSET_ENTRY.size)
+        return json.loads(self._buf[offset:offset + length])
+
+    def __getitem__(self, index: int) -> Recommendation:
+        return Recommendation.from_dict(self.record(index))
+
+    def __iter__(self) -> Iterator[Recommendation]:
+        return (self[i] for i in range(self._count))
+
+    def _id_at(self, position: int) -> tuple:
+        """Return the (MLR ID bytes, record index) stored at a position of the ID index."""
+        offset, length, index = _ID_ENTRY.unpack_from(self._buf, self._id_index + position * _ID_ENTRY.size)
+        return self._buf[offset:offset + length], index
+
+    def index_of(self, mlr_id: str) -> Optional[int]:
+        """Find the position of a recommendation by MLR ID, or ``None`` if absent."""
+        key = mlr_id.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_at(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            found, index = self._id_at(lo)
+            if found == key:
+                return index
+        return None
+
+    def __contains__(self, mlr_id: object) -> bool:
+        return isinstance(mlr_id, str) and self.index_of(mlr_id) is not None
+
+    def get_recommendation_by_mlr(self, mlr_id: str) -> Optional[Recommendation]:
+        """Get a recommendation by its MLR ID."""
+        index = self.index_of(mlr_id)
+        return None if index is None else self[index]
+
+    def ids(self) -> List[str]:
+        """Return all MLR IDs in registry order, without decoding any record."""
+        ids = [None] * self._count
+        for position in range(self._count):
+            mlr_id, index = self._id_at(position)
+            ids[index] = mlr_id.decode('utf-8')
+        return ids
+
+    def _meta(self) -> Dict:
+        if self._metadata is None:
+            start = self._metadata_start
+            self._metadata = json.loads(self._buf[start:start + self._metadata_length])
+        return self._metadata
+
+    @property
+    def metadata(self) -> Dict:
+        """The export's ``metadata`` section."""
+        return self._meta()['metadata']
+
+    @property
+    def topics(self) -> Dict:
+        """The export's ``topics`` section."""
+        return self._meta()['topics']
+
+    def export_registry(self) -> Dict:
+        """Decode the whole snapshot in the same shape as ``RecommendationRegistry.export_registry``."""
+        return {
+            'metadata': self.metadata,
+            'recommendations': [self.record(i) for i in range(self._count)],
+            'topics': self.topics
+        }
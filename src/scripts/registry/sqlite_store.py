@@ -0,0 +1,316 @@
+# src/scripts/registry/sqlite_store.py
+"""SQLite storage engine for the ML recommendation registry.
+
+The registry export is normalized into ``recommendations``, ``sources`` and
+``evidence`` tables with indexes on topic, status, year, paper_id and
+arxiv_id, so a saved registry can be opened and queried without parsing the
+whole YAML document. Identifier counters can live in the same database via
+``SQLiteIdentifierStore``.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+import logging
+
+from .backends import Change, IdentifierStore, empty_state
+from .types import MLRStatus, Recommendation, Source, Evidence
+from ..utils import replace_if_changed
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SUFFIXES = {'.sqlite', '.sqlite3', '.db'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source_key INTEGER PRIMARY KEY,
+    paper TEXT,
+    paper_id TEXT,
+    year INTEGER,
+    first_author TEXT,
+    arxiv_id TEXT
+);
+CREATE TABLE IF NOT EXISTS recommendations (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    recommendation TEXT,
+    topic TEXT,
+    topic_id TEXT,
+    source_key INTEGER REFERENCES sources(source_key),
+    paper_id TEXT,
+    year INTEGER,
+    status TEXT,
+    implementations TEXT,
+    superseded_by TEXT,
+    deprecated_date TEXT
+);
+CREATE TABLE IF NOT EXISTS evidence (
+    recommendation_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    paper TEXT,
+    paper_id TEXT,
+    year INTEGER,
+    arxiv_id TEXT,
+    PRIMARY KEY (recommendation_id, position)
+);
+CREATE TABLE IF NOT EXISTS identifier_counters (
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (section, key)
+);
+CREATE INDEX IF NOT EXISTS idx_recommendations_topic ON recommendations (topic, year, position);
+CREATE INDEX IF NOT EXISTS idx_recommendations_status ON recommendations (status, position);
+CREATE INDEX IF NOT EXISTS idx_recommendations_year ON recommendations (year, position);
+CREATE INDEX IF NOT EXISTS idx_recommendations_paper_id ON recommendations (paper_id, position);
+CREATE INDEX IF NOT EXISTS idx_sources_arxiv_id ON sources (arxiv_id);
+"""
+
+_SELECT_RECOMMENDATIONS = """
+SELECT r.id, r.recommendation, r.topic, r.topic_id, r.status,
+       r.implementations, r.superseded_by, r.deprecated_date,
+       s.paper, s.paper_id, s.year, s.first_author, s.arxiv_id
+FROM recommendations r JOIN sources s ON s.source_key = r.source_key
+"""
+
+
+def is_sqlite_path(path: Union[str, Path]) -> bool:
+    """Check whether a path names a SQLite registry file."""
+    return Path(path).suffix in SQLITE_SUFFIXES
+
+
+def _connect(path: Union[str, Path]) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _insert_export(conn: sqlite3.Connection, data: Dict) -> None:
+    """Insert an exported registry dictionary into empty tables."""
+    conn.executemany(
+        "INSERT INTO metadata (key, value) VALUES (?, ?)",
+        [('metadata', json.dumps(data.get('metadata', {}))),
+         ('topics', json.dumps(data.get('topics', {})))]
+    )
+
+    source_keys: Dict[tuple, int] = {}
+    rec_rows = []
+    evidence_rows = []
+    for position, rec in enumerate(data['recommendations']):
+        source = rec['source']
+        source_row = (source['paper'], source['paper_id'], source['year'],
+                      source['first_author'], source.get('arxiv_id'))
+        if source_row not in source_keys:
+            source_keys[source_row] = len(source_keys)
+        rec_rows.append((
+            position, rec['id'], rec['recommendation'], rec['topic'], rec['topic_id'],
+            source_keys[source_row], source['paper_id'], source['year'], rec['status'],
+            json.dumps(rec.get('implementations', [])),
+            json.dumps(rec['superseded_by']) if 'superseded_by' in rec else None,
+            rec.get('deprecated_date')
+        ))
+        for i, ev in enumerate(rec.get('supporting_evidence', [])):
+            evidence_rows.append((rec['id'], i, ev['paper'], ev['paper_id'],
+                                  ev['year'], ev.get('arxiv_id')))
+
+    conn.executemany(
+        "INSERT INTO sources (source_key, paper, paper_id, year, first_author, arxiv_id) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(key, *row) for row, key in source_keys.items()]
+    )
+    conn.executemany(
+        "INSERT INTO recommendations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rec_rows
+    )
+    conn.executemany("INSERT INTO evidence VALUES (?, ?, ?, ?, ?, ?)", evidence_rows)
+
+
+def write_sqlite_registry(data: Dict, output_file: Union[str, Path]) -> bool:
+    """Write an exported registry to a SQLite database.
+
+    The database is built next to the target and renamed into place, so
+    readers never see a half-written registry. Identifier counters already
+    stored in an existing database are carried over. An identical existing
+    database is left in place.
+
+    Args:
+        data: Registry export as returned by ``export_registry``
+        output_file: Path of the database file
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.")
+    os.close(fd)
+    try:
+        conn = _connect(tmp_path)
+        try:
+            previous = output_file.exists()
+            if previous:
+                conn.execute("ATTACH DATABASE ? AS previous", (str(output_file),))
+            with conn:
+                _insert_export(conn, data)
+                if previous:
+                    conn.execute(
+                        "INSERT INTO identifier_counters "
+                        "SELECT section, key, value FROM previous.identifier_counters"
+                    )
+        finally:
+            conn.close()
+        return replace_if_changed(tmp_path, output_file)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+class SQLiteRegistry:
+    """Read access to a registry stored in SQLite.
+
+    Mirrors the query methods of ``RecommendationRegistry`` but answers them
+    with indexed SQL queries instead of in-memory scans.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open a SQLite registry.
+
+        Args:
+            path: Path of the database file
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Registry file not found: {self.path}")
+        self.conn = _connect(self.path)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> 'SQLiteRegistry':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _fetch(self, where: str = "", params: tuple = (), order: str = "r.position") -> List[Recommendation]:
+        rows = self.conn.execute(f"{_SELECT_RECOMMENDATIONS} {where} ORDER BY {order}", params).fetchall()
+        evidence = self._fetch_evidence([row[0] for row in rows])
+        return [self._to_recommendation(row, evidence.get(row[0], [])) for row in rows]
+
+    def _fetch_evidence(self, mlr_ids: List[str]) -> Dict[str, List[Evidence]]:
+        evidence: Dict[str, List[Evidence]] = {}
+        if not mlr_ids:
+            return evidence
+        # Stay below SQLite's bound parameter limit
+        for start in range(0, len(mlr_ids), 500):
+            chunk = mlr_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for rec_id, paper, paper_id, year, arxiv_id in self.conn.execute(
+                "SELECT recommendation_id, paper, paper_id, year, arxiv_id FROM evidence "
+                f"WHERE recommendation_id IN ({placeholders}) ORDER BY recommendation_id, position",
+                chunk
+            ):
+                evidence.setdefault(rec_id, []).append(
+                    Evidence(paper=paper, paper_id=paper_id, year=year, arxiv_id=arxiv_id)
+                )
+        return evidence
+
+    @staticmethod
+    def _to_recommendation(row: tuple, evidence: List[Evidence]) -> Recommendation:
+        (mlr_id, text, topic, topic_id, status, implementations, superseded_by,
+         deprecated_date, paper, paper_id, year, first_author, arxiv_id) = row
+        return Recommendation.create(
+            id=mlr_id,
+            recommendation=text,
+            topic=topic,
+            topic_id=topic_id,
+            source=Source(paper=paper, paper_id=paper_id, year=year,
+                          first_author=first_author, arxiv_id=arxiv_id),
+            status=MLRStatus(status),
+            supporting_evidence=evidence,
+            superseded_by=json.loads(superseded_by) if superseded_by is not None else None,
+            deprecated_date=deprecated_date,
+            implementations=json.loads(implementations)
+        )
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM recommendations").fetchone()[0]
+
+    def get_recommendation_by_mlr(self, mlr_id: str) -> Optional[Recommendation]:
+        """Get a recommendation by its MLR ID."""
+        recs = self._fetch("WHERE r.id = ?", (mlr_id,))
+        return recs[0] if recs else None
+
+    def get_recommendations_by_status(self, status: MLRStatus) -> List[Recommendation]:
+        """Get all recommendations with a given status."""
+        return self._fetch("WHERE r.status = ?", (MLRStatus(status).value,))
+
+    def get_recommendations_by_topic(self, topic: str, status: Optional[MLRStatus] = None) -> List[Recommendation]:
+        """Get recommendations for a topic, optionally filtered by status."""
+        if status:
+            return self._fetch("WHERE r.topic = ? AND r.status = ?",
+                               (topic, MLRStatus(status).value), order="r.year, r.position")
+        return self._fetch("WHERE r.topic = ?", (topic,), order="r.year, r.position")
+
+    def get_recommendations_by_arxiv_id(self, arxiv_id: str) -> List[Recommendation]:
+        """Get all recommendations sourced from an arXiv paper."""
+        return self._fetch("WHERE s.arxiv_id = ?", (arxiv_id,))
+
+    def get_topics(self) -> Set[str]:
+        """Get all unique topics in the registry."""
+        return {row[0] for row in self.conn.execute("SELECT DISTINCT topic FROM recommendations")}
+
+    def export_registry(self) -> Dict:
+        """Export the stored registry in the same shape as ``RecommendationRegistry.export_registry``."""
+        meta = dict(self.conn.execute("SELECT key, value FROM metadata"))
+        return {
+            'metadata': json.loads(meta.get('metadata', '{}')),
+            'recommendations': [rec.to_dict() for rec in self._fetch()],
+            'topics': json.loads(meta.get('topics', '{}'))
+        }
+
+
+class SQLiteIdentifierStore(IdentifierStore):
+    """Keeps identifier counters in the ``identifier_counters`` table.
+
+    Each commit upserts only the changed keys inside one transaction.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self) -> Dict[str, Dict]:
+        """Load identifier counters from the database."""
+        state = empty_state()
+        if not self.path.exists():
+            return state
+        conn = _connect(self.path)
+        try:
+            for section, key, value in conn.execute(
+                "SELECT section, key, value FROM identifier_counters"
+            ):
+                state.setdefault(section, {})[key] = json.loads(value)
+        finally:
+            conn.close()
+        return state
+
+    def commit(self, state: Dict[str, Dict], changes: List[Change]) -> None:
+        """Upsert the changed identifier keys."""
+        conn = _connect(self.path)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO identifier_counters (section, key, value) VALUES (?, ?, ?)",
+                    [(section, key, json.dumps(value)) for section, key, value in changes]
+                )
+        finally:
+            conn.close()
@@ -0,0 +1,202 @@
+# scripts/registry/streaming.py
+"""Streaming JSONL reading and writing for the registry.
+
+Registries stored as JSON lines are read and written one recommendation at a
+time, so memory use does not grow with registry size. Files ending in
+``.jsonl.gz`` are gzip-compressed and files ending in ``.jsonl.zst`` are
+zstd-compressed (the latter requires the optional ``zstandard`` package).
+Gzip headers carry no file name or timestamp, so identical registries
+compress to identical bytes.
+The path ``-`` reads from stdin or writes to stdout, so registries can be
+piped between tools.
+"""
+
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, Optional, Union
+import logging
+
+from .types import Recommendation
+from ..utils import replace_if_changed
+
+logger = logging.getLogger(__name__)
+
+STDIO_PATH = '-'
+JSONL_SUFFIXES = ('.jsonl', '.jsonl.gz', '.jsonl.zst')
+
+PathOrStdio = Union[str, Path]
+
+
+def is_jsonl_path(path: PathOrStdio) -> bool:
+    """Check whether a path names a plain or compressed JSONL registry."""
+    return str(path) == STDIO_PATH or str(path).endswith(JSONL_SUFFIXES)
+
+
+def _zstandard():
+    """Import the optional zstandard module."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Reading or writing .jsonl.zst registries requires the 'zstandard' package "
+            "(pip install 'scripts[zstd]')"
+        ) from e
+    return zstandard
+
+
+class _GzipWriter(gzip.GzipFile):
+    """Gzip writer with a reproducible header that owns its underlying file."""
+
+    def __init__(self, raw: IO[bytes]):
+        super().__init__(filename='', mode='wb', fileobj=raw, mtime=0)
+        self._raw = raw
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def _open_binary(path: Path, mode: str, name: Optional[str] = None) -> IO[bytes]:
+    """Open a registry file in binary mode, (de)compressing by suffix.
+
+    Args:
+        path: File to open
+        mode: ``'r'`` or ``'w'``
+        name: File name whose suffix picks the compression (default: ``path.name``)
+    """
+    name = name or path.name
+    if name.endswith('.gz'):
+        if mode == 'r':
+            return gzip.open(path, 'rb')
+        return _GzipWriter(open(path, 'wb'))
+    if name.endswith('.zst'):
+        zstandard = _zstandard()
+        raw = open(path, mode + 'b')
+        if mode == 'r':
+            return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    return open(path, mode + 'b')
+
+
+def iter_registry_records(path: PathOrStdio) -> Iterator[Dict]:
+    """Yield the raw recommendation dictionaries stored in a JSONL registry.
+
+    Args:
+        path: Path to a ``.jsonl``, ``.jsonl.gz`` or ``.jsonl.zst`` file, or ``-`` for stdin
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If a line is not valid JSON
+    """
+    if str(path) == STDIO_PATH:
+        stream, close = sys.stdin, False
+    else:
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Registry file not found: {path}")
+        stream = io.TextIOWrapper(_open_binary(path, 'r'), encoding='utf-8')
+        close = True
+    try:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if close:
+            stream.close()
+
+
+def iter_registry(path: PathOrStdio) -> Iterator[Recommendation]:
+    """Yield the recommendations stored in a JSONL registry one at a time.
+
+    Args:
+        path: Path to a ``.jsonl``, ``.jsonl.gz`` or ``.jsonl.zst`` file, or ``-`` for stdin
+    """
+    for record in iter_registry_records(path):
+        yield Recommendation.from_dict(record)
+
+
+class RegistryWriter:
+    """Incrementally writes recommendations to a JSONL registry.
+
+    Records are written as they arrive. Files are written to a temporary
+    sibling and renamed into place on a successful close, so readers never
+    see a partial registry; if the writer is closed by an exception, or the
+    new file is identical to the existing one, the target is left untouched.
+    ``changed`` tells whether the target was replaced.
+
+    Example:
+        >>> with RegistryWriter("registry.jsonl.gz") as writer:
+        ...     for rec in iter_registry("big.jsonl"):
+        ...         writer.write(rec)
+    """
+
+    def __init__(self, path: PathOrStdio):
+        """Open a registry for writing.
+
+        Args:
+            path: Path to a ``.jsonl``, ``.jsonl.gz`` or ``.jsonl.zst`` file, or ``-`` for stdout
+        """
+        self.count = 0
+        self.changed = False
+        self._tmp_path: Optional[str] = None
+        if str(path) == STDIO_PATH:
+            self.path = None
+            self._stream = sys.stdout
+            return
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            # Compress according to the final name, not the temporary one
+            binary = _open_binary(Path(self._tmp_path), 'w', name=self.path.name)
+        except BaseException:
+            os.unlink(self._tmp_path)
+            raise
+        self._stream = io.TextIOWrapper(binary, encoding='utf-8')
+
+    def write(self, rec: Union[Recommendation, Dict]) -> None:
+        """Append one recommendation, given as a ``Recommendation`` or its dictionary form."""
+        if isinstance(rec, Recommendation):
+            rec = rec.to_dict()
+        self._stream.write(json.dumps(rec) + '\n')
+        self.count += 1
+
+    def write_all(self, recs: Iterable[Union[Recommendation, Dict]]) -> int:
+        """Append every recommendation from an iterable and return how many were written."""
+        before = self.count
+        for rec in recs:
+            self.write(rec)
+        return self.count - before
+
+    def close(self, commit: bool = True) -> None:
+        """Finish writing, moving the file into place unless ``commit`` is false."""
+        if self.path is None:
+            self._stream.flush()
+            self.changed = True
+            return
+        if self._tmp_path is None:
+            return
+        tmp_path, self._tmp_path = self._tmp_path, None
+        try:
+            self._stream.close()
+            if commit:
+                self.changed = replace_if_changed(tmp_path, self.path)
+                if self.changed:
+                    logger.info(f"Wrote {self.count} recommendations to {self.path}")
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def __enter__(self) -> 'RegistryWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.close(commit=exc_type is None)
@@ -2,10 +2,10 @@
 """Type definitions for ML recommendation registry."""
 
 from enum import Enum
-from typing import Dict, List, Optional, Union
-from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from omegaconf import OmegaConf, DictConfig, MISSING
+from omegaconf import OmegaConf, DictConfig, ListConfig, MISSING
 
 class MLRStatus(str, Enum):
     """Status states for ML recommendations."""
@@ -13,6 +13,23 @@ class MLRStatus(str, Enum):
     STANDARD = "standard"
     DEPRECATED = "deprecated"
 
+def _plain(value: Any) -> Any:
+    """Convert OmegaConf containers to plain Python containers."""
+    if isinstance(value, (DictConfig, ListConfig)):
+        return OmegaConf.to_container(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+def _validate(obj: Any) -> None:
+    """Check an instance against its structured config schema.
+    
+    Raises:
+        omegaconf.errors.ValidationError: If a field has the wrong type
+        omegaconf.errors.MissingMandatoryValue: If a required field is unset
+    """
+    OmegaConf.to_container(OmegaConf.structured(obj), throw_on_missing=True)
+
 @dataclass
 class Source:
     """Source information for a recommendation."""
@@ -22,21 +39,35 @@ class Source:
     first_author: str = MISSING
     arxiv_id: Optional[str] = None
 
+    def __post_init__(self):
+        # Unquoted arXiv IDs are parsed from YAML as floats
+        if self.arxiv_id is not None and not isinstance(self.arxiv_id, str):
+            self.arxiv_id = str(self.arxiv_id)
+
     @classmethod
-    def from_dict(cls, data: Union[Dict, DictConfig]) -> 'Source':
-        """Create Source from dictionary or DictConfig."""
-        conf = OmegaConf.create(data)
-        return cls(
-            paper=conf.paper,
-            paper_id=conf.paper_id,
-            year=conf.year,
-            first_author=conf.first_author,
-            arxiv_id=conf.get('arxiv_id', None)
+    def from_dict(cls, data: Union[Dict, DictConfig], validate: bool = False) -> 'Source':
+        """Create Source from dictionary or DictConfig.
+        
+        Args:
+            data: Source fields
+            validate: Check field types against the schema
+        """
+        source = cls(
+            paper=data['paper'],
+            paper_id=data['paper_id'],
+            year=data['year'],
+            first_author=data['first_author'],
+            arxiv_id=data.get('arxiv_id', None)
         )
+        if validate:
+            _validate(source)
+        return source
 
-    def to_dict(self) -> Dict:
+    def to_dict(self, validate: bool = False) -> Dict:
         """Convert to dictionary, omitting None values."""
-        return {k: v for k, v in OmegaConf.to_container(OmegaConf.create(self)).items() if v is not None}
+        if validate:
+            _validate(self)
+        return {k: v for k in _SOURCE_FIELDS if (v := getattr(self, k)) is not None}
 
 @dataclass
 class Evidence:
@@ -46,20 +77,34 @@ class Evidence:
     year: int = MISSING
     arxiv_id: Optional[str] = None
 
+    def __post_init__(self):
+        # Unquoted arXiv IDs are parsed from YAML as floats
+        if self.arxiv_id is not None and not isinstance(self.arxiv_id, str):
+            self.arxiv_id = str(self.arxiv_id)
+
     @classmethod
-    def from_dict(cls, data: Union[Dict, DictConfig]) -> 'Evidence':
-        """Create Evidence from dictionary or DictConfig."""
-        conf = OmegaConf.create(data)
-        return cls(
-            paper=conf.paper,
-            paper_id=conf.paper_id,
-            year=conf.year,
-            arxiv_id=conf.get('arxiv_id', None)
+    def from_dict(cls, data: Union[Dict, DictConfig], validate: bool = False) -> 'Evidence':
+        """Create Evidence from dictionary or DictConfig.
+        
+        Args:
+            data: Evidence fields
+            validate: Check field types against the schema
+        """
+        evidence = cls(
+            paper=data['paper'],
+            paper_id=data['paper_id'],
+            year=data['year'],
+            arxiv_id=data.get('arxiv_id', None)
         )
+        if validate:
+            _validate(evidence)
+        return evidence
 
-    def to_dict(self) -> Dict:
+    def to_dict(self, validate: bool = False) -> Dict:
         """Convert to dictionary, omitting None values."""
-        return {k: v for k, v in OmegaConf.to_container(OmegaConf.create(self)).items() if v is not None}
+        if validate:
+            _validate(self)
+        return {k: v for k in _EVIDENCE_FIELDS if (v := getattr(self, k)) is not None}
 
 @dataclass
 class Recommendation:
@@ -83,8 +128,13 @@ class Recommendation:
                topic_id: str,
                source: Union[Dict, DictConfig, Source],
                status: MLRStatus,
+               validate: bool = False,
                **kwargs) -> 'Recommendation':
-        """Create a recommendation from raw data."""
+        """Create a recommendation from raw data.
+        
+        Set ``validate`` to check every field against the schema; by default
+        values are taken as given.
+        """
         if isinstance(source, (Dict, DictConfig)):
             source = Source.from_dict(source)
         
@@ -95,7 +145,7 @@ class Recommendation:
                 for e in evidence_list
             ]
         
-        return cls(
+        rec = cls(
             id=id,
             recommendation=recommendation,
             topic=topic,
@@ -103,14 +153,43 @@ class Recommendation:
             source=source,
             status=status,
             supporting_evidence=evidence_list,
-            superseded_by=kwargs.get('superseded_by'),
+            superseded_by=_plain(kwargs.get('superseded_by')),
             deprecated_date=kwargs.get('deprecated_date'),
-            implementations=kwargs.get('implementations', [])
+            implementations=_plain(kwargs.get('implementations', []))
         )
+        if validate:
+            _validate(rec)
+        return rec
 
-    def to_dict(self) -> Dict:
-        """Convert recommendation to dictionary."""
-        conf = OmegaConf.create({
+    @classmethod
+    def from_dict(cls, data: Union[Dict, DictConfig], validate: bool = False) -> 'Recommendation':
+        """Create a Recommendation from an exported dictionary.
+
+        Args:
+            data: Recommendation fields, as produced by ``to_dict``
+            validate: Check field types against the schema
+        """
+        fields = dict(data)
+        return cls.create(
+            id=fields.pop('id'),
+            recommendation=fields.pop('recommendation'),
+            topic=fields.pop('topic'),
+            topic_id=fields.pop('topic_id'),
+            source=fields.pop('source'),
+            status=MLRStatus(fields.pop('status')),
+            validate=validate,
+            **fields
+        )
+
+    def to_dict(self, validate: bool = False) -> Dict:
+        """Convert recommendation to dictionary, omitting None values.
+        
+        Args:
+            validate: Check every field against the schema before converting
+        """
+        if validate:
+            _validate(self)
+        data = {
             'id': self.id,
             'recommendation': self.recommendation,
             'topic': self.topic,
@@ -118,11 +197,14 @@ class Recommendation:
             'source': self.source.to_dict(),
             'status': self.status.value,
             'supporting_evidence': [e.to_dict() for e in self.supporting_evidence],
-            'implementations': self.implementations,
-            'superseded_by': self.superseded_by,
+            'implementations': _plain(self.implementations),
+            'superseded_by': _plain(self.superseded_by),
             'deprecated_date': self.deprecated_date
-        })
-        return {k: v for k, v in OmegaConf.to_container(conf).items() if v is not None}
+        }
+        return {k: v for k, v in data.items() if v is not None}
+
+_SOURCE_FIELDS = tuple(f.name for f in fields(Source))
+_EVIDENCE_FIELDS = tuple(f.name for f in fields(Evidence))
 
 def create_config_from_dict(data: Dict) -> DictConfig:
     """Create an OmegaConf config from a dictionary."""
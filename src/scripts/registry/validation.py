@@ -0,0 +1,183 @@
+# scripts/registry/validation.py
+"""Validation of research data.
+
+All checks run over the whole document and every problem found is collected
+into one ``ValidationReport`` instead of stopping at the first error. Checks
+that only look at a single paper run per year shard, optionally in a process
+pool; checks that compare papers with each other (duplicate arXiv IDs,
+dangling ``superseded_by`` references) run once over the combined results.
+
+The basic checks (valid year keys, paper lists, required fields) always run.
+``strict`` adds field types, year consistency, non-empty string topics,
+string SOTA entries, duplicate arXiv IDs and dangling ``superseded_by``
+references.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RegistryDataError(Exception):
+    """Raised when there are issues with registry data format."""
+    pass
+
+
+REQUIRED_FIELDS = {
+    'title': str,
+    'first_author': str,
+    'year': int,
+}
+
+
+@dataclass
+class ValidationIssue:
+    """A single problem found in the research data."""
+    year: Any
+    message: str
+    title: Optional[str] = None
+
+    def __str__(self) -> str:
+        where = f"'{self.title}' ({self.year})" if self.title else f"year {self.year}"
+        return f"{where}: {self.message}"
+
+
+@dataclass
+class ValidationReport:
+    """Every problem found while validating research data."""
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """A report is truthy when validation passed."""
+        return not self.issues
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    def format(self) -> str:
+        """Render the report as one line per issue."""
+        return '\n'.join(f"- {issue}" for issue in self.issues)
+
+    def raise_for_issues(self) -> None:
+        """Raise a ``RegistryDataError`` listing every issue, if there are any."""
+        if self.issues:
+            raise RegistryDataError(
+                f"Research data has {len(self.issues)} problem(s):\n{self.format()}"
+            )
+
+
+def check_paper(paper: Dict, year: Any, strict: bool = False) -> List[str]:
+    """Run the single-paper checks on one entry and return its problems."""
+    problems = []
+    missing = [name for name in REQUIRED_FIELDS if name not in paper]
+    if missing:
+        problems.append(f"missing required fields: {', '.join(missing)}")
+    if not strict:
+        return problems
+
+    for name, expected in REQUIRED_FIELDS.items():
+        # bool is an int subclass, but never a valid year
+        value = paper.get(name)
+        if name in paper and (not isinstance(value, expected) or isinstance(value, bool)):
+            problems.append(f"invalid type for {name}: expected {expected.__name__}, "
+                            f"got {type(value).__name__}")
+    if 'year' in paper and str(paper['year']) != str(year):
+        problems.append(f"year {paper['year']} doesn't match container year {year}")
+    if 'arxiv_id' in paper and not isinstance(paper['arxiv_id'], str):
+        problems.append(f"arxiv_id {paper['arxiv_id']!r} should be a quoted string")
+
+    topics = paper.get('topics')
+    if not topics:
+        problems.append("has empty topics list")
+    elif not isinstance(topics, list) or not all(isinstance(t, str) for t in topics):
+        problems.append("has non-string topics")
+
+    sota = paper.get('sota')
+    if sota is not None and (not isinstance(sota, list) or not all(isinstance(r, str) for r in sota)):
+        problems.append("has non-string SOTA recommendations")
+    return problems
+
+
+def _superseded_by(paper: Dict) -> List[str]:
+    attic = paper.get('attic')
+    if not isinstance(attic, dict) or not attic.get('superseded_by'):
+        return []
+    targets = attic['superseded_by']
+    return [str(t) for t in (targets if isinstance(targets, list) else [targets])]
+
+
+def _validate_shard(year: Any, papers: Any, strict: bool) -> Tuple[List[ValidationIssue], List[Tuple]]:
+    """Check one year's papers.
+
+    Returns:
+        The issues found and, per paper, ``(title, arxiv_id, superseded_by)``
+        for the cross-paper checks
+    """
+    issues = []
+    refs = []
+    try:
+        if not 1900 <= int(year) <= datetime.now().year:
+            issues.append(ValidationIssue(year, f"invalid year: {year}"))
+    except (TypeError, ValueError):
+        issues.append(ValidationIssue(year, f"invalid year format: {year}"))
+
+    if not isinstance(papers, list):
+        issues.append(ValidationIssue(year, "papers must be a list"))
+        return issues, refs
+
+    for position, paper in enumerate(papers):
+        if not isinstance(paper, dict):
+            issues.append(ValidationIssue(year, f"invalid paper entry at position {position}"))
+            continue
+        title = paper.get('title') or f"entry {position}"
+        issues.extend(ValidationIssue(year, problem, title) for problem in check_paper(paper, year, strict))
+        if strict:
+            arxiv_id = paper.get('arxiv_id')
+            refs.append((title, None if arxiv_id is None else str(arxiv_id), _superseded_by(paper)))
+    return issues, refs
+
+
+def validate_research_data(data: Any, strict: bool = False, max_workers: Optional[int] = None) -> ValidationReport:
+    """Validate research data and collect every problem found.
+
+    Args:
+        data: Parsed research data keyed by year
+        strict: Run the full set of checks rather than only the basic ones
+        max_workers: Validate year shards in a process pool of this size;
+            by default shards are checked in this process, which is faster
+            for anything but very large data sets
+
+    Returns:
+        The validation report
+    """
+    report = ValidationReport()
+    if not isinstance(data, dict):
+        report.issues.append(ValidationIssue(None, "research data must be a dictionary"))
+        return report
+
+    shards = list(data.items())
+    if max_workers and max_workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_validate_shard, *zip(*shards), [strict] * len(shards)))
+    else:
+        results = [_validate_shard(year, papers, strict) for year, papers in shards]
+
+    seen_arxiv: Dict[str, Any] = {}
+    pending_refs = []
+    for (year, _), (issues, refs) in zip(shards, results):
+        report.issues.extend(issues)
+        for title, arxiv_id, superseded_by in refs:
+            if arxiv_id is not None:
+                if arxiv_id in seen_arxiv:
+                    report.issues.append(ValidationIssue(
+                        year, f"duplicate arxiv_id {arxiv_id}, also used by '{seen_arxiv[arxiv_id]}'", title))
+                else:
+                    seen_arxiv[arxiv_id] = title
+            pending_refs.extend((year, title, target) for target in superseded_by)
+
+    for year, title, target in pending_refs:
+        if target not in seen_arxiv:
+            report.issues.append(ValidationIssue(
+                year, f"superseded_by {target} does not match any paper's arxiv_id", title))
+    return report
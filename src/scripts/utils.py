@@ -1,7 +1,11 @@
+from dataclasses import dataclass, field
 from pathlib import Path
+import hashlib
 import tomli
 import os
+import stat
 import subprocess
+import tempfile
 from loguru import logger
 
 
@@ -42,6 +46,123 @@ def load_config(config_path: str) -> dict:
         logger.error(f"Configuration file not found: {full_path}")
         raise
 
+def _read_umask() -> int:
+    """Return the process umask, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Read once at import, before any writer threads exist, as reading it briefly clears it
+_UMASK = _read_umask()
+
+def file_digest(path: str | Path) -> bytes:
+    """Return the SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def _unchanged(path: Path, size: int, digest) -> bool:
+    """Check whether a file already holds content of the given size and hash.
+
+    Sizes are compared first, so most changed files are caught without
+    reading them.
+    """
+    try:
+        if path.stat().st_size != size:
+            return False
+    except FileNotFoundError:
+        return False
+    return file_digest(path) == digest()
+
+def _move_into_place(tmp_path: Path, path: Path) -> None:
+    """Rename a temporary file over ``path``, keeping the mode outputs normally get."""
+    # mkstemp creates private files; give new ones the mode open() would
+    mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o666 & ~_UMASK
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+def replace_if_changed(tmp_path: str | Path, path: str | Path) -> bool:
+    """Move a finished temporary file over ``path`` unless the contents match.
+
+    Args:
+        tmp_path: Fully written temporary file, on the same filesystem as ``path``
+        path: Destination file
+
+    Returns:
+        True if ``path`` was replaced, False if it already held the same bytes
+        (the temporary file is removed either way)
+    """
+    tmp_path, path = Path(tmp_path), Path(path)
+    if _unchanged(path, tmp_path.stat().st_size, lambda: file_digest(tmp_path)):
+        tmp_path.unlink()
+        logger.debug(f"Unchanged: {path}")
+        return False
+    _move_into_place(tmp_path, path)
+    return True
+
+def write_if_changed(path: str | Path,
+                     content: str | bytes,
+                     encoding: str = 'utf-8',
+                     fsync: bool = False) -> bool:
+    """Atomically write ``content`` to ``path`` unless the file already holds it.
+
+    Unchanged files are left alone, keeping their mtimes, so git and uploads
+    don't see spurious changes. Changed files are written to a temporary
+    sibling and renamed into place.
+
+    Args:
+        path: File to write
+        content: Text (encoded with ``encoding``) or bytes
+        encoding: Encoding for text content
+        fsync: Flush the new file to disk before renaming it into place, for
+            state that later steps rely on surviving a crash
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    path = Path(path)
+    data = content.encode(encoding) if isinstance(content, str) else content
+    if _unchanged(path, len(data), lambda: hashlib.sha256(data).digest()):
+        logger.debug(f"Unchanged: {path}")
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        _move_into_place(Path(tmp_path), path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return True
+
+@dataclass
+class WriteReport:
+    """Tally of generated files that were written or left unchanged."""
+    written: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+    # Every file accounted for, written or not, in the order recorded
+    paths: list[Path] = field(default_factory=list)
+
+    def record(self, path: str | Path, changed: bool) -> bool:
+        """Record the outcome of one write and pass it through."""
+        path = Path(path)
+        (self.written if changed else self.unchanged).append(path)
+        self.paths.append(path)
+        return changed
+
+    def write(self, path: str | Path, content: str | bytes) -> bool:
+        """Write a file with ``write_if_changed`` and record the outcome."""
+        return self.record(path, write_if_changed(path, content))
+
+    def __str__(self) -> str:
+        return f"{len(self.written)} written, {len(self.unchanged)} unchanged"
+
 def commit_and_push(
     paths: str | Path | list[str | Path],
     message: str|None = None,
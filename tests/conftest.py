@@ -94,7 +94,10 @@ def registry(id_registry):
     return RecommendationRegistry(id_registry)
 
 @pytest.fixture
-def populated_registry(registry, sample_research_yaml):
+def populated_registry(tmp_path_factory, sample_research_yaml):
     """Fixture providing a registry populated with sample data."""
+    from scripts.registry.identifiers import MLRIdentifierRegistry
     from scripts.registry.recommendations import build_registry_from_yaml
-    return build_registry_from_yaml(sample_research_yaml)
+    # Keep identifier state out of the working directory and out of tmp_path
+    id_registry = MLRIdentifierRegistry(tmp_path_factory.mktemp("ids") / "mlr_registry.json")
+    return build_registry_from_yaml(sample_research_yaml, id_registry=id_registry)
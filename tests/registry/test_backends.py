@@ -0,0 +1,101 @@
+# tests/registry/test_backends.py
+"""Tests for identifier storage backends."""
+
+import json
+import os
+import stat
+import pytest
+
+from scripts.registry.backends import JSONIdentifierStore, LogIdentifierStore
+from scripts.registry.identifiers import MLRIdentifierRegistry
+
+@pytest.fixture
+def log_store(tmp_path):
+    """Provide a log store that never compacts on its own."""
+    return LogIdentifierStore(tmp_path / "ids.json", compact_every=10_000)
+
+def test_json_store_is_default(tmp_path):
+    """Test that the registry defaults to the JSON backend."""
+    registry = MLRIdentifierRegistry(tmp_path / "ids.json")
+    assert isinstance(registry.store, JSONIdentifierStore)
+
+@pytest.mark.parametrize("store", [JSONIdentifierStore, LogIdentifierStore])
+def test_state_files_follow_umask(tmp_path, store):
+    """Test that identifier state isn't written as a private file."""
+    path = tmp_path / "ids.json"
+    store = store(path)
+    store.commit({'paper_ids': {}, 'recommendation_ids': {}}, [('paper_ids', 'a', 'A001')])
+    if isinstance(store, LogIdentifierStore):
+        store.compact({'paper_ids': {'a': 'A001'}, 'recommendation_ids': {}})
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+def test_log_store_appends_one_record_per_allocation(tmp_path, log_store):
+    """Test that each allocation is a single appended log line."""
+    registry = MLRIdentifierRegistry(store=log_store)
+    paper_id = registry.get_paper_id("Smith", 2020, "2020.12345")
+    registry.generate_id(2020, paper_id)
+    registry.generate_id(2020, paper_id)
+    
+    lines = log_store.log_path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        ["paper_ids", "Smith-2020-2020.12345", "Smith001"],
+        ["recommendation_ids", "2020-Smith001", 1],
+        ["recommendation_ids", "2020-Smith001", 2],
+    ]
+    assert not log_store.path.exists()
+
+def test_log_store_replays_snapshot_and_log(tmp_path):
+    """Test that a new registry sees allocations from snapshot and log."""
+    path = tmp_path / "ids.json"
+    registry = MLRIdentifierRegistry(store=LogIdentifierStore(path, compact_every=2))
+    paper_id = registry.get_paper_id("Smith", 2020)
+    registry.generate_id(2020, paper_id)  # triggers compaction
+    registry.generate_id(2020, paper_id)
+    assert path.exists()
+    
+    reloaded = MLRIdentifierRegistry(store=LogIdentifierStore(path))
+    assert reloaded.get_paper_id("Smith", 2020) == "Smith001"
+    assert reloaded.generate_id(2020, paper_id) == "MLR-2020-Smith001-0003"
+
+def test_log_store_batch_writes_latest_values(log_store):
+    """Test that a batch appends one record per touched key."""
+    registry = MLRIdentifierRegistry(store=log_store)
+    with registry.batch():
+        for _ in range(5):
+            registry.generate_id(2020, "Smith001")
+    
+    lines = log_store.log_path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [["recommendation_ids", "2020-Smith001", 5]]
+
+def test_log_store_discards_torn_tail(tmp_path, log_store):
+    """Test recovery from a crash in the middle of an append."""
+    registry = MLRIdentifierRegistry(store=log_store)
+    registry.generate_id(2020, "Smith001")
+    with open(log_store.log_path, 'a') as f:
+        f.write('["recommendation_ids", "2020-Smi')
+    
+    store = LogIdentifierStore(log_store.path)
+    reloaded = MLRIdentifierRegistry(store=store)
+    assert reloaded.generate_id(2020, "Smith001") == "MLR-2020-Smith001-0002"
+    
+    final = MLRIdentifierRegistry(store=LogIdentifierStore(log_store.path))
+    assert final.current_ids['recommendation_ids'] == {'2020-Smith001': 2}
+
+def test_log_store_replay_after_interrupted_compaction(tmp_path, log_store):
+    """Test that replaying records already in the snapshot is harmless."""
+    registry = MLRIdentifierRegistry(store=log_store)
+    registry.generate_id(2020, "Smith001")
+    registry.generate_id(2020, "Smith001")
+    # Simulate a crash after the snapshot was written but before log truncation
+    log_store.path.write_text(json.dumps(registry.current_ids))
+    
+    reloaded = MLRIdentifierRegistry(store=LogIdentifierStore(log_store.path))
+    assert reloaded.generate_id(2020, "Smith001") == "MLR-2020-Smith001-0003"
+
+def test_log_store_rejects_corrupt_records(log_store):
+    """Test that corruption before the tail is not silently ignored."""
+    log_store.log_path.write_text('not json\n["paper_ids", "k", "Smith001"]\n')
+    with pytest.raises(ValueError):
+        MLRIdentifierRegistry(store=log_store)
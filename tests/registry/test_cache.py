@@ -0,0 +1,71 @@
+# tests/registry/test_cache.py
+"""Tests for the parsed-document cache."""
+
+import os
+
+import pytest
+import yaml
+
+from scripts.registry import io
+from scripts.registry.io import load_research_yaml, load_registry, save_registry, RegistryDataError
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    """Count calls to the YAML loader."""
+    calls = []
+    real_load = yaml.load
+    monkeypatch.setattr(io.yaml, 'load', lambda *a, **kw: calls.append(1) or real_load(*a, **kw))
+    return calls
+
+def test_unchanged_file_is_not_reparsed(sample_yaml_file, sample_research_yaml, tmp_path, count_parses):
+    """Test that a second load comes from the cache."""
+    cache_dir = tmp_path / "cache"
+    first = load_research_yaml(sample_yaml_file, cache_dir=cache_dir)
+    second = load_research_yaml(sample_yaml_file, cache_dir=cache_dir)
+    assert first == second == sample_research_yaml
+    assert len(count_parses) == 1
+
+def test_touched_file_reuses_cache(sample_yaml_file, tmp_path, count_parses):
+    """Test that a new mtime with identical contents still hits the cache."""
+    cache_dir = tmp_path / "cache"
+    load_research_yaml(sample_yaml_file, cache_dir=cache_dir)
+    stat = sample_yaml_file.stat()
+    os.utime(sample_yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_research_yaml(sample_yaml_file, cache_dir=cache_dir)
+    assert len(count_parses) == 1
+
+def test_changed_file_is_reparsed(sample_yaml_file, sample_research_yaml, tmp_path):
+    """Test that edits invalidate the cache."""
+    cache_dir = tmp_path / "cache"
+    load_research_yaml(sample_yaml_file, cache_dir=cache_dir)
+    sample_research_yaml["2020"][0]["title"] = "Renamed Paper"
+    sample_yaml_file.write_text(yaml.safe_dump(sample_research_yaml))
+    assert load_research_yaml(sample_yaml_file, cache_dir=cache_dir)["2020"][0]["title"] == "Renamed Paper"
+
+def test_same_size_edit_with_restored_mtime_is_reparsed(sample_yaml_file, tmp_path):
+    """Test that the cache is keyed on contents, not on mtime and size."""
+    cache_dir = tmp_path / "cache"
+    load_research_yaml(sample_yaml_file, cache_dir=cache_dir)
+    stat = sample_yaml_file.stat()
+    sample_yaml_file.write_text(sample_yaml_file.read_text().replace("Test Paper 1", "Test Paper 9"))
+    os.utime(sample_yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert sample_yaml_file.stat().st_size == stat.st_size
+    assert load_research_yaml(sample_yaml_file, cache_dir=cache_dir)["2020"][0]["title"] == "Test Paper 9"
+
+def test_invalid_data_is_not_cached(tmp_path):
+    """Test that validation errors are raised every time."""
+    path = tmp_path / "research.yaml"
+    path.write_text(yaml.safe_dump(["not", "a", "dict"]))
+    for _ in range(2):
+        with pytest.raises(RegistryDataError):
+            load_research_yaml(path, cache_dir=tmp_path / "cache")
+
+def test_corrupt_cache_is_rebuilt(populated_registry, tmp_path):
+    """Test that an unreadable cache entry is ignored."""
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "registry.yaml"
+    save_registry(populated_registry, path)
+    expected = load_registry(path, cache_dir=cache_dir)
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b"garbage")
+    assert load_registry(path, cache_dir=cache_dir) == expected
@@ -0,0 +1,85 @@
+# tests/registry/test_compact.py
+"""Tests for compact recommendation storage."""
+
+import pytest
+
+from scripts.registry.types import MLRStatus, Recommendation, Source, Evidence
+from scripts.registry.compact import CompactRecommendationStore, StringPool
+from scripts.registry.recommendations import RecommendationRegistry
+from scripts.registry.identifiers import MLRIdentifierRegistry
+
+@pytest.fixture
+def recommendation():
+    """Provide a recommendation using every field."""
+    return Recommendation(
+        id="MLR-2020-Smith001-0001",
+        recommendation="Use gradient clipping",
+        topic="optimization",
+        topic_id="optimization/use-gradient-clipping",
+        source=Source(paper="Smith et al. (2020)", paper_id="Smith001", year=2020,
+                      first_author="Smith", arxiv_id="2001.12345"),
+        status=MLRStatus.DEPRECATED,
+        supporting_evidence=[Evidence(paper="Jones et al. (2021)", paper_id="Jones001", year=2021)],
+        superseded_by="MLR-2021-Jones001-0001",
+        deprecated_date="2021-06-01",
+        implementations=["llama2", "gpt2"],
+    )
+
+def test_string_pool_interns_values():
+    """Test that equal values share a code and None is code 0."""
+    pool = StringPool()
+    assert pool.encode(None) == 0
+    code = pool.encode("optimization")
+    assert pool.encode("optimization") == code
+    assert pool.decode(code) == "optimization"
+    assert len(pool) == 2
+
+def test_round_trip(recommendation):
+    """Test that a stored recommendation materializes unchanged."""
+    store = CompactRecommendationStore()
+    store[recommendation.id] = recommendation
+    assert store[recommendation.id] == recommendation
+    assert store.status_of(recommendation.id) == MLRStatus.DEPRECATED
+    assert store.year_of(recommendation.id) == 2020
+
+def test_overwrite_and_delete(recommendation):
+    """Test that rows can be replaced and removed."""
+    store = CompactRecommendationStore()
+    store[recommendation.id] = recommendation
+    store["other"] = recommendation
+    recommendation.status = MLRStatus.STANDARD
+    recommendation.superseded_by = None
+    recommendation.deprecated_date = None
+    store[recommendation.id] = recommendation
+    assert store[recommendation.id].status == MLRStatus.STANDARD
+    assert store[recommendation.id].superseded_by is None
+
+    del store[recommendation.id]
+    assert recommendation.id not in store
+    assert list(store) == ["other"]
+    assert len(store) == 1
+    assert store.get(recommendation.id) is None
+
+def test_compact_registry_matches_dict_registry(tmp_path):
+    """Test that both storage modes give the same query and export results."""
+    registries = [
+        RecommendationRegistry(MLRIdentifierRegistry(tmp_path / f"ids_{compact}.json"), compact=compact)
+        for compact in (False, True)
+    ]
+    for registry in registries:
+        registry.add_recommendation("optimization", "Use gradient clipping", "Smith",
+                                    "Smith et al. (2020)", 2020, implementations=["llama2"])
+        registry.add_recommendation("optimization", "Use warmup", "Jones",
+                                    "Jones et al. (2021)", 2021, experimental=True)
+        registry.add_recommendation("attention", "Use flash attention", "Dao",
+                                    "Dao et al. (2022)", 2022)
+
+    plain, compact = registries
+    assert isinstance(compact.recommendations, CompactRecommendationStore)
+    for status in MLRStatus:
+        assert compact.get_recommendations_by_status(status) == plain.get_recommendations_by_status(status)
+    assert compact.get_recommendations_by_topic("optimization") == plain.get_recommendations_by_topic("optimization")
+
+    plain_export, compact_export = plain.export_registry(), compact.export_registry()
+    assert compact_export['recommendations'] == plain_export['recommendations']
+    assert compact_export['topics'] == plain_export['topics']
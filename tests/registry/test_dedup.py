@@ -0,0 +1,59 @@
+# tests/registry/test_dedup.py
+"""Tests for near-duplicate recommendation detection."""
+
+import pytest
+
+from scripts.registry.dedup import find_near_duplicates, link_near_duplicates, minhash, shingles, similarity
+from scripts.registry.recommendations import RecommendationRegistry
+
+def test_shingles_ignore_formatting():
+    """Test that case, punctuation and spacing don't change the shingles."""
+    assert shingles("Use  Flash-Attention!") == shingles("use flash attention")
+    assert shingles("abc") == {"abc"}
+
+def test_minhash_estimates_jaccard():
+    """Test that signature agreement tracks shingle overlap."""
+    a = shingles("Place BatchNorm after linear layers but before activation functions")
+    b = shingles("Place BN after linear layers but before activation functions")
+    c = shingles("Shuffle the training data every epoch")
+    assert similarity(minhash(a), minhash(a)) == 1.0
+    assert similarity(minhash(a), minhash(b)) > 0.5
+    assert similarity(minhash(a), minhash(c)) < 0.2
+
+def test_find_near_duplicates():
+    """Test that restatements cluster together and distinct texts stay apart."""
+    texts = [
+        "Use flash attention for better memory efficiency",
+        "Shuffle the training data every epoch",
+        "Use Flash Attention for better memory efficiency.",
+        "Warm up the learning rate linearly",
+        "Use flash attention for improved memory efficiency",
+    ]
+    assert find_near_duplicates(texts) == [[0, 2, 4]]
+    assert find_near_duplicates(texts, threshold=1.0) == [[0, 2]]
+    with pytest.raises(ValueError):
+        find_near_duplicates(texts, num_perm=64, bands=10)
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_link_near_duplicates(id_registry, compact):
+    """Test that near-duplicates from other papers are cited as evidence, once."""
+    registry = RecommendationRegistry(id_registry, compact=compact)
+    flash = registry.add_recommendation("attention", "Use flash attention for memory efficiency",
+                                        "Dao", "Dao et al. (2022)", 2022, arxiv_id="2205.14135")
+    flash2 = registry.add_recommendation("attention", "Use flash attention for better memory efficiency",
+                                         "Dao", "Dao et al. (2023)", 2023)
+    same_paper = registry.add_recommendation("attention", "Use flash attention for memory efficiency",
+                                             "Dao", "Dao et al. (2022)", 2022, arxiv_id="2205.14135",
+                                             experimental=True)
+    other = registry.add_recommendation("optimization", "Clip gradients at 1.0",
+                                        "Smith", "Smith et al. (2020)", 2020)
+
+    clusters = link_near_duplicates(registry)
+    assert clusters == [[flash, flash2, same_paper]]
+    assert link_near_duplicates(registry) == clusters
+
+    evidence = registry.get_recommendation_by_mlr(flash).supporting_evidence
+    assert [e.paper for e in evidence] == ["Dao et al. (2023)"]
+    evidence = registry.get_recommendation_by_mlr(flash2).supporting_evidence
+    assert [(e.paper, e.arxiv_id) for e in evidence] == [("Dao et al. (2022)", "2205.14135")]
+    assert registry.get_recommendation_by_mlr(other).supporting_evidence == []
@@ -79,3 +79,38 @@ def test_invalid_registry_file(tmp_path):
     
     registry = MLRIdentifierRegistry(bad_file)
     assert registry.current_ids == {'paper_ids': {}, 'recommendation_ids': {}}
+
+def test_batch_defers_persistence(temp_registry_file):
+    """Test that a batch keeps allocations in memory until it exits."""
+    registry = MLRIdentifierRegistry(temp_registry_file)
+    with registry.batch():
+        paper_id = registry.get_paper_id("Smith", 2020, "2020.12345")
+        registry.generate_id(2020, paper_id)
+        registry.generate_id(2020, paper_id)
+        assert not temp_registry_file.exists()
+    
+    assert temp_registry_file.exists()
+    reloaded = MLRIdentifierRegistry(temp_registry_file)
+    assert reloaded.current_ids['recommendation_ids'] == {'2020-Smith001': 2}
+
+def test_batch_rolls_back_on_error(temp_registry_file):
+    """Test that a failing batch discards its allocations."""
+    registry = MLRIdentifierRegistry(temp_registry_file)
+    registry.get_paper_id("Smith", 2020, "2020.12345")
+    
+    with pytest.raises(RuntimeError):
+        with registry.batch():
+            registry.get_paper_id("Smith", 2021, "2021.12345")
+            registry.generate_id(2021, "Smith002")
+            raise RuntimeError("boom")
+    
+    assert registry.current_ids['recommendation_ids'] == {}
+    assert registry.get_paper_id("Jones", 2020) == "Jones001"
+    assert registry.get_paper_id("Smith", 2022) == "Smith002"
+    assert MLRIdentifierRegistry(temp_registry_file).current_ids == registry.current_ids
+
+def test_save_leaves_no_temp_files(temp_registry_file):
+    """Test that atomic saves clean up after themselves."""
+    registry = MLRIdentifierRegistry(temp_registry_file)
+    registry.get_paper_id("Smith", 2020)
+    assert [p.name for p in temp_registry_file.parent.iterdir()] == [temp_registry_file.name]
@@ -0,0 +1,100 @@
+# tests/registry/test_incremental.py
+"""Tests for incremental registry builds."""
+
+import copy
+
+import pytest
+
+from scripts.registry.identifiers import MLRIdentifierRegistry
+from scripts.registry.incremental import (
+    build_registry_incremental,
+    load_fingerprints,
+    save_fingerprints,
+)
+
+def build(tmp_path, data, previous=None, fingerprints=None, name="ids.json"):
+    """Run a build with a fresh identifier registry, as a clean CI checkout would."""
+    id_registry = MLRIdentifierRegistry(tmp_path / name)
+    registry, fingerprints = build_registry_incremental(
+        data, previous and previous['recommendations'], fingerprints, id_registry
+    )
+    return registry.export_registry(), fingerprints
+
+def test_full_build_matches_incremental_rebuild(tmp_path, sample_research_yaml):
+    """Test that an unchanged rebuild reproduces the previous export."""
+    first, fingerprints = build(tmp_path, sample_research_yaml, name="first.json")
+    second, again = build(tmp_path, sample_research_yaml, first, fingerprints, name="second.json")
+    assert second['recommendations'] == first['recommendations']
+    assert second['topics'] == first['topics']
+    assert again == fingerprints
+
+def test_only_changed_papers_are_rebuilt(tmp_path, sample_research_yaml):
+    """Test that unchanged papers are restored as-is and changed ones rebuilt."""
+    first, fingerprints = build(tmp_path, sample_research_yaml, name="first.json")
+    first_ids = [rec['id'] for rec in first['recommendations']]
+
+    data = copy.deepcopy(sample_research_yaml)
+    data["2020"][0]["sota"].append("Warm up the learning rate")
+    second, _ = build(tmp_path, data, first, fingerprints, name="second.json")
+
+    by_text = {rec['recommendation']: rec for rec in second['recommendations']}
+    assert "Warm up the learning rate" in by_text
+    # Papers from 2021 were restored unchanged
+    restored = [rec for rec in second['recommendations'] if rec['source']['year'] == 2021]
+    assert restored == [rec for rec in first['recommendations'] if rec['source']['year'] == 2021]
+    # No ID was issued twice, even though the identifier registry started empty
+    second_ids = [rec['id'] for rec in second['recommendations']]
+    assert len(second_ids) == len(set(second_ids)) == len(first_ids) + 1
+
+def test_edited_paper_keeps_its_ids(tmp_path, sample_research_yaml):
+    """Test that an edited paper keeps its paper ID and the IDs of untouched texts."""
+    first, fingerprints = build(tmp_path, sample_research_yaml, name="first.json")
+    first_ids = {rec['recommendation']: rec['id'] for rec in first['recommendations']
+                 if rec['source']['year'] == 2020}
+    assert sorted(first_ids.values()) == ["MLR-2020-Smith001-0001", "MLR-2020-Smith001-0002"]
+
+    data = copy.deepcopy(sample_research_yaml)
+    data["2020"][0]["sota"].append("Warm up the learning rate")
+    data["2020"][0]["models"].append("model3")
+    second, _ = build(tmp_path, data, first, fingerprints, name="second.json")
+    second_ids = {rec['recommendation']: rec['id'] for rec in second['recommendations']
+                  if rec['source']['year'] == 2020}
+    assert second_ids == {**first_ids, "Warm up the learning rate": "MLR-2020-Smith001-0003"}
+    # The rebuilt records pick up the edit
+    assert all("model3" in rec['implementations'] for rec in second['recommendations']
+               if rec['source']['year'] == 2020)
+
+    full, _ = build(tmp_path, data, name="full.json")
+    assert second == full
+
+def test_missing_previous_record_forces_rebuild(tmp_path, sample_research_yaml):
+    """Test that a paper is rebuilt if its saved records are gone."""
+    first, fingerprints = build(tmp_path, sample_research_yaml, name="first.json")
+    first['recommendations'] = first['recommendations'][1:]
+    second, _ = build(tmp_path, sample_research_yaml, first, fingerprints, name="second.json")
+    assert len(second['recommendations']) == len(first['recommendations']) + 1
+
+def test_fingerprints_round_trip(tmp_path, sample_research_yaml):
+    """Test that fingerprints survive a save and load."""
+    _, fingerprints = build(tmp_path, sample_research_yaml)
+    path = tmp_path / "registry.fingerprints.json"
+    assert load_fingerprints(path) == {}
+    save_fingerprints(fingerprints, path)
+    assert load_fingerprints(path) == fingerprints
+
+def test_reserve_id_blocks_reuse(tmp_path):
+    """Test that reserved IDs are never generated again."""
+    id_registry = MLRIdentifierRegistry(tmp_path / "ids.json")
+    id_registry.reserve_id("MLR-2020-Smith002-0003", "Smith", "2020.12345")
+    assert id_registry.get_paper_id("Smith", 2020, "2020.12345") == "Smith002"
+    assert id_registry.get_paper_id("Smith", 2021) == "Smith003"
+    assert id_registry.generate_id(2020, "Smith002") == "MLR-2020-Smith002-0004"
+    with pytest.raises(ValueError):
+        id_registry.reserve_id("not-an-id", "Smith")
+
+def test_parallel_incremental_build(tmp_path, sample_research_yaml):
+    """Test that drafting changed papers in worker processes changes nothing."""
+    serial, _ = build_registry_incremental(sample_research_yaml, id_registry=MLRIdentifierRegistry(tmp_path / "a.json"))
+    parallel, _ = build_registry_incremental(sample_research_yaml, id_registry=MLRIdentifierRegistry(tmp_path / "b.json"),
+                                             max_workers=2)
+    assert parallel.export_registry() == serial.export_registry()
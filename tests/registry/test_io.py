@@ -5,13 +5,16 @@ import pytest
 import yaml
 from pathlib import Path
 
+from scripts.registry import io
 from scripts.registry.io import (
     load_research_yaml,
     save_registry,
     load_registry,
     registry_to_markdown,
+    write_outputs,
     RegistryDataError
 )
+from scripts.registry.identifiers import MLRIdentifierRegistry
 from scripts.registry.recommendations import RecommendationRegistry
 
 @pytest.fixture
@@ -35,9 +38,9 @@ def sample_research_yaml(tmp_path):
     return yaml_path
 
 @pytest.fixture
-def sample_registry():
+def sample_registry(tmp_path_factory):
     """Create a sample registry with some recommendations."""
-    registry = RecommendationRegistry()
+    registry = RecommendationRegistry(MLRIdentifierRegistry(tmp_path_factory.mktemp("ids") / "mlr_registry.json"))
     registry.add_recommendation(
         topic="optimization",
         recommendation="Test recommendation",
@@ -116,6 +119,49 @@ def test_registry_to_markdown(sample_registry, tmp_path):
     assert "Test recommendation" in content
     assert "## Statistics" in content
 
+def test_write_outputs_exports_once(sample_registry, tmp_path, monkeypatch):
+    """Test that all outputs are written from a single export."""
+    calls = []
+    export = sample_registry.export_registry
+    monkeypatch.setattr(sample_registry, 'export_registry', lambda: calls.append(1) or export())
+    
+    paths = [tmp_path / "registry.yaml", tmp_path / "registry.jsonl",
+             tmp_path / "REGISTRY.md", tmp_path / "sections" / "registry.md.j2"]
+    data = write_outputs(sample_registry, paths)
+    
+    assert len(calls) == 1
+    assert load_registry(paths[0])['recommendations'] == data['recommendations']
+    assert load_registry(paths[1])['recommendations'] == data['recommendations']
+    assert paths[2].read_text() == paths[3].read_text()
+    assert "# ML Training Recommendations Registry" in paths[3].read_text()
+
+def test_write_outputs_share_a_read_only_export(sample_registry, tmp_path, monkeypatch):
+    """Test that a writer can't modify the export the other writers see."""
+    def tampering_writer(data, path):
+        data['recommendations'][0]['source']['year'] = 1900
+    monkeypatch.setattr(io, 'registry_to_markdown', tampering_writer)
+    with pytest.raises(TypeError, match="read-only"):
+        write_outputs(sample_registry, [tmp_path / "REGISTRY.md", tmp_path / "registry.yaml"])
+    assert load_registry(tmp_path / "registry.yaml")['recommendations'][0]['source']['year'] == 2020
+
+@pytest.mark.parametrize("name", ["registry.yaml", "registry.jsonl", "registry.jsonl.gz",
+                                  "registry.mlrsnap", "registry.sqlite", "REGISTRY.md"])
+def test_unchanged_outputs_are_not_rewritten(sample_registry, tmp_path, name):
+    """Test that rewriting identical content leaves the file untouched."""
+    path = tmp_path / name
+    data = sample_registry.export_registry()
+    write = registry_to_markdown if name.endswith('.md') else save_registry
+    assert write(data, path)
+    inode = path.stat().st_ino
+    
+    assert not write(data, path)
+    assert path.stat().st_ino == inode
+    assert sorted(tmp_path.iterdir()) == [path]
+
+    data['recommendations'][0]['recommendation'] = "Changed recommendation"
+    assert write(data, path)
+    assert path.stat().st_ino != inode
+
 def test_nonexistent_file():
     """Test handling of nonexistent files."""
     with pytest.raises(FileNotFoundError):
@@ -0,0 +1,82 @@
+# tests/registry/test_query.py
+"""Tests for the composable registry query API."""
+
+import pytest
+
+from scripts.registry.types import MLRStatus
+from scripts.registry.recommendations import RecommendationRegistry
+from scripts.registry.identifiers import MLRIdentifierRegistry
+
+@pytest.fixture(params=[False, True], ids=["dict", "compact"])
+def registry(request, tmp_path):
+    """Provide a small registry in both storage modes."""
+    registry = RecommendationRegistry(MLRIdentifierRegistry(tmp_path / "ids.json"), compact=request.param)
+    rows = [
+        ("attention", "Use flash attention", "Dao", 2022, False, ["llama2"]),
+        ("attention", "Use rotary embeddings", "Su", 2021, False, ["llama2", "gpt-neox"]),
+        ("attention", "Use sliding windows", "Beltagy", 2020, True, ["llama2"]),
+        ("attention", "Use grouped query attention", "Ainslie", 2023, False, []),
+        ("optimization", "Use AdamW", "Loshchilov", 2019, False, ["llama2"]),
+    ]
+    for topic, text, author, year, experimental, models in rows:
+        registry.add_recommendation(topic, text, author, f"{author} et al. ({year})", year,
+                                    experimental=experimental, implementations=models)
+    return registry
+
+def texts(recs):
+    return [rec.recommendation for rec in recs]
+
+def test_chained_filters(registry):
+    """Test that indexed filters combine as an intersection."""
+    query = (registry.query().topic("attention").status("standard")
+             .year_between(2020, 2024).implemented_in("llama2"))
+    assert texts(query) == ["Use flash attention", "Use rotary embeddings"]
+    assert query.count() == 2
+
+def test_default_order_is_insertion_order(registry):
+    """Test that unordered results follow registry insertion order."""
+    assert texts(registry.query().implemented_in("llama2")) == [
+        "Use flash attention", "Use rotary embeddings", "Use sliding windows", "Use AdamW"
+    ]
+    assert registry.query().count() == 5
+
+def test_order_limit_offset(registry):
+    """Test ordering with pagination."""
+    query = registry.query().topic("attention").order_by("year", descending=True)
+    assert [r.source.year for r in query.offset(1).limit(2)] == [2022, 2021]
+    assert query.count() == 2
+
+    ascending = registry.query().implemented_in("llama2").order_by("year")
+    assert [r.source.year for r in ascending] == [2019, 2020, 2021, 2022]
+    assert [r.source.year for r in registry.query().order_by("year", descending=True)] == \
+        [2023, 2022, 2021, 2020, 2019]
+
+    by_text = registry.query().status(MLRStatus.STANDARD).order_by("recommendation").limit(1)
+    assert texts(by_text) == ["Use AdamW"]
+
+def test_where_and_empty_results(registry):
+    """Test custom predicates and filters that match nothing."""
+    query = registry.query().topic("attention").where(lambda rec: "embeddings" in rec.recommendation)
+    assert query.ids() == [registry.query().year(2021).first().id]
+    assert registry.query().topic("missing").first() is None
+    assert registry.query().implemented_in("gpt2").status("standard").all() == []
+
+def test_narrow_queries_do_not_scan_indexes(registry):
+    """Test that year ranges and year ordering only touch the matching IDs."""
+    for year in range(1900, 2000):
+        registry.add_recommendation("history", f"Note {year}", "Old", f"Old et al. ({year})", year)
+    scanned = []
+    class TrackingIndex(dict):
+        def __getitem__(self, year):
+            scanned.append(year)
+            return dict.__getitem__(self, year)
+        def __iter__(self):
+            scanned.extend(dict.keys(self))
+            return dict.__iter__(self)
+    registry.year_index = TrackingIndex(registry.year_index)
+
+    query = registry.query().year_between(2020, 2021).order_by("year", descending=True)
+    assert [r.source.year for r in query] == [2021, 2020]
+    assert [r.source.year for r in registry.query().topic("attention").order_by("year")] == \
+        [2020, 2021, 2022, 2023]
+    assert scanned == []
@@ -6,7 +6,7 @@ from pathlib import Path
 from datetime import datetime
 
 from scripts.registry.types import MLRStatus, Recommendation, Source, Evidence
-from scripts.registry.recommendations import RecommendationRegistry, generate_topic_id
+from scripts.registry.recommendations import RecommendationRegistry, generate_topic_id, generate_topic_ids
 from scripts.registry.identifiers import MLRIdentifierRegistry
 
 @pytest.fixture
@@ -26,6 +26,13 @@ def test_topic_id_generation():
     topic_id = generate_topic_id(topic, rec)
     assert topic_id == "optimization/use-gradient-clipping-with-dynamic"
 
+def test_bulk_topic_id_generation():
+    """Test that bulk topic IDs match one-at-a-time generation."""
+    pairs = [("Optimization", "Use gradient clipping with dynamic threshold"),
+             ("Data Mixing", "Up-sample code (x2) & math!"),
+             ("Optimization", "Warm up")]
+    assert generate_topic_ids(pairs) == [generate_topic_id(*pair) for pair in pairs]
+
 def test_add_standard_recommendation(registry):
     """Test adding a standard recommendation."""
     mlr_id = registry.add_recommendation(
@@ -123,6 +130,71 @@ def test_get_recommendations_by_topic(registry):
     # Check sorting by year
     assert recs[0].source.year < recs[1].source.year
 
+def test_topic_order_with_out_of_order_years(registry):
+    """Test that topic lists stay sorted by year regardless of insertion order."""
+    for year in (2022, 2019, 2021, 2019):
+        registry.add_recommendation(
+            topic="optimization",
+            recommendation=f"Rec from {year}",
+            first_author="Smith",
+            source_paper=f"Smith et al. ({year})",
+            year=year,
+            experimental=(year == 2021)
+        )
+    
+    recs = registry.get_recommendations_by_topic("optimization")
+    assert [rec.source.year for rec in recs] == [2019, 2019, 2021, 2022]
+    
+    experimental = registry.get_recommendations_by_topic("optimization", MLRStatus.EXPERIMENTAL)
+    assert [rec.source.year for rec in experimental] == [2021]
+    
+    years = registry.export_registry()['topics']['optimization']['years']
+    assert years == {'earliest': 2019, 'latest': 2022}
+    assert registry.get_recommendations_by_topic("missing") == []
+    assert "missing" not in registry.get_topics()
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_topic_status_filter_stays_within_topic(id_registry, compact):
+    """Test that filtering a topic by status doesn't go through the status index."""
+    registry = RecommendationRegistry(id_registry, compact=compact)
+    for i, topic in enumerate(["optimization", "attention", "optimization"]):
+        registry.add_recommendation(topic, f"Rec {i}", "Smith", "Smith et al. (2020)", 2020,
+                                    experimental=(i == 2))
+    registry.status_index = None
+
+    standard = registry.get_recommendations_by_topic("optimization", MLRStatus.STANDARD)
+    assert [rec.recommendation for rec in standard] == ["Rec 0"]
+    experimental = registry.get_recommendations_by_topic("optimization", "experimental")
+    assert [rec.recommendation for rec in experimental] == ["Rec 2"]
+
+def test_secondary_indexes(registry):
+    """Test lookups by year, paper, implementation and arXiv ID."""
+    first = registry.add_recommendation(
+        topic="optimization",
+        recommendation="Rec 1",
+        first_author="Smith",
+        source_paper="Smith et al. (2020)",
+        year=2020,
+        arxiv_id="2001.12345",
+        implementations=["llama2", "gpt2"]
+    )
+    second = registry.add_recommendation(
+        topic="attention",
+        recommendation="Rec 2",
+        first_author="Jones",
+        source_paper="Jones et al. (2021)",
+        year=2021,
+        implementations=["llama2"]
+    )
+    
+    paper_id = registry.get_recommendation_by_mlr(first).source.paper_id
+    assert [r.id for r in registry.get_recommendations_by_year(2020)] == [first]
+    assert [r.id for r in registry.get_recommendations_by_paper(paper_id)] == [first]
+    assert [r.id for r in registry.get_recommendations_by_arxiv_id("2001.12345")] == [first]
+    assert [r.id for r in registry.get_recommendations_by_implementation("llama2")] == [first, second]
+    assert [r.id for r in registry.get_recommendations_by_implementation("gpt2")] == [first]
+    assert registry.get_recommendations_by_year(1999) == []
+
 # def test_topic_stats(registry):
 #     """Test topic statistics generation."""
 #     # Add recommendations with different statuses
@@ -212,3 +284,92 @@ def test_registry_export(registry):
     assert 'attention' in exported['topics']
     assert exported['topics']['optimization']['count'] == 1
     assert exported['topics']['attention']['count'] == 1
+
+def test_parallel_build_matches_serial(tmp_path, monkeypatch, sample_research_yaml):
+    """Test that drafting shards in worker processes gives identical output."""
+    from scripts.registry.recommendations import build_registry_from_yaml
+    exports = []
+    for workers in (None, 2):
+        # Each build gets a fresh default identifier file
+        workdir = tmp_path / f"workers-{workers}"
+        workdir.mkdir()
+        monkeypatch.chdir(workdir)
+        exports.append(build_registry_from_yaml(sample_research_yaml, max_workers=workers).export_registry())
+    assert exports[0] == exports[1]
+
+def test_bulk_add_matches_sequential(tmp_path):
+    """Test that add_recommendations gives the same registry as repeated add_recommendation."""
+    records = [
+        dict(topic="optimization", recommendation=f"Rec {i} from {year}", first_author=author,
+             source_paper=f"{author} et al. ({year})", year=year, arxiv_id=f"{year}.{i:05d}",
+             experimental=i % 3 == 0, implementations=["llama"] if i % 2 else None)
+        for i, (author, year) in enumerate([("Smith", 2022), ("Jones", 2019), ("Smith", 2021),
+                                            ("Lee", 2019), ("Jones", 2023)])
+    ]
+    records[2]['topic'] = "attention"
+    records[4]['topic_id'] = "custom/topic-id"
+
+    sequential = RecommendationRegistry(MLRIdentifierRegistry(tmp_path / "sequential.json"))
+    sequential.add_recommendation(**records[0])
+    for record in records[1:]:
+        sequential.add_recommendation(**record)
+
+    bulk = RecommendationRegistry(MLRIdentifierRegistry(tmp_path / "bulk.json"))
+    # A second bulk add has to merge into topic lists that are already populated
+    assert bulk.add_recommendations(records[:1]) == list(sequential.recommendations)[:1]
+    mlr_ids = bulk.add_recommendations(iter(records[1:]))
+
+    assert mlr_ids == list(sequential.recommendations)[1:]
+    assert bulk.export_registry() == sequential.export_registry()
+    for index in ('topic_to_recommendations', 'status_index', 'year_index', 'paper_index',
+                  'implementation_index', 'arxiv_index'):
+        assert getattr(bulk, index) == getattr(sequential, index)
+    assert bulk.get_recommendation_by_mlr(mlr_ids[-1]).topic_id == "custom/topic-id"
+    assert (tmp_path / "bulk.json").read_text() == (tmp_path / "sequential.json").read_text()
+
+def test_bulk_add_rolls_back_on_error(registry):
+    """Test that a failing bulk add leaves the registry and identifiers untouched."""
+    good = dict(topic="optimization", recommendation="Good", first_author="Smith",
+                source_paper="Smith et al. (2020)", year=2020)
+    with pytest.raises(TypeError):
+        registry.add_recommendations([good, {**good, 'unknown_field': 1}])
+    assert len(registry.recommendations) == 0
+    assert registry.add_recommendations([good]) == ["MLR-2020-Smith001-0001"]
+
+def test_topic_id_collisions_are_disambiguated(registry):
+    """Test that colliding topic IDs get deterministic suffixes and stay unique."""
+    common = dict(topic="optimization", first_author="Smith", source_paper="Smith et al. (2020)", year=2020)
+    # Both truncate to the same five-word slug
+    first = registry.add_recommendation(recommendation="Use gradient clipping with threshold 1.0", **common)
+    second = registry.add_recommendation(recommendation="Use gradient clipping with threshold 0.5", **common)
+    # A natural slug that happens to look like a suffixed one
+    natural = registry.add_recommendation(recommendation="x", **common,
+                                          topic_id="optimization/use-gradient-clipping-with-threshold-3")
+    bulk = registry.add_recommendations([
+        dict(recommendation="Use gradient clipping with threshold 2.0", **common),
+        dict(recommendation="Use gradient clipping with threshold 3.0", **common),
+    ])
+
+    topic_ids = [registry.get_recommendation_by_mlr(mlr_id).topic_id for mlr_id in [first, second, natural, *bulk]]
+    base = "optimization/use-gradient-clipping-with-threshold"
+    assert topic_ids == [base, f"{base}-2", f"{base}-3", f"{base}-4", f"{base}-5"]
+    for mlr_id, topic_id in zip([first, second, natural, *bulk], topic_ids):
+        assert registry.get_recommendation_by_topic_id(topic_id).id == mlr_id
+    assert registry.get_recommendation_by_topic_id("optimization/missing") is None
+
+def test_restored_topic_ids_are_kept(tmp_path):
+    """Test that a rebuild from exported records keeps disambiguated topic IDs."""
+    original = RecommendationRegistry(MLRIdentifierRegistry(tmp_path / "ids.json"))
+    original.add_recommendations(
+        dict(topic="attention", recommendation="Use flash attention", first_author="Jones",
+             source_paper="Jones et al. (2021)", year=2021, experimental=experimental)
+        for experimental in (False, True)
+    )
+    exported = original.export_registry()['recommendations']
+    assert [rec['topic_id'] for rec in exported] == ["attention/use-flash-attention", "attention/use-flash-attention-2"]
+
+    restored = RecommendationRegistry(MLRIdentifierRegistry(tmp_path / "restored.json"))
+    for rec in reversed(exported):
+        restored.restore_recommendation(Recommendation.from_dict(rec))
+    assert restored.get_recommendation_by_topic_id("attention/use-flash-attention-2").id == exported[1]['id']
+    assert restored.get_recommendation_by_topic_id("attention/use-flash-attention").id == exported[0]['id']
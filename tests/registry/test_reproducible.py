@@ -0,0 +1,60 @@
+# tests/registry/test_reproducible.py
+"""Tests for reproducible registry builds."""
+
+import copy
+import os
+import subprocess
+
+from scripts.registry.identifiers import MLRIdentifierRegistry
+from scripts.registry.incremental import build_registry_incremental
+from scripts.registry.io import save_registry
+from scripts.registry.reproducible import source_date
+
+def build(directory, data, build_date):
+    """Build with a fresh identifier registry, as a clean CI checkout would."""
+    id_registry = MLRIdentifierRegistry(directory / "ids.json")
+    registry, _ = build_registry_incremental(data, id_registry=id_registry, build_date=build_date)
+    return registry
+
+def test_builds_are_byte_identical(tmp_path, sample_research_yaml):
+    """Test that two builds from the same data with a fixed date write identical files."""
+    for name in ("a", "b"):
+        registry = build(tmp_path / name, sample_research_yaml, "2024-01-02")
+        save_registry(registry, tmp_path / f"{name}.yaml")
+    assert (tmp_path / "a.yaml").read_bytes() == (tmp_path / "b.yaml").read_bytes()
+    assert registry.export_registry()['metadata']['last_updated'] == "2024-01-02"
+
+def test_content_hash_tracks_content(tmp_path, sample_research_yaml):
+    """Test that the content hash is stable across builds and changes with the content."""
+    first = build(tmp_path / "first", sample_research_yaml, "2024-01-02").export_registry()
+    again = build(tmp_path / "again", sample_research_yaml, "2024-01-02").export_registry()
+    assert first['metadata']['content_hash'].startswith("sha256:")
+    assert first['metadata']['content_hash'] == again['metadata']['content_hash']
+
+    data = copy.deepcopy(sample_research_yaml)
+    data["2020"][0]["sota"].append("Warm up the learning rate")
+    changed = build(tmp_path / "changed", data, "2024-01-02").export_registry()
+    assert changed['metadata']['content_hash'] != first['metadata']['content_hash']
+
+def test_source_date_epoch(tmp_path, monkeypatch):
+    """Test that SOURCE_DATE_EPOCH takes precedence over the inputs."""
+    path = tmp_path / "research.yaml"
+    path.write_text("{}")
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    assert source_date([path]) == "2023-11-14"
+
+def test_source_date_from_git(tmp_path, monkeypatch):
+    """Test that a committed input is dated by its last commit, and an edited one by its mtime."""
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    path = tmp_path / "research.yaml"
+    path.write_text("{}")
+    env = {"GIT_COMMITTER_DATE": "2021-03-04T12:00:00+00:00", "GIT_AUTHOR_DATE": "2021-03-04T12:00:00+00:00"}
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["add", "research.yaml"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "data"], cwd=tmp_path, check=True,
+                   env={**os.environ, **env})
+    assert source_date([path]) == "2021-03-04"
+
+    path.write_text("{2020: []}")
+    assert source_date([path]) != "2021-03-04"
@@ -0,0 +1,53 @@
+# tests/registry/test_shards.py
+"""Tests for sharded research data directories."""
+
+import pytest
+import yaml
+
+from scripts.registry.io import load_research_yaml, RegistryDataError
+from scripts.registry.shards import write_research_shards
+
+def test_shards_round_trip(tmp_path, sample_research_yaml):
+    """Test that per-year shards load back to the original data."""
+    write_research_shards(sample_research_yaml, tmp_path / "research")
+    data = load_research_yaml(tmp_path / "research")
+    assert data == {int(year): papers for year, papers in sample_research_yaml.items()}
+
+def test_unchanged_shards_are_not_rewritten(tmp_path, sample_research_yaml):
+    """Test that only shards whose year changed are written again."""
+    shard_dir = tmp_path / "research"
+    report = write_research_shards(sample_research_yaml, shard_dir)
+    assert report.written == [shard_dir / "2020.yaml", shard_dir / "2021.yaml"]
+    inode = (shard_dir / "2020.yaml").stat().st_ino
+
+    sample_research_yaml["2021"][0]["title"] = "Renamed Paper"
+    report = write_research_shards(sample_research_yaml, shard_dir)
+    assert report.written == [shard_dir / "2021.yaml"]
+    assert report.unchanged == [shard_dir / "2020.yaml"]
+    assert (shard_dir / "2020.yaml").stat().st_ino == inode
+
+def test_mixed_shard_layouts(tmp_path, sample_research_yaml):
+    """Test combining year shards and single-paper shards deterministically."""
+    shard_dir = tmp_path / "research"
+    (shard_dir / "2021").mkdir(parents=True)
+    first, second = sample_research_yaml["2021"]
+    (shard_dir / "2021" / "b.yaml").write_text(yaml.safe_dump(second))
+    (shard_dir / "2021" / "a.yml").write_text(yaml.safe_dump(first))
+    (shard_dir / "2020.yaml").write_text(yaml.safe_dump({"2020": sample_research_yaml["2020"]}))
+    (shard_dir / "notes.txt").write_text("ignored")
+
+    data = load_research_yaml(shard_dir, cache_dir=tmp_path / "cache")
+    assert list(data) == [2020, 2021]
+    assert [p["title"] for p in data[2021]] == ["Test Paper 2", "Test Paper 3"]
+
+def test_invalid_shards(tmp_path, sample_research_yaml):
+    """Test that malformed shards are reported."""
+    shard_dir = tmp_path / "research"
+    shard_dir.mkdir()
+    (shard_dir / "bad.yaml").write_text(yaml.safe_dump(["not", "a", "mapping"]))
+    with pytest.raises(RegistryDataError, match="bad.yaml"):
+        load_research_yaml(shard_dir)
+
+    (shard_dir / "bad.yaml").write_text(yaml.safe_dump({"2020": "not a list"}))
+    with pytest.raises(RegistryDataError, match="must be a list"):
+        load_research_yaml(shard_dir)
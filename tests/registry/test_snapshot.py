@@ -0,0 +1,57 @@
+# tests/registry/test_snapshot.py
+"""Tests for the binary registry snapshot format."""
+
+import pytest
+
+from scripts.registry.io import save_registry, load_registry
+from scripts.registry.recommendations import RecommendationRegistry
+from scripts.registry.snapshot import RegistrySnapshot, SnapshotFormatError
+
+@pytest.fixture
+def snapshot_path(populated_registry, tmp_path):
+    """Save the populated registry as a snapshot."""
+    path = tmp_path / "registry.mlrsnap"
+    save_registry(populated_registry, path)
+    return path
+
+def test_round_trip(populated_registry, snapshot_path):
+    """Test that load_registry returns the original export."""
+    data = load_registry(snapshot_path)
+    expected = populated_registry.export_registry()
+    assert data['recommendations'] == expected['recommendations']
+    assert data['topics'] == expected['topics']
+    assert data['metadata'] == expected['metadata']
+
+def test_lazy_access(populated_registry, snapshot_path):
+    """Test access by position and by MLR ID."""
+    recs = list(populated_registry.recommendations.values())
+    with RegistrySnapshot(snapshot_path) as snapshot:
+        assert len(snapshot) == len(recs)
+        assert snapshot[0] == recs[0]
+        assert snapshot[-1] == recs[-1]
+        assert snapshot.ids() == [rec.id for rec in recs]
+        for rec in recs:
+            assert rec.id in snapshot
+            assert snapshot.get_recommendation_by_mlr(rec.id) == rec
+        assert snapshot.get_recommendation_by_mlr("MLR-1999-Nobody001-0001") is None
+        with pytest.raises(IndexError):
+            snapshot.record(len(recs))
+
+def test_empty_registry(tmp_path):
+    """Test that an empty registry produces a valid snapshot."""
+    path = tmp_path / "empty.mlrsnap"
+    save_registry(RecommendationRegistry(), path)
+    with RegistrySnapshot(path) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.ids() == []
+        assert "anything" not in snapshot
+
+def test_rejects_other_files(tmp_path):
+    """Test that non-snapshot files are refused."""
+    path = tmp_path / "bogus.mlrsnap"
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(SnapshotFormatError):
+        RegistrySnapshot(path)
+    path.write_bytes(b"")
+    with pytest.raises(SnapshotFormatError):
+        RegistrySnapshot(path)
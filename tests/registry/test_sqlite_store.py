@@ -0,0 +1,60 @@
+# tests/registry/test_sqlite_store.py
+"""Tests for the SQLite registry storage engine."""
+
+import pytest
+
+from scripts.registry.io import save_registry, load_registry
+from scripts.registry.identifiers import MLRIdentifierRegistry
+from scripts.registry.recommendations import build_registry_from_yaml
+from scripts.registry.sqlite_store import SQLiteRegistry, SQLiteIdentifierStore
+from scripts.registry.types import MLRStatus
+
+@pytest.fixture
+def sqlite_path(populated_registry, tmp_path):
+    """Save the populated registry to a SQLite file."""
+    path = tmp_path / "registry.sqlite"
+    save_registry(populated_registry, path)
+    return path
+
+def test_sqlite_round_trip(populated_registry, sqlite_path):
+    """Test that loading a SQLite registry matches the in-memory export."""
+    assert load_registry(sqlite_path) == populated_registry.export_registry()
+
+def test_sqlite_queries_match_registry(populated_registry, sqlite_path):
+    """Test that indexed queries agree with the in-memory registry."""
+    with SQLiteRegistry(sqlite_path) as db:
+        assert len(db) == len(populated_registry.recommendations)
+        assert db.get_topics() == populated_registry.get_topics()
+        for status in MLRStatus:
+            assert db.get_recommendations_by_status(status) == \
+                populated_registry.get_recommendations_by_status(status)
+        for topic in populated_registry.get_topics():
+            assert db.get_recommendations_by_topic(topic) == \
+                populated_registry.get_recommendations_by_topic(topic)
+        
+        mlr_id = next(iter(populated_registry.recommendations))
+        assert db.get_recommendation_by_mlr(mlr_id) == populated_registry.get_recommendation_by_mlr(mlr_id)
+        assert db.get_recommendation_by_mlr("MLR-0000-None000-0000") is None
+        assert {r.source.arxiv_id for r in db.get_recommendations_by_arxiv_id("2020.12345")} == {"2020.12345"}
+
+def test_sqlite_query_uses_index(sqlite_path):
+    """Test that topic lookups are planned against an index."""
+    with SQLiteRegistry(sqlite_path) as db:
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM recommendations WHERE topic = ?", ("attention",)
+        ).fetchall()
+    assert any("idx_recommendations_topic" in row[-1] for row in plan)
+
+def test_sqlite_identifier_store(tmp_path, sample_research_yaml):
+    """Test identifier counters persisted alongside a saved registry."""
+    path = tmp_path / "registry.sqlite"
+    ids = MLRIdentifierRegistry(store=SQLiteIdentifierStore(path))
+    ids.get_paper_id("Smith", 2020, "2020.12345")
+    ids.generate_id(2020, "Smith001")
+    
+    registry = build_registry_from_yaml(sample_research_yaml, id_registry=MLRIdentifierRegistry(tmp_path / "ids.json"))
+    save_registry(registry, path)
+    
+    reloaded = MLRIdentifierRegistry(store=SQLiteIdentifierStore(path))
+    assert reloaded.get_paper_id("Smith", 2020, "2020.12345") == "Smith001"
+    assert reloaded.generate_id(2020, "Smith001") == "MLR-2020-Smith001-0002"
@@ -0,0 +1,70 @@
+# tests/registry/test_streaming.py
+"""Tests for streaming JSONL registry I/O."""
+
+import gzip
+
+import pytest
+
+from scripts.registry.io import save_registry, load_registry
+from scripts.registry.streaming import RegistryWriter, iter_registry, iter_registry_records
+
+@pytest.mark.parametrize("name", ["registry.jsonl", "registry.jsonl.gz"])
+def test_save_and_iterate(populated_registry, tmp_path, name):
+    """Test that a saved registry streams back record by record."""
+    path = tmp_path / name
+    save_registry(populated_registry, path)
+
+    recs = list(iter_registry(path))
+    assert recs == list(populated_registry.recommendations.values())
+    assert load_registry(path)['recommendations'] == [rec.to_dict() for rec in recs]
+
+def test_gzip_output_is_compressed(populated_registry, tmp_path):
+    """Test that .jsonl.gz files are really gzip files."""
+    path = tmp_path / "registry.jsonl.gz"
+    save_registry(populated_registry, path)
+    with gzip.open(path, 'rt') as f:
+        assert len(f.readlines()) == len(populated_registry.recommendations)
+
+@pytest.mark.parametrize("name", ["registry.jsonl", "registry.jsonl.gz"])
+def test_identical_rewrite_is_skipped(populated_registry, tmp_path, name):
+    """Test that writing the same records again leaves the file alone."""
+    path = tmp_path / name
+    for expected in (True, False):
+        with RegistryWriter(path) as writer:
+            writer.write_all(populated_registry.recommendations.values())
+        assert writer.changed is expected
+    assert sorted(tmp_path.iterdir()) == [path]
+
+def test_zstd_round_trip(populated_registry, tmp_path):
+    """Test zstd-compressed registries when zstandard is installed."""
+    pytest.importorskip("zstandard")
+    path = tmp_path / "registry.jsonl.zst"
+    save_registry(populated_registry, path)
+    assert list(iter_registry(path)) == list(populated_registry.recommendations.values())
+
+def test_writer_is_atomic(populated_registry, tmp_path):
+    """Test that a failed write leaves the previous file in place."""
+    path = tmp_path / "registry.jsonl"
+    save_registry(populated_registry, path)
+    before = path.read_text()
+
+    with pytest.raises(RuntimeError):
+        with RegistryWriter(path) as writer:
+            writer.write(next(iter(populated_registry.recommendations.values())))
+            raise RuntimeError("interrupted")
+
+    assert path.read_text() == before
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+def test_writer_to_stdout(populated_registry, capsys):
+    """Test writing to stdout with the '-' path."""
+    with RegistryWriter("-") as writer:
+        count = writer.write_all(populated_registry.recommendations.values())
+    assert count == len(populated_registry.recommendations)
+    assert len(capsys.readouterr().out.splitlines()) == count
+
+def test_missing_file(tmp_path):
+    """Test that reading a missing registry fails lazily with FileNotFoundError."""
+    records = iter_registry_records(tmp_path / "missing.jsonl")
+    with pytest.raises(FileNotFoundError):
+        next(records)
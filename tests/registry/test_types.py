@@ -0,0 +1,66 @@
+# tests/registry/test_types.py
+"""Tests for registry type serialization."""
+
+import pytest
+from omegaconf import OmegaConf
+from omegaconf.errors import MissingMandatoryValue, ValidationError
+
+from scripts.registry.types import MLRStatus, Recommendation, Source, Evidence
+
+@pytest.fixture
+def source_dict():
+    """Provide a serialized source."""
+    return {
+        'paper': "Smith et al. (2020)",
+        'paper_id': "Smith001",
+        'year': 2020,
+        'first_author': "Smith",
+    }
+
+def test_source_round_trip(source_dict):
+    """Test that None values are omitted and fields round trip."""
+    source = Source.from_dict(source_dict)
+    assert source.arxiv_id is None
+    assert source.to_dict() == source_dict
+    assert Source.from_dict(OmegaConf.create(source_dict)) == source
+
+def test_missing_fields_serialize_as_missing():
+    """Test that unset fields keep OmegaConf's MISSING marker."""
+    assert Evidence(paper="Jones et al. (2021)").to_dict() == {
+        'paper': "Jones et al. (2021)", 'paper_id': '???', 'year': '???'
+    }
+
+def test_numeric_arxiv_id_is_stringified(source_dict):
+    """Test that unquoted YAML arXiv IDs are stored as strings."""
+    source = Source.from_dict({**source_dict, 'arxiv_id': 1910.02054})
+    assert source.to_dict()['arxiv_id'] == '1910.02054'
+
+def test_validation_is_opt_in(source_dict):
+    """Test that schema checks only run when requested."""
+    bad = {**source_dict, 'year': "not a year"}
+    assert Source.from_dict(bad).year == "not a year"
+    with pytest.raises(ValidationError):
+        Source.from_dict(bad, validate=True)
+    with pytest.raises(MissingMandatoryValue):
+        Evidence(paper="Jones et al. (2021)").to_dict(validate=True)
+
+def test_recommendation_to_dict(source_dict):
+    """Test recommendation serialization with plain containers."""
+    rec = Recommendation.create(
+        id="MLR-2020-Smith001-0001",
+        recommendation="Use gradient clipping",
+        topic="optimization",
+        topic_id="optimization/use-gradient-clipping",
+        source=source_dict,
+        status=MLRStatus.STANDARD,
+        supporting_evidence=[{'paper': "Jones et al. (2021)", 'paper_id': "Jones001", 'year': 2021}],
+        implementations=OmegaConf.create(["llama2"])
+    )
+    data = rec.to_dict(validate=True)
+    assert list(data) == [
+        'id', 'recommendation', 'topic', 'topic_id', 'source',
+        'status', 'supporting_evidence', 'implementations'
+    ]
+    assert data['status'] == "standard"
+    assert type(data['implementations']) is list
+    assert data['supporting_evidence'] == [{'paper': "Jones et al. (2021)", 'paper_id': "Jones001", 'year': 2021}]
@@ -0,0 +1,68 @@
+# tests/registry/test_validation.py
+"""Tests for research data validation."""
+
+import copy
+
+import pytest
+import yaml
+
+from scripts.registry.io import load_research_yaml, validate_paper_entry, RegistryDataError
+from scripts.registry.validation import validate_research_data
+
+@pytest.fixture
+def broken_data(sample_research_yaml):
+    """Sample data with one problem of every strict kind."""
+    data = copy.deepcopy(sample_research_yaml)
+    data["2020"][0]["year"] = 2019
+    data["2020"][0]["sota"].append(42)
+    data["2021"][0]["topics"] = []
+    data["2021"][0]["arxiv_id"] = data["2020"][0]["arxiv_id"]
+    data["2021"][1]["arxiv_id"] = 2021.5
+    return data
+
+def test_sample_data_passes_strict(sample_research_yaml):
+    """Test that valid data produces an empty report."""
+    sample_research_yaml["2021"][1]["attic"]["superseded_by"] = "2021.67890"
+    report = validate_research_data(sample_research_yaml, strict=True)
+    assert report
+    assert len(report) == 0
+
+def test_basic_checks_ignore_strict_problems(broken_data):
+    """Test that the default checks only cover structure and required fields."""
+    assert validate_research_data(broken_data)
+
+def test_strict_collects_every_problem(broken_data):
+    """Test that all problems are reported together."""
+    messages = [issue.message for issue in validate_research_data(broken_data, strict=True).issues]
+    assert any("doesn't match container year" in m for m in messages)
+    assert any("non-string SOTA" in m for m in messages)
+    assert any("empty topics" in m for m in messages)
+    assert any("duplicate arxiv_id 2020.12345" in m for m in messages)
+    assert any("should be a quoted string" in m for m in messages)
+    assert any("superseded_by 2021.99999" in m for m in messages)
+    assert len(messages) == 6
+
+def test_process_pool_matches_serial(broken_data):
+    """Test that sharded validation gives the same report."""
+    serial = validate_research_data(broken_data, strict=True)
+    parallel = validate_research_data(broken_data, strict=True, max_workers=2)
+    assert parallel.issues == serial.issues
+
+def test_load_reports_all_errors(tmp_path, broken_data):
+    """Test that loading fails once with every problem listed."""
+    del broken_data["2020"][0]["title"]
+    del broken_data["2021"][0]["first_author"]
+    path = tmp_path / "research.yaml"
+    path.write_text(yaml.safe_dump(broken_data))
+
+    with pytest.raises(RegistryDataError, match="2 problem"):
+        load_research_yaml(path)
+    with pytest.raises(RegistryDataError, match="8 problem"):
+        load_research_yaml(path, strict=True)
+
+def test_validate_paper_entry_strict():
+    """Test that single-entry validation honours strict mode."""
+    paper = {"title": "T", "first_author": "A", "year": "2020", "topics": ["x"]}
+    validate_paper_entry(paper, "2020")
+    with pytest.raises(RegistryDataError, match="invalid type for year"):
+        validate_paper_entry(paper, "2020", strict=True)
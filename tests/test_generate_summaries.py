@@ -0,0 +1,259 @@
+import os
+import time
+from pathlib import Path
+import pytest
+from scripts.generate_summaries import generator
+from scripts.generate_summaries.filters import SummaryFilter
+from scripts.generate_summaries.generator import SummaryGenerator
+from scripts.generate_summaries.prefetch import Prefetcher
+from scripts.generate_summaries.special_summaries import generate_special_summaries
+
+@pytest.fixture
+def summary_tree(temp_dir):
+    """Create a small project tree to summarize"""
+    for rel_path, content in {
+        "README.md": "# Project\n",
+        "a/b/f.py": "x = 1\n",
+        "a-c/g.md": "notes\n",
+        "a/b/deep/h.txt": "deep\n",
+        "a/image.png": "not text",
+        ".venv/lib/v.py": "ignored\n",
+        ".github/workflows/ci.yml": "ignored\n",
+    }.items():
+        path = temp_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    # Old enough that the manifest can trust their mtimes
+    past = time.time() - 60
+    for path in temp_dir.rglob("*"):
+        os.utime(path, (past, past))
+    return temp_dir
+
+def headers(summary: str) -> list[str]:
+    return [line[len("File: "):] for line in summary.splitlines() if line.startswith("File: ")]
+
+def test_generate_all_summaries(summary_tree):
+    """Test which directories get summaries and which files each one covers"""
+    files = SummaryGenerator(summary_tree).generate_all_summaries()
+    assert [f.relative_to(summary_tree) for f in files] == [
+        Path("SUMMARY"), Path("a/b/SUMMARY"), Path("a/b/deep/SUMMARY"), Path("a-c/SUMMARY")
+    ]
+    # Entries sort by path component, so a/ comes before a-c/
+    assert headers((summary_tree / "SUMMARY").read_text()) == [
+        "README.md", "a/b/deep/h.txt", "a/b/f.py", "a-c/g.md"
+    ]
+    assert headers((summary_tree / "a/b/SUMMARY").read_text()) == ["a/b/deep/h.txt", "a/b/f.py"]
+    assert (summary_tree / "a/b/deep/SUMMARY").read_text() == "\n".join(
+        ["=" * 80, "File: a/b/deep/h.txt", "=" * 80, "deep\n", "\n"]
+    )
+    assert SummaryGenerator(summary_tree).generate_directory_summary(summary_tree / "a") == \
+        (summary_tree / "a/b/SUMMARY").read_text()
+
+def test_files_are_read_once(summary_tree, monkeypatch):
+    """Test that nested files are read once, not once per enclosing summary"""
+    reads = track_reads(monkeypatch)
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    assert len(reads) == len(set(reads)) == 4
+
+def track_reads(monkeypatch) -> list[Path]:
+    """Record the summarized files the generator opens"""
+    reads = []
+    def tracking_open(file, *args, **kwargs):
+        if not Path(file).name.startswith(("SUMMARY", ".SUMMARY")):
+            reads.append(Path(file))
+        return open(file, *args, **kwargs)
+    monkeypatch.setattr(generator, "open", tracking_open, raising=False)
+    return reads
+
+def summaries(root: Path) -> dict[Path, str]:
+    return {p.relative_to(root): p.read_text() for p in root.rglob("SUMMARY")}
+
+def test_unchanged_tree_is_not_read(summary_tree, monkeypatch):
+    """Test that a second run over an unchanged tree reads and writes nothing"""
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    before = {p: p.stat().st_mtime_ns for p in summary_tree.rglob("SUMMARY")}
+    reads = track_reads(monkeypatch)
+    files = SummaryGenerator(summary_tree).generate_all_summaries()
+    assert len(files) == 4
+    assert reads == []
+    assert {p: p.stat().st_mtime_ns for p in summary_tree.rglob("SUMMARY")} == before
+
+def test_only_changed_subtrees_are_rebuilt(summary_tree, monkeypatch):
+    """Test that a change rebuilds the enclosing summaries, reusing the others"""
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    (summary_tree / "a/b/deep/h.txt").write_text("deeper\n")
+    (summary_tree / "a/b/new.md").write_text("new\n")
+    (summary_tree / "a/b/f.py").unlink()
+    a_c_mtime = (summary_tree / "a-c/SUMMARY").stat().st_mtime_ns
+    reads = track_reads(monkeypatch)
+    SummaryGenerator(summary_tree).generate_all_summaries()
+
+    # The unchanged a-c subtree is reused from its summary
+    assert summary_tree / "README.md" in reads
+    assert summary_tree / "a-c/g.md" not in reads
+    assert (summary_tree / "a-c/SUMMARY").stat().st_mtime_ns == a_c_mtime
+    assert headers((summary_tree / "SUMMARY").read_text()) == [
+        "README.md", "a/b/deep/h.txt", "a/b/new.md", "a-c/g.md"
+    ]
+    incremental = summaries(summary_tree)
+    SummaryGenerator(summary_tree).generate_all_summaries(full=True)
+    assert summaries(summary_tree) == incremental
+
+def test_touched_files_are_hashed(summary_tree):
+    """Test that files with a new mtime but the same content aren't changes"""
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    summary_mtime = (summary_tree / "a-c/SUMMARY").stat().st_mtime_ns
+    (summary_tree / "a-c/g.md").touch()
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    assert (summary_tree / "a-c/SUMMARY").stat().st_mtime_ns == summary_mtime
+
+def test_damaged_summaries_are_rebuilt(summary_tree):
+    """Test that missing or edited summaries are regenerated"""
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    expected = summaries(summary_tree)
+    (summary_tree / "a/b/deep/SUMMARY").unlink()
+    # Same size, so only the hash check catches it
+    summary = summary_tree / "a-c/SUMMARY"
+    summary.write_text(summary.read_text().replace("notes", "NOTES"))
+    (summary_tree / "a/b/f.py").write_text("x = 2\n")
+    expected[Path("a/b/SUMMARY")] = expected[Path("a/b/SUMMARY")].replace("x = 1", "x = 2")
+    expected[Path("SUMMARY")] = expected[Path("SUMMARY")].replace("x = 1", "x = 2")
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    assert summaries(summary_tree) == expected
+
+def test_full_rebuild_ignores_manifest(summary_tree, monkeypatch):
+    """Test that full=True reads every file again"""
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    reads = track_reads(monkeypatch)
+    SummaryGenerator(summary_tree).generate_all_summaries(full=True)
+    assert len(reads) == 4
+
+def test_summaries_are_streamed_in_chunks(temp_dir, monkeypatch):
+    """Test that chunked copying decodes and translates newlines like read_text"""
+    monkeypatch.setattr(generator, "_CHUNK_SIZE", 3)
+    content = "caf\u00e9 \u2603\r\nline\rend\r"
+    (temp_dir / "a").mkdir()
+    (temp_dir / "a/f.txt").write_bytes(content.encode("utf-8"))
+    (temp_dir / "a/g.txt").write_text("g\n")
+    SummaryGenerator(temp_dir).generate_all_summaries()
+    expected = "\n".join([
+        "=" * 80, "File: a/f.txt", "=" * 80, (temp_dir / "a/f.txt").read_text(), "\n",
+        "=" * 80, "File: a/g.txt", "=" * 80, "g\n", "\n",
+    ])
+    assert (temp_dir / "a/SUMMARY").read_text() == expected
+    assert (temp_dir / "SUMMARY").exists() is False
+    assert list(temp_dir.rglob(".SUMMARY*")) == []
+
+def test_unreadable_files_are_skipped(summary_tree):
+    """Test that a file failing to decode part-way leaves no partial section"""
+    (summary_tree / "a/b/bad.md").write_bytes(b"ok " * 100 + b"\xff")
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    assert headers((summary_tree / "a/b/SUMMARY").read_text()) == ["a/b/deep/h.txt", "a/b/f.py"]
+    assert "ok ok" not in (summary_tree / "SUMMARY").read_text()
+
+@pytest.mark.parametrize("io_workers", [1, 4])
+def test_io_workers_keep_output_deterministic(summary_tree, io_workers):
+    """Test that reading ahead on threads doesn't change any output"""
+    for i in range(30):
+        (summary_tree / f"pkg/m{i:02}.py").parent.mkdir(exist_ok=True)
+        (summary_tree / f"pkg/m{i:02}.py").write_text(f"def f{i}(x: int) -> int:\n    return x\n")
+    SummaryGenerator(summary_tree, io_workers=io_workers).generate_all_summaries()
+    generate_special_summaries(summary_tree, io_workers)
+    outputs = summaries(summary_tree)
+    outputs.update({p.name: p.read_text() for p in (summary_tree / "SUMMARIES").iterdir()})
+
+    assert headers(outputs[Path("pkg/SUMMARY")]) == [f"pkg/m{i:02}.py" for i in range(30)]
+    python = outputs["PYTHON.md"]
+    assert [line for line in python.splitlines() if line.startswith("## ")] == \
+        [f"## pkg/m{i:02}.py" for i in range(30)]
+    assert SummaryGenerator(summary_tree, io_workers=1).generate_directory_summary(summary_tree) == \
+        SummaryGenerator(summary_tree, io_workers=io_workers).generate_directory_summary(summary_tree)
+
+def test_prefetcher_hands_back_results_by_path(temp_dir):
+    """Test out-of-order, unlisted and failing reads through the prefetcher"""
+    paths = [temp_dir / f"f{i}" for i in range(10)]
+    for i, path in enumerate(paths[:-1]):
+        path.write_text(str(i))
+    with Prefetcher(Path.read_text, paths, workers=3) as ahead:
+        assert ahead.get(paths[5]) == "5"
+        assert ahead.get(paths[0]) == "0"
+        assert [ahead.get(p) for p in paths[1:5] + paths[6:9]] == ["1", "2", "3", "4", "6", "7", "8"]
+        with pytest.raises(FileNotFoundError):
+            ahead.get(paths[9])
+        (temp_dir / "late").write_text("late")
+        assert ahead.get(temp_dir / "late") == "late"
+
+@pytest.mark.parametrize("pattern, rel, is_dir, excluded", [
+    ("*.log", "a/b/x.log", False, True),
+    ("/build", "build", True, True),
+    ("/build", "a/build", True, False),
+    ("docs/*.md", "docs/a.md", False, True),
+    ("docs/*.md", "docs/sub/a.md", False, False),
+    ("a/**/z.py", "a/z.py", False, True),
+    ("a/**/z.py", "a/b/c/z.py", False, True),
+    ("tmp/", "tmp", False, False),
+    ("tmp/", "x/tmp", True, True),
+    ("m[0-9].py", "m7.py", False, True),
+    ("m[!0-9].py", "m7.py", False, False),
+    ("\\#keep", "#keep", False, True),
+])
+def test_ignore_patterns_follow_gitignore_syntax(temp_dir, pattern, rel, is_dir, excluded):
+    """Test anchoring, wildcards, directory-only patterns and escapes"""
+    filters = SummaryFilter(temp_dir, exclude_patterns=[pattern], exclude_directories=[],
+                            include_extensions=[".py", ".md", ".log", ""])
+    included = filters.includes_directory(rel) if is_dir else filters.includes_file(rel)
+    assert included is not excluded
+
+def test_gitignore_files_are_honored(summary_tree, monkeypatch):
+    """Test nested ignore files, negation, and that ignored directories aren't entered"""
+    (summary_tree / ".gitignore").write_text("# build output\nnode_modules/\n*.txt\n!keep.txt\n")
+    (summary_tree / "a/b/.gitignore").write_text("f.py\n/deep/\n")
+    for rel_path in ["node_modules/pkg/index.js", "a/keep.txt", "a/drop.txt", "a-c/f.py"]:
+        (summary_tree / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (summary_tree / rel_path).write_text("x\n")
+    entered = []
+    real_scandir = os.scandir
+    def tracking_scandir(path):
+        entered.append(Path(path).relative_to(summary_tree).as_posix())
+        return real_scandir(path)
+    monkeypatch.setattr(os, "scandir", tracking_scandir)
+
+    SummaryGenerator(summary_tree).generate_all_summaries()
+    assert headers((summary_tree / "SUMMARY").read_text()) == [
+        "README.md", "a/keep.txt", "a-c/f.py", "a-c/g.md"
+    ]
+    assert not (summary_tree / "a/b/SUMMARY").exists()
+    assert not any(d.startswith(("node_modules", ".venv", ".github/workflows", "a/b/deep"))
+                   for d in entered)
+
+    filters = SummaryFilter(summary_tree)
+    assert filters.includes("a/keep.txt") and filters.includes("a-c/f.py")
+    assert not filters.includes("a/drop.txt") and not filters.includes("a/b/f.py")
+    assert not filters.includes("node_modules/pkg/index.js")
+    assert not filters.includes("a/b/deep", is_dir=True)
+    assert [p.relative_to(summary_tree).as_posix() for p in filters.walk("*.py")] == ["a-c/f.py"]
+
+def test_rules_come_from_pyproject(summary_tree):
+    """Test [tool.summary] settings, including a custom ignore file and a size limit"""
+    (summary_tree / "pyproject.toml").write_text(
+        "[tool.summary]\n"
+        "include_extensions = ['.py', '.md', '.txt']\n"
+        "exclude_directories = ['a-c']\n"
+        "ignore_files = ['.summaryignore']\n"
+        "max_file_size_kb = 1\n"
+    )
+    (summary_tree / ".summaryignore").write_text("README.md\n")
+    (summary_tree / ".gitignore").write_text("*.py\n")
+    (summary_tree / "a/big.py").write_text("x" * 2000)
+    (summary_tree / "a/docs/README.md").parent.mkdir()
+    (summary_tree / "a/docs/README.md").write_text("# Docs\n")
+
+    # Only the listed ignore files count, so *.py in .gitignore doesn't apply
+    files = SummaryGenerator(summary_tree).generate_all_summaries()
+    assert [f.relative_to(summary_tree) for f in files] == [Path("a/b/SUMMARY"), Path("a/b/deep/SUMMARY")]
+    assert headers((summary_tree / "a/b/SUMMARY").read_text()) == ["a/b/deep/h.txt", "a/b/f.py"]
+    generate_special_summaries(summary_tree)
+    assert "# a/docs/README.md" not in (summary_tree / "SUMMARIES/READMEs.md").read_text()
+    generator = SummaryGenerator(summary_tree)
+    assert generator.should_include_file(summary_tree / "a/b/f.py")
+    assert not generator.should_include_directory(summary_tree / "a-c")
@@ -0,0 +1,54 @@
+import os
+import stat
+from scripts import utils
+from scripts.utils import WriteReport, replace_if_changed, write_if_changed
+
+def test_write_if_changed(tmp_path):
+    """Test that identical content leaves the file and its mtime alone"""
+    path = tmp_path / "out" / "SUMMARY"
+    assert write_if_changed(path, "hello\n")
+    assert path.read_text() == "hello\n"
+    os.utime(path, (0, 0))
+
+    assert not write_if_changed(path, "hello\n")
+    assert path.stat().st_mtime == 0
+    # Same size, different content
+    assert write_if_changed(path, "jello\n")
+    assert path.read_text() == "jello\n"
+    assert [p.name for p in path.parent.iterdir()] == ["SUMMARY"]
+
+def test_replace_if_changed(tmp_path):
+    """Test that an identical temp file is discarded instead of moved into place"""
+    path = tmp_path / "registry.db"
+    path.write_bytes(b"\x00data")
+    tmp = tmp_path / "tmp"
+    tmp.write_bytes(b"\x00data")
+    assert not replace_if_changed(tmp, path)
+    assert not tmp.exists()
+
+    tmp.write_bytes(b"\x00other")
+    assert replace_if_changed(tmp, path)
+    assert path.read_bytes() == b"\x00other"
+    assert not tmp.exists()
+
+def test_new_files_follow_umask(tmp_path, monkeypatch):
+    """Test that new files get the mode open() would give them and existing ones keep theirs"""
+    monkeypatch.setattr(utils, "_UMASK", 0o027)
+    path = tmp_path / "registry.json"
+    write_if_changed(path, "{}")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+    os.chmod(path, 0o600)
+    write_if_changed(path, "{\n}")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+def test_write_report(tmp_path):
+    """Test that a report tallies written and unchanged files"""
+    report = WriteReport()
+    report.write(tmp_path / "a", "a")
+    report.write(tmp_path / "a", "a")
+    report.write(tmp_path / "b", b"b")
+    assert report.written == [tmp_path / "a", tmp_path / "b"]
+    assert report.unchanged == [tmp_path / "a"]
+    assert report.paths == [tmp_path / "a", tmp_path / "a", tmp_path / "b"]
+    assert str(report) == "2 written, 1 unchanged"